@@ -132,6 +132,7 @@ task_build() {
     log_step "Tier 1: Foundational Libraries"
     pids=()
     (cd proto && protoc --go_out=. --go_opt=paths=source_relative alert.proto && log_success "proto build complete") & pids+=($!)
+    (python -m grpc_tools.protoc -I. --python_out=intelligence-core/src/python --grpc_python_out=intelligence-core/src/python proto/alert.proto && log_success "proto (Python) build complete") & pids+=($!)
     (cd trust-fabric && cargo build --release && log_success "trust-fabric build complete") & pids+=($!)
     (cd wasm-modules && cargo build --target wasm32-unknown-unknown --release && log_success "wasm-modules build complete") & pids+=($!)
     
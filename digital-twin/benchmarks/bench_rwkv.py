@@ -0,0 +1,86 @@
+# digital-twin/benchmarks/bench_rwkv.py
+"""
+Throughput benchmark for the RWKV model: parallel-mode prefill and recurrent-mode decode.
+
+Usage: python benchmarks/bench_rwkv.py [--weights model.safetensors] [--layers 12 --embd 768 --vocab 50277]
+       [--batch 1] [--prompt-tokens 1024] [--decode-tokens 128] [--chunk-sizes 32 128 512] [--threads 0]
+
+Without --weights, a randomly initialized model of the given size is written to a
+temporary safetensors file and loaded back through mmap, like a real checkpoint.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "python"))
+from rwkv_model import RWKVModel, save_safetensors  # noqa: E402
+
+
+def load_model(args) -> RWKVModel:
+    if args.weights:
+        return RWKVModel.from_safetensors(args.weights)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rwkv.safetensors")
+        save_safetensors(RWKVModel(args.vocab, args.embd, args.layers).state_dict(), path)
+        return RWKVModel.from_safetensors(path)  # The mapping outlives the unlinked file
+
+
+def bench_prefill(model: RWKVModel, tokens: torch.Tensor, chunk_size: int, repeats: int) -> dict:
+    model.prefill(tokens[:, :chunk_size], chunk_size=chunk_size)  # Warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.prefill(tokens, chunk_size=chunk_size)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {"mode": "prefill", "chunk_size": chunk_size, "tokens": tokens.numel(), "best_s": round(best, 6),
+            "tokens_per_s": round(tokens.numel() / best, 1)}
+
+
+def bench_decode(model: RWKVModel, tokens: torch.Tensor, steps: int) -> dict:
+    _, state = model.prefill(tokens)
+    token = tokens[:, -1]
+    model.decode(token, state)  # Warm-up
+    latencies = []
+    for _ in range(steps):
+        start = time.perf_counter()
+        logits, state = model.decode(token, state)
+        latencies.append(time.perf_counter() - start)
+        token = logits.argmax(dim=-1)
+    latencies.sort()
+    total = sum(latencies)
+    return {"mode": "decode", "batch": tokens.shape[0], "steps": steps, "total_s": round(total, 6),
+            "tokens_per_s": round(tokens.shape[0] * steps / total, 1),
+            "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3), "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--weights", help="RWKV-4 safetensors checkpoint (default: random weights)")
+    parser.add_argument("--layers", type=int, default=12)
+    parser.add_argument("--embd", type=int, default=768)
+    parser.add_argument("--vocab", type=int, default=50277)
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--prompt-tokens", type=int, default=1024)
+    parser.add_argument("--decode-tokens", type=int, default=128)
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[32, 128, 512])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 keeps the default)")
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    model = load_model(args)
+    tokens = torch.randint(0, model.vocab_size, (args.batch, args.prompt_tokens))
+    results = [bench_prefill(model, tokens, chunk_size, args.repeats) for chunk_size in args.chunk_sizes]
+    results.append(bench_decode(model, tokens, args.decode_tokens))
+    print(json.dumps({"layers": model.n_layer, "embd": model.n_embd, "vocab": model.vocab_size, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
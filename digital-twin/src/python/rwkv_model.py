@@ -0,0 +1,235 @@
+# digital-twin/src/python/rwkv_model.py
+"""
+A CPU RWKV-4 language model: a stack of time-mix / channel-mix blocks with two
+execution modes over one recurrent state.
+
+- Parallel (chunked) mode, `prefill`: a prompt is processed `chunk_size` tokens at a
+  time. Token shift, the projections and the channel mix cover the whole chunk in a few
+  matrix multiplications; only the elementwise WKV recurrence steps through time.
+- Recurrent mode, `decode`: one token per sequence per call, with the state carried
+  forward, so generation costs the same per token however long the sequence gets.
+
+Weights use the RWKV-4 checkpoint names (`emb.weight`, `blocks.0.ln0.weight`,
+`blocks.N.att.time_decay`, ..., `head.weight`) and load from a safetensors file
+through mmap with `RWKVModel.from_safetensors`: the parameters point into the mapped
+file, so loading costs no copy and processes serving the same file share its pages.
+"""
+import json
+import logging
+import mmap
+import struct
+from typing import Dict, Optional, Tuple
+
+import torch
+import torch.nn as nn
+
+from wkv_model import MIN_LOG, STATE_PP, wkv_log_space
+
+logger = logging.getLogger(__name__)
+
+# Per-layer state layout: (B, n_layer, 5, C), rows indexed by these constants.
+STATE_ATT_X = 0  # Last input to the time mix (token shift)
+STATE_WKV = slice(1, 4)  # (aa, bb, pp) of the WKV recurrence, as in wkv_model
+STATE_FFN_X = 4  # Last input to the channel mix (token shift)
+STATE_ROWS = 5
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+def init_model_state(batch_size: int, n_layer: int, n_embd: int, device: Optional[torch.device] = None) -> torch.Tensor:
+    """An empty (B, n_layer, 5, C) model state: no tokens seen yet."""
+    state = torch.zeros((batch_size, n_layer, STATE_ROWS, n_embd), device=device, dtype=torch.float32)
+    state[:, :, STATE_WKV.start + STATE_PP] = MIN_LOG
+    return state
+
+
+def _shift(x: torch.Tensor, last: torch.Tensor) -> torch.Tensor:
+    """Each token's previous token: `last` for the first, then x[:, :-1]."""
+    return torch.cat((last.unsqueeze(1).to(x.dtype), x[:, :-1]), dim=1)
+
+
+# --- Blocks ---
+
+class TimeMix(nn.Module):
+    def __init__(self, n_embd: int):
+        super().__init__()
+        self.time_mix_k = nn.Parameter(torch.full((n_embd,), 0.5))
+        self.time_mix_v = nn.Parameter(torch.full((n_embd,), 0.5))
+        self.time_mix_r = nn.Parameter(torch.full((n_embd,), 0.5))
+        self.time_decay = nn.Parameter(torch.zeros(n_embd))  # Per-step decay is exp(-exp(time_decay))
+        self.time_first = nn.Parameter(torch.zeros(n_embd))  # Log bonus of the current token
+        self.key = nn.Linear(n_embd, n_embd, bias=False)
+        self.value = nn.Linear(n_embd, n_embd, bias=False)
+        self.receptance = nn.Linear(n_embd, n_embd, bias=False)
+        self.output = nn.Linear(n_embd, n_embd, bias=False)
+
+    def forward(self, x: torch.Tensor, last_x: torch.Tensor, wkv_state: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        xx = _shift(x, last_x)
+        k = self.key(torch.lerp(xx, x, self.time_mix_k))
+        v = self.value(torch.lerp(xx, x, self.time_mix_v))
+        r = torch.sigmoid(self.receptance(torch.lerp(xx, x, self.time_mix_r)))
+        wkv, new_wkv_state = wkv_log_space(-torch.exp(self.time_decay.float()), self.time_first, k, v, wkv_state)
+        return self.output(r * wkv.to(x.dtype)), new_wkv_state
+
+
+class ChannelMix(nn.Module):
+    def __init__(self, n_embd: int, n_ffn: int):
+        super().__init__()
+        self.time_mix_k = nn.Parameter(torch.full((n_embd,), 0.5))
+        self.time_mix_r = nn.Parameter(torch.full((n_embd,), 0.5))
+        self.key = nn.Linear(n_embd, n_ffn, bias=False)
+        self.receptance = nn.Linear(n_embd, n_embd, bias=False)
+        self.value = nn.Linear(n_ffn, n_embd, bias=False)
+
+    def forward(self, x: torch.Tensor, last_x: torch.Tensor) -> torch.Tensor:
+        xx = _shift(x, last_x)
+        k = torch.square(torch.relu(self.key(torch.lerp(xx, x, self.time_mix_k))))
+        r = torch.sigmoid(self.receptance(torch.lerp(xx, x, self.time_mix_r)))
+        return r * self.value(k)
+
+
+class RWKVBlock(nn.Module):
+    def __init__(self, n_embd: int, n_ffn: int, first: bool = False):
+        super().__init__()
+        self.ln0 = nn.LayerNorm(n_embd) if first else None  # Normalizes the embeddings
+        self.ln1 = nn.LayerNorm(n_embd)
+        self.ln2 = nn.LayerNorm(n_embd)
+        self.att = TimeMix(n_embd)
+        self.ffn = ChannelMix(n_embd, n_ffn)
+
+    def forward(self, x: torch.Tensor, state: torch.Tensor, new_state: torch.Tensor) -> torch.Tensor:
+        """Runs the block on (B, T, C) and writes this layer's next (B, 5, C) state into `new_state`."""
+        if self.ln0 is not None:
+            x = self.ln0(x)
+        h = self.ln1(x)
+        att, wkv_state = self.att(h, state[:, STATE_ATT_X], state[:, STATE_WKV])
+        new_state[:, STATE_WKV] = wkv_state
+        new_state[:, STATE_ATT_X] = h[:, -1]
+        x = x + att
+        h = self.ln2(x)
+        new_state[:, STATE_FFN_X] = h[:, -1]
+        return x + self.ffn(h, state[:, STATE_FFN_X])
+
+
+# --- Model ---
+
+class RWKVModel(nn.Module):
+    def __init__(self, vocab_size: int, n_embd: int, n_layer: int, n_ffn: Optional[int] = None):
+        super().__init__()
+        self.vocab_size, self.n_embd, self.n_layer = vocab_size, n_embd, n_layer
+        self.n_ffn = n_ffn or 4 * n_embd
+        self.emb = nn.Embedding(vocab_size, n_embd)
+        self.blocks = nn.ModuleList(RWKVBlock(n_embd, self.n_ffn, first=(i == 0)) for i in range(n_layer))
+        self.ln_out = nn.LayerNorm(n_embd)
+        self.head = nn.Linear(n_embd, vocab_size, bias=False)
+
+    def init_state(self, batch_size: int) -> torch.Tensor:
+        return init_model_state(batch_size, self.n_layer, self.n_embd, device=self.emb.weight.device)
+
+    @torch.no_grad()
+    def forward(self, tokens: torch.Tensor, state: Optional[torch.Tensor] = None, last_only: bool = False) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Runs (B, T) token ids through the stack from `state` (None for new sequences).
+        Returns logits, (B, T, V) or (B, V) with `last_only`, and the (B, n_layer, 5, C)
+        state after the last token. The input state is not modified.
+        """
+        if state is None:
+            state = self.init_state(tokens.shape[0])
+        new_state = torch.empty_like(state)
+        x = self.emb(tokens)
+        for i, block in enumerate(self.blocks):
+            x = block(x, state[:, i], new_state[:, i])
+        if last_only:
+            x = x[:, -1]
+        return self.head(self.ln_out(x)), new_state
+
+    def prefill(self, tokens: torch.Tensor, state: Optional[torch.Tensor] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Parallel mode: consumes a (B, T) prompt `chunk_size` tokens at a time. Returns the last token's logits (B, V) and the state."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        logits = None
+        for start in range(0, tokens.shape[1], chunk_size):
+            logits, state = self(tokens[:, start:start + chunk_size], state, last_only=True)
+        if logits is None:
+            raise ValueError("prefill needs at least one token")
+        return logits, state
+
+    def decode(self, token: torch.Tensor, state: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Recurrent mode: one (B,) token per sequence. Returns its logits (B, V) and the next state."""
+        return self(token.view(-1, 1), state, last_only=True)
+
+    @classmethod
+    def from_safetensors(cls, path: str, dtype: Optional[torch.dtype] = None) -> "RWKVModel":
+        """
+        Builds the model around the weights in `path` without copying them: the module is
+        created on the meta device and its parameters are assigned views of the mmapped
+        file. Converting to another `dtype` copies those tensors that differ.
+        """
+        tensors = load_safetensors(path)
+        vocab_size, n_embd = tensors["emb.weight"].shape
+        n_layer = 1 + max(int(name.split(".")[1]) for name in tensors if name.startswith("blocks."))
+        n_ffn = tensors["blocks.0.ffn.key.weight"].shape[0]
+        with torch.device("meta"):
+            model = cls(vocab_size, n_embd, n_layer, n_ffn)
+        shapes = {name: p.shape for name, p in model.state_dict().items()}
+        state_dict = {}
+        for name, tensor in tensors.items():
+            if name not in shapes:
+                logger.debug(f"Ignoring unused tensor '{name}' in {path}")
+                continue
+            tensor = tensor.reshape(shapes[name])  # Checkpoints store the time_* vectors as (1, 1, C)
+            state_dict[name] = tensor.to(dtype) if dtype is not None else tensor
+        model.load_state_dict(state_dict, assign=True)
+        logger.info(f"Loaded RWKV model from {path}: {n_layer} layers, n_embd={n_embd}, vocab={vocab_size}")
+        return model.eval()
+
+
+# --- Safetensors ---
+
+_SAFETENSORS_DTYPES = {
+    "F64": torch.float64, "F32": torch.float32, "F16": torch.float16, "BF16": torch.bfloat16,
+    "I64": torch.int64, "I32": torch.int32, "I16": torch.int16, "I8": torch.int8, "U8": torch.uint8, "BOOL": torch.bool,
+}
+
+
+def load_safetensors(path: str) -> Dict[str, torch.Tensor]:
+    """
+    Tensors of a safetensors file as zero-copy views of a private (copy-on-write) mmap of
+    it. The format is an 8-byte little-endian header length, a JSON header giving each
+    tensor's dtype, shape and byte range, then the raw data.
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    (header_len,) = struct.unpack("<Q", buffer[:8])
+    header = json.loads(buffer[8:8 + header_len])
+    header.pop("__metadata__", None)
+    data = torch.frombuffer(buffer, dtype=torch.uint8, offset=8 + header_len) if len(buffer) > 8 + header_len else torch.empty(0, dtype=torch.uint8)
+    tensors = {}
+    for name, info in header.items():
+        dtype = _SAFETENSORS_DTYPES[info["dtype"]]
+        start, end = info["data_offsets"]
+        chunk = data[start:end]
+        if (8 + header_len + start) % dtype.itemsize:  # Misaligned for a zero-copy view
+            chunk = chunk.clone()
+        tensors[name] = chunk.view(dtype).reshape(info["shape"])
+    return tensors
+
+
+def save_safetensors(tensors: Dict[str, torch.Tensor], path: str):
+    """Writes `tensors` in the safetensors format (each 8-byte aligned, as `load_safetensors` views them in place)."""
+    names = {dtype: name for name, dtype in _SAFETENSORS_DTYPES.items()}
+    header, payloads, offset = {}, [], 0
+    for name, tensor in tensors.items():
+        tensor = tensor.detach().cpu().contiguous()
+        raw = tensor.reshape(-1).view(torch.uint8).numpy().tobytes() if tensor.numel() else b""
+        padding = -len(raw) % 8
+        header[name] = {"dtype": names[tensor.dtype], "shape": list(tensor.shape), "data_offsets": [offset, offset + len(raw)]}
+        payloads.append(raw + b"\0" * padding)
+        offset += len(raw) + padding
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    encoded += b" " * (-len(encoded) % 8)  # Keeps the data section 8-byte aligned
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(encoded)))
+        f.write(encoded)
+        for payload in payloads:
+            f.write(payload)
@@ -0,0 +1,190 @@
+# digital-twin/src/python/rwkv_sessions.py
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+logger = logging.getLogger(__name__)
+
+# --- Spill Store ---
+
+class StateSpill:
+    """
+    Recurrent states of evicted sessions, kept in a memory-mapped file of fixed-size
+    float32 records. The OS pages records in and out as needed, so RAM use is bounded
+    by the pool, not by the number of entities ever seen. Freed records are reused, and
+    the file doubles in size when it is full.
+
+    The file is created with a unique name inside `directory` (never an existing file)
+    and is deleted by `close`.
+    """
+    def __init__(self, directory: str, state_shape: Tuple[int, ...], initial_records: int = 1024):
+        fd, self.path = tempfile.mkstemp(prefix="rwkv-states-", suffix=".bin", dir=directory)
+        os.close(fd)
+        self.state_shape = tuple(state_shape)
+        self._record_bytes = int(np.prod(self.state_shape)) * np.dtype(np.float32).itemsize
+        self._records: Dict[str, int] = {}  # entity_id -> record
+        self._free: List[int] = []
+        self._capacity = 0
+        self._array: Optional[np.memmap] = None
+        self._grow(max(1, initial_records))
+
+    def _grow(self, records: int):
+        if self._array is not None:
+            self._array.flush()
+        with open(self.path, "r+b") as f:
+            f.truncate(records * self._record_bytes)
+        self._array = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(records, *self.state_shape))
+        self._free.extend(range(records - 1, self._capacity - 1, -1))
+        self._capacity = records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._records
+
+    def put(self, entity_id: str, state: np.ndarray):
+        record = self._records.get(entity_id)
+        if record is None:
+            if not self._free:
+                self._grow(self._capacity * 2)
+            record = self._free.pop()
+            self._records[entity_id] = record
+        self._array[record] = state
+
+    def get(self, entity_id: str) -> Optional[np.ndarray]:
+        record = self._records.get(entity_id)
+        return None if record is None else np.array(self._array[record])
+
+    def pop(self, entity_id: str) -> Optional[np.ndarray]:
+        record = self._records.pop(entity_id, None)
+        if record is None:
+            return None
+        self._free.append(record)
+        return np.array(self._array[record])
+
+    def close(self):
+        if self._array is not None:
+            self._array.flush()
+            self._array = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# --- Session Manager ---
+
+class RWKVSessionManager:
+    """
+    Keeps the recurrent state of each entity's sequence between calls, so a new event
+    costs one recurrent step instead of a replay of the entity's history.
+
+    States live in one contiguous (capacity, *state_shape) tensor pool allocated up
+    front. Each entity holds a slot in it. `step` gathers the slots of the entities in
+    the batch, runs the model once on the batch with those states, and scatters the
+    updated states back. When every slot is taken, the least recently used entity is
+    evicted: its state moves to a memory-mapped file in `spill_dir` if one is configured
+    (and is restored on its next event), otherwise it is dropped and the entity starts
+    over from `empty_state`.
+
+    `model` is any module called as `model(x, state) -> (output, new_state)` with the
+    state batched on dim 0, such as `RWKVLayer`. Not thread-safe.
+    """
+    def __init__(
+        self,
+        model: nn.Module,
+        empty_state: torch.Tensor,
+        capacity: int,
+        spill_dir: Optional[str] = None,
+        device: Optional[torch.device] = None,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.model = model
+        self.capacity = capacity
+        self.device = torch.device(device) if device is not None else empty_state.device
+        self.empty_state = empty_state.detach().to(self.device, torch.float32)
+        self.pool = self.empty_state.unsqueeze(0).repeat(capacity, *([1] * self.empty_state.dim()))
+        self.spill = StateSpill(spill_dir, tuple(self.empty_state.shape)) if spill_dir else None
+        self._slots: "OrderedDict[str, int]" = OrderedDict()  # entity_id -> slot, least recently used first
+        self._free = list(range(capacity - 1, -1, -1))
+        self.stats = {"hits": 0, "new": 0, "restored": 0, "evicted": 0, "dropped": 0}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._slots or (self.spill is not None and entity_id in self.spill)
+
+    def _evict(self) -> int:
+        entity_id, slot = self._slots.popitem(last=False)
+        self.stats["evicted"] += 1
+        if self.spill is not None:
+            self.spill.put(entity_id, self.pool[slot].cpu().numpy())
+        else:
+            self.stats["dropped"] += 1
+            logger.debug(f"Dropped RWKV state of '{entity_id}' (pool full, no spill file).")
+        return slot
+
+    def _acquire(self, entity_id: str) -> int:
+        slot = self._slots.get(entity_id)
+        if slot is not None:
+            self._slots.move_to_end(entity_id)
+            self.stats["hits"] += 1
+            return slot
+        slot = self._free.pop() if self._free else self._evict()
+        spilled = self.spill.pop(entity_id) if self.spill is not None else None
+        if spilled is None:
+            self.pool[slot] = self.empty_state
+            self.stats["new"] += 1
+        else:
+            self.pool[slot] = torch.from_numpy(spilled).to(self.device)
+            self.stats["restored"] += 1
+        self._slots[entity_id] = slot
+        return slot
+
+    def slots(self, entity_ids: Sequence[str]) -> torch.Tensor:
+        """Pool slots holding these entities' states, allocating (or restoring) them as needed."""
+        if len(set(entity_ids)) != len(entity_ids):
+            raise ValueError("entity_ids must be unique within a step")
+        if len(entity_ids) > self.capacity:
+            raise ValueError(f"a step holds at most {self.capacity} entities, got {len(entity_ids)}")
+        # Entities in this batch are moved to the most recently used end as they are
+        # acquired, so eviction never takes a slot that the batch already holds.
+        return torch.tensor([self._acquire(e) for e in entity_ids], dtype=torch.long, device=self.device)
+
+    @torch.no_grad()
+    def step(self, entity_ids: Sequence[str], x: torch.Tensor) -> torch.Tensor:
+        """
+        Feeds each entity its new events, `x[i]` (T, C) for `entity_ids[i]`, as one
+        batched forward pass continuing the entities' sequences. Returns the model output.
+        """
+        index = self.slots(entity_ids)
+        output, new_state = self.model(x.to(self.device), self.pool.index_select(0, index))
+        self.pool.index_copy_(0, index, new_state.to(torch.float32))
+        return output
+
+    def state(self, entity_id: str) -> Optional[torch.Tensor]:
+        """A copy of the entity's current state, or None for an unknown entity."""
+        slot = self._slots.get(entity_id)
+        if slot is not None:
+            return self.pool[slot].clone()
+        spilled = self.spill.get(entity_id) if self.spill is not None else None
+        return None if spilled is None else torch.from_numpy(spilled)
+
+    def drop(self, entity_id: str):
+        """Forgets an entity; its next event starts a new sequence."""
+        slot = self._slots.pop(entity_id, None)
+        if slot is not None:
+            self._free.append(slot)
+        elif self.spill is not None:
+            self.spill.pop(entity_id)
+
+    def close(self):
+        if self.spill is not None:
+            self.spill.close()
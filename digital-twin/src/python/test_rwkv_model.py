@@ -0,0 +1,54 @@
+# digital-twin/src/python/test_rwkv_model.py
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from rwkv_model import RWKVModel, load_safetensors, save_safetensors  # noqa: E402
+
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    model = RWKVModel(vocab_size=50, n_embd=16, n_layer=3).eval()
+    with torch.no_grad():
+        for name, p in model.named_parameters():
+            if "time_" in name:
+                p.uniform_(-1, 1)
+    return model
+
+
+def test_chunked_prefill_and_token_by_token_decode_agree(model):
+    tokens = torch.randint(0, 50, (2, 11))
+    logits, state = model(tokens)
+    prefill_logits, prefill_state = model.prefill(tokens, chunk_size=4)
+    torch.testing.assert_close(prefill_logits, logits[:, -1])
+    torch.testing.assert_close(prefill_state, state)
+
+    decode_state = model.init_state(2)
+    for t in range(11):
+        decode_logits, decode_state = model.decode(tokens[:, t], decode_state)
+        torch.testing.assert_close(decode_logits, logits[:, t], rtol=1e-4, atol=1e-4)
+    torch.testing.assert_close(decode_state, state, rtol=1e-4, atol=1e-4)
+
+
+def test_prefill_then_decode_continues_the_sequence(model):
+    tokens = torch.randint(0, 50, (1, 9))
+    logits, _ = model(tokens)
+    _, state = model.prefill(tokens[:, :8], chunk_size=3)
+    next_logits, _ = model.decode(tokens[:, 8], state)
+    torch.testing.assert_close(next_logits, logits[:, 8], rtol=1e-4, atol=1e-4)
+
+
+def test_safetensors_round_trip_loads_without_copying(model, tmp_path):
+    path = str(tmp_path / "rwkv.safetensors")
+    weights = model.state_dict()
+    weights["blocks.0.att.time_decay"] = weights["blocks.0.att.time_decay"].view(1, 1, -1)  # Checkpoint layout
+    save_safetensors({**weights, "odd": torch.arange(3, dtype=torch.int16)}, path)
+
+    tensors = load_safetensors(path)
+    torch.testing.assert_close(tensors["odd"], torch.arange(3, dtype=torch.int16))
+    loaded = RWKVModel.from_safetensors(path)
+    assert (loaded.n_layer, loaded.n_embd, loaded.vocab_size) == (3, 16, 50)
+    assert not loaded.head.weight.is_meta
+    tokens = torch.randint(0, 50, (2, 5))
+    torch.testing.assert_close(loaded(tokens)[0], model(tokens)[0])
@@ -0,0 +1,69 @@
+# digital-twin/src/python/test_rwkv_sessions.py
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from rwkv_sessions import RWKVSessionManager  # noqa: E402
+from wkv_model import RWKVLayer, init_state  # noqa: E402
+
+HIDDEN = 8
+
+
+@pytest.fixture
+def layer():
+    torch.manual_seed(0)
+    return RWKVLayer(HIDDEN).eval()
+
+
+def _manager(layer, capacity, spill_dir=None):
+    return RWKVSessionManager(layer, init_state(1, HIDDEN)[0], capacity=capacity, spill_dir=spill_dir)
+
+
+def test_event_by_event_matches_a_full_replay(layer):
+    manager = _manager(layer, capacity=4)
+    x = torch.randn(3, 6, HIDDEN)
+    with torch.no_grad():
+        expected, _ = layer(x)
+    outputs = [manager.step(["a", "b", "c"], x[:, t:t + 1]) for t in range(6)]
+    torch.testing.assert_close(torch.cat(outputs, dim=1), expected)
+    assert manager.stats["new"] == 3 and manager.stats["hits"] == 15
+
+
+def test_evicted_state_is_spilled_and_restored(layer, tmp_path):
+    existing = tmp_path / "states.bin"
+    existing.write_bytes(b"not ours")
+    manager = _manager(layer, capacity=2, spill_dir=str(tmp_path))
+    x = torch.randn(3, 4, HIDDEN)
+    with torch.no_grad():
+        expected, _ = layer(x)
+    outputs = {entity: [] for entity in "abc"}
+    for t in range(4):
+        for i, entity in enumerate("abc"):  # Three entities through two slots: every step evicts
+            outputs[entity].append(manager.step([entity], x[i:i + 1, t:t + 1]))
+    for i, entity in enumerate("abc"):
+        torch.testing.assert_close(torch.cat(outputs[entity], dim=1), expected[i:i + 1])
+    assert manager.stats["restored"] > 0 and manager.stats["dropped"] == 0
+    assert len(manager) == 2 and "a" in manager
+    manager.close()
+    assert [p.name for p in tmp_path.iterdir()] == ["states.bin"] and existing.read_bytes() == b"not ours"
+
+
+def test_without_spill_evicted_entities_start_over(layer):
+    manager = _manager(layer, capacity=1)
+    x = torch.randn(1, 2, HIDDEN)
+    manager.step(["a"], torch.randn(1, 3, HIDDEN))
+    manager.step(["b"], torch.randn(1, 1, HIDDEN))
+    assert "a" not in manager and manager.stats["dropped"] == 1
+    with torch.no_grad():
+        fresh, _ = layer(x)
+    torch.testing.assert_close(manager.step(["a"], x), fresh)
+    manager.drop("a")
+    assert manager.state("a") is None and len(manager) == 0
+
+
+def test_rejects_duplicate_and_oversized_batches(layer):
+    manager = _manager(layer, capacity=2)
+    with pytest.raises(ValueError):
+        manager.step(["a", "a"], torch.randn(2, 1, HIDDEN))
+    with pytest.raises(ValueError):
+        manager.step(["a", "b", "c"], torch.randn(3, 1, HIDDEN))
@@ -1,12 +1,66 @@
 # digital-twin/src/python/wkv_model.py
+import logging
 import torch
 import torch.nn as nn
-from typing import Tuple
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 # --- WKV (Weight-Key-Value) Computation Module ---
 # This class encapsulates the core time-mixing computation of the RWKV model,
 # designed to be JIT-compiled for performance and suitable for GPU execution.
 
+# Recurrent state layout: (B, 3, C), rows indexed by these constants.
+STATE_AA = 0  # Numerator: decayed sum of exp(k) * v, scaled by exp(-pp)
+STATE_BB = 1  # Denominator: decayed sum of exp(k), scaled by exp(-pp)
+STATE_PP = 2  # Running max exponent that aa and bb are scaled by
+STATE_SIZE = 3
+MIN_LOG = -1e38  # pp of an empty state: exp(MIN_LOG - p) underflows to 0 without inf - inf = nan
+
+
+def init_state(batch_size: int, channels: int, device: Optional[torch.device] = None) -> torch.Tensor:
+    """An empty (B, 3, C) WKV state: no tokens seen yet."""
+    state = torch.zeros((batch_size, STATE_SIZE, channels), device=device, dtype=torch.float32)
+    state[:, STATE_PP] = MIN_LOG
+    return state
+
+
+def wkv_log_space(w: torch.Tensor, u: torch.Tensor, k: torch.Tensor, v: torch.Tensor, state: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    The WKV recurrence in log space, looping over T with whole-(B, C) tensor ops.
+
+    The output at step t is a softmax-weighted average of the values seen so far:
+
+        y_t = (sum_{i<t} exp((t-1-i)*w + k_i) * v_i + exp(u + k_t) * v_t)
+              / (sum_{i<t} exp((t-1-i)*w + k_i) + exp(u + k_t))
+
+    Raw exp(k) sums overflow float32 once keys grow or sequences get long, so aa and bb
+    are kept divided by exp(pp), where pp tracks the largest exponent seen. Every
+    exp() below takes a non-positive argument. The returned state continues the
+    sequence exactly, so a stream can be fed chunk by chunk with constant memory.
+    """
+    B, T, C = k.shape
+    w, u, k, v = w.float(), u.float(), k.float(), v.float()
+    state = state.float()
+    aa, bb, pp = state[:, STATE_AA], state[:, STATE_BB], state[:, STATE_PP]
+    output = torch.empty((B, T, C), device=k.device, dtype=torch.float32)
+    uk = u + k
+    for t in range(T):
+        kt, vt = k[:, t], v[:, t]
+        # Output: fold the current token, with its bonus u, into the state
+        p = torch.maximum(pp, uk[:, t])
+        e1, e2 = torch.exp(pp - p), torch.exp(uk[:, t] - p)
+        output[:, t] = (e1 * aa + e2 * vt) / (e1 * bb + e2)
+        # State: decay by exp(w) and add the current token without the bonus
+        decayed = pp + w
+        p = torch.maximum(decayed, kt)
+        e1, e2 = torch.exp(decayed - p), torch.exp(kt - p)
+        aa = e1 * aa + e2 * vt
+        bb = e1 * bb + e2
+        pp = p
+    return output, torch.stack((aa, bb, pp), dim=1)
+
+
 class WKV(torch.autograd.Function):
     """
     A PyTorch `autograd.Function` for the WKV computation in RWKV models.
@@ -27,64 +81,22 @@ class WKV(torch.autograd.Function):
             B: Batch size.
             T: Sequence length.
             C: Channel/Embedding dimension.
-            w: Weight tensor (C,).
-            u: Input projection tensor for the 'u' component (C,).
+            w: Per-channel log decay (C,), negative: the state is scaled by exp(w) per step.
+            u: Per-channel log bonus for the current token (C,).
             k: Key tensor (B, T, C).
             v: Value tensor (B, T, C).
-            state: Hidden state tensor (B, C) from the previous time step.
+            state: WKV state (B, 3, C) holding (aa, bb, pp), from `init_state` or a previous call.
 
         Returns:
             A tuple (output, new_state) where:
             - output: The computed WKV output (B, T, C).
-            - new_state: The updated hidden state (B, C).
+            - new_state: The (B, 3, C) state after the last token, to pass to the next call.
         """
         ctx.B, ctx.T, ctx.C = B, T, C
         
         # Save tensors needed for backward pass (even if not implementing here for inference)
         ctx.save_for_backward(w, u, k, v)
-        
-        # Ensure tensors are float32 for consistency in computation
-        w = w.float()
-        u = u.float()
-        k = k.float()
-        v = v.float()
-        state = state.float() # state here would be (aa, bb) from previous step
-        
-        # Placeholder for actual CUDA kernel call.
-        # In a real system, this would involve a highly optimized custom CUDA kernel
-        # for maximum performance. Here, we provide a Pythonic simulation.
-        output = torch.empty((B, T, C), device=w.device, dtype=torch.float32)
-        new_state = state.clone() # This assumes state is (aa, bb)
-
-        # state format: (aa, bb)
-        # aa: sum of exp(k + w)
-        # bb: sum of exp(k + w) * v
-        
-        # Initialize aa and bb from the input 'state'
-        # The 'state' tensor here acts as the (aa, bb) state from the previous block/layer
-        aa = state[:, 0] # Example: first column is aa
-        bb = state[:, 1] # Example: second column is bb
-
-        for b_idx in range(B):
-            for t_idx in range(T):
-                # RWKV time-mixing logic per channel
-                for c_idx in range(C):
-                    # Compute 'r' (receptance) based on k and current state
-                    r = k[b_idx, t_idx, c_idx] # Simplified
-                    
-                    # Update aa and bb (key components for WKV)
-                    aa[b_idx, c_idx] = aa[b_idx, c_idx] + torch.exp(k[b_idx, t_idx, c_idx] + w[c_idx])
-                    bb[b_idx, c_idx] = bb[b_idx, c_idx] + torch.exp(k[b_idx, t_idx, c_idx] + w[c_idx]) * v[b_idx, t_idx, c_idx]
-                    
-                    # Compute the WKV output for the current token and channel
-                    output[b_idx, t_idx, c_idx] = (bb[b_idx, c_idx] + torch.exp(u[c_idx]) * v[b_idx, t_idx, c_idx]) / \
-                                                  (aa[b_idx, c_idx] + torch.exp(u[c_idx]))
-        
-        # The state could also include the actual aa and bb.
-        # For this example, we simply return a dummy updated state.
-        updated_state_for_next_step = torch.stack((aa, bb), dim=1) # (B, 2, C)
-
-        return output, updated_state_for_next_step[:,0,:] # Return aa as dummy new state for simplified example.
+        return wkv_log_space(w, u, k, v, state)
 
 
     @staticmethod
@@ -105,7 +117,7 @@ class RWKVLayer(nn.Module):
         self.hidden_size = hidden_size
         
         # Learnable parameters for WKV (w, u, various projection weights)
-        # w and u are typically per-channel parameters
+        # w and u are typically per-channel parameters; the decay applied is exp(-exp(w))
         self.w = nn.Parameter(torch.randn(hidden_size)) 
         self.u = nn.Parameter(torch.randn(hidden_size))
         
@@ -114,10 +126,6 @@ class RWKVLayer(nn.Module):
         self.value = nn.Linear(hidden_size, hidden_size, bias=False)
         self.receptance = nn.Linear(hidden_size, hidden_size, bias=False)
         self.output_proj = nn.Linear(hidden_size, hidden_size, bias=False)
-        
-        # Initialize state (aa, bb)
-        self.register_buffer('aa', torch.zeros(1, hidden_size)) # Moving average of exp(k + w)
-        self.register_buffer('bb', torch.zeros(1, hidden_size)) # Moving average of exp(k + w) * v
 
 
     def forward(self, x: torch.Tensor, state: Optional[torch.Tensor] = None) -> Tuple[torch.Tensor, torch.Tensor]:
@@ -126,13 +134,13 @@ class RWKVLayer(nn.Module):
 
         Args:
             x: Input tensor (B, T, hidden_size).
-            state: Optional previous state (aa, bb) from the last token in batch, or last batch.
-                   (B, 2*hidden_size) or similar.
+            state: WKV state (B, 3, hidden_size) returned by the previous call for the
+                   same sequences, or None to start new ones.
 
         Returns:
             A tuple (output, new_state)
             - output: Output tensor (B, T, hidden_size).
-            - new_state: Updated state for the next step (B, 2, hidden_size).
+            - new_state: Updated state for the next call (B, 3, hidden_size).
         """
         B, T, C = x.shape
         
@@ -141,15 +149,11 @@ class RWKVLayer(nn.Module):
         v = self.value(x)
         # r = self.receptance(x) # Receptance logic would typically be here too
         
-        # Initialize state for the WKV computation
         if state is None:
-            current_state = torch.stack((self.aa.squeeze(0), self.bb.squeeze(0)), dim=0).unsqueeze(0) # (1, 2, C)
-        else:
-            current_state = state # Use provided state
+            state = init_state(B, C, device=x.device)
         
         # Perform WKV computation
-        # Note: WKV.apply expects a simplified state (B, C) for this example
-        wkv_out, new_state = WKV.apply(B, T, C, self.w, self.u, k, v, current_state[:,0,:]) # Simplified state passing
+        wkv_out, new_state = WKV.apply(B, T, C, -torch.exp(self.w.float()), self.u, k, v, state)
 
         # Final projection and output
         # For a full RWKV model, there would be more complex mixing with 'r'
@@ -160,21 +164,22 @@ class RWKVLayer(nn.Module):
 
 # --- Example Usage ---
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - [%(name)s] %(message)s')
+
     # Test WKV function directly
     B, T, C = 2, 4, 8  # Batch, Sequence Length, Channels
-    w = torch.randn(C, requires_grad=True)
+    w = -torch.exp(torch.randn(C, requires_grad=True))
     u = torch.randn(C, requires_grad=True)
     k = torch.randn(B, T, C, requires_grad=True)
     v = torch.randn(B, T, C, requires_grad=True)
     
-    # Initial state (aa, bb) for WKV calculation from a previous time step
-    # Simplified: passing just 'aa' for this example, or a combined state
-    initial_state_wkv = torch.randn(B, C) 
+    # Empty (aa, bb, pp) state: no tokens seen yet
+    initial_state_wkv = init_state(B, C)
 
     logger.info(f"WKV forward pass with shapes: B={B}, T={T}, C={C}")
     out, next_s = WKV.apply(B, T, C, w, u, k, v, initial_state_wkv)
     logger.info(f"WKV output shape: {out.shape}") # Expected: (B, T, C)
-    logger.info(f"WKV next state shape: {next_s.shape}") # Expected: (B, C)
+    logger.info(f"WKV next state shape: {next_s.shape}") # Expected: (B, 3, C)
 
     # Test RWKVLayer
     hidden_size = 8
@@ -187,16 +192,21 @@ if __name__ == "__main__":
     
     logger.info(f"RWKVLayer output shape: {output_rwkv.shape}")
     logger.info(f"RWKVLayer final state shape: {final_state_rwkv.shape}")
+
+    # Streaming: feeding the sequence in chunks and carrying the state matches one pass
+    first, state = rwkv_layer(input_tensor[:, :2])
+    second, _ = rwkv_layer(input_tensor[:, 2:], state)
+    logger.info(f"Chunked output matches: {torch.allclose(torch.cat((first, second), dim=1), output_rwkv, atol=1e-5)}")
     
     # Demonstrate JIT compilation
     logger.info("\nDemonstrating JIT compilation with torch.compile for WKV...")
     # Create dummy data for compilation
     B_comp, T_comp, C_comp = 1, 10, 32
-    w_comp = torch.randn(C_comp)
+    w_comp = -torch.exp(torch.randn(C_comp))
     u_comp = torch.randn(C_comp)
     k_comp = torch.randn(B_comp, T_comp, C_comp)
     v_comp = torch.randn(B_comp, T_comp, C_comp)
-    s_comp = torch.randn(B_comp, C_comp) # Simplified state
+    s_comp = init_state(B_comp, C_comp)
 
     compiled_wkv_forward = torch.compile(WKV.apply)
     
@@ -0,0 +1,160 @@
+# intelligence-core/benchmarks/bench_alert_queries.py
+"""
+Alert read-path benchmark against a local SQLite stand-in for Postgres.
+
+Fills `anomaly_alerts` (the real table definition and indexes from main.py) with
+`--rows` synthetic alerts, then compares:
+
+- listing a deep page with OFFSET and ORM objects (the naive approach) against the
+  keyset, column-only `query_alerts_page` used by GET /alerts;
+- a filtered first page (one node) through the (source_node_id, timestamp) index;
+- the by-id lookup through the ORM (the old /alerts/{alert_id}), `fetch_alert`, and a
+  warm read-through cache hit.
+
+The database file is reused when it already holds `--rows` alerts; loading 10M rows
+takes a few minutes and about 2 GB of disk.
+
+Usage: python benchmarks/bench_alert_queries.py [--db /tmp/omega_alerts_bench.db] [--rows 10000000] [--depth 100000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+SEVERITIES = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+
+def percentiles(latencies) -> dict:
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+    }
+
+
+def timed(fn, iterations: int) -> dict:
+    fn()  # Warm the page cache
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - started) * 1000.0)
+    return percentiles(latencies)
+
+
+def load(path: str, rows: int, nodes: int, chunk: int = 200_000):
+    """Bulk-loads synthetic alerts with the indexes dropped, then rebuilds them."""
+    import main
+
+    indexes = list(main.AnomalyAlertDB.__table__.indexes)
+    for index in indexes:
+        index.drop(main.engine, checkfirst=True)
+    rng = np.random.default_rng(0)
+    start = datetime(2024, 1, 1)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("DELETE FROM anomaly_alerts")
+    loaded_from = time.perf_counter()
+    for offset in range(0, rows, chunk):
+        n = min(chunk, rows - offset)
+        scores = rng.integers(0, 101, n)
+        node_ids = rng.integers(0, nodes, n)
+        batch = [
+            (
+                f"alert-{offset + i:010d}",
+                (start + timedelta(milliseconds=250 * (offset + i))).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                f"node-{node_ids[i]}", "cpu_usage", "{}", int(scores[i]),
+                SEVERITIES[min(int(scores[i]) // 26, 3)], "NEW",
+            )
+            for i in range(n)
+        ]
+        conn.executemany(
+            "INSERT INTO anomaly_alerts (id, timestamp, source_node_id, metric_name, value, anomaly_score, severity, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch,
+        )
+        conn.commit()
+        print(f"loaded {offset + n}/{rows} rows", file=sys.stderr)
+    conn.close()
+    for index in indexes:
+        index.create(main.engine)
+    print(f"load + index build took {time.perf_counter() - loaded_from:.1f} s", file=sys.stderr)
+
+
+def row_count(path: str) -> int:
+    try:
+        with sqlite3.connect(path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM anomaly_alerts").fetchone()[0]
+    except sqlite3.Error:
+        return 0
+
+
+def run(args) -> dict:
+    import main
+    from result_cache import ResultCache
+
+    results = {"rows": args.rows, "page_size": args.page_size, "depth": args.depth}
+    with main.SessionLocal() as db:
+        def offset_orm():
+            return (db.query(main.AnomalyAlertDB)
+                    .order_by(main.AnomalyAlertDB.timestamp.desc(), main.AnomalyAlertDB.id.desc())
+                    .offset(args.depth).limit(args.page_size).all())
+
+        anchor = main.query_alerts_page(db, args.depth)[-1]
+        cursor = (anchor["timestamp"], anchor["id"])
+        results["deep_page_offset_orm"] = timed(offset_orm, args.iterations)
+        results["deep_page_keyset"] = timed(lambda: main.query_alerts_page(db, args.page_size, cursor), args.iterations)
+        results["first_page_keyset"] = timed(lambda: main.query_alerts_page(db, args.page_size), args.iterations)
+        results["node_filtered_page_keyset"] = timed(
+            lambda: main.query_alerts_page(db, args.page_size, source_node_id="node-7"), args.iterations
+        )
+
+        rng = np.random.default_rng(1)
+        ids = [f"alert-{i:010d}" for i in rng.integers(0, args.rows, args.iterations + 1)]
+        lookups = iter(ids * 2)
+        results["by_id_orm"] = timed(
+            lambda: db.query(main.AnomalyAlertDB).filter(main.AnomalyAlertDB.id == next(lookups)).first(), args.iterations
+        )
+        lookups = iter(ids * 2)
+        results["by_id_columns"] = timed(lambda: main.fetch_alert(db, next(lookups)), args.iterations)
+
+        async def cached_lookups():
+            cache = ResultCache(max_entries=args.iterations * 2, name="alerts")
+            for alert_id in ids:  # Populate, as repeated dashboard reads would
+                await cache.get_or_compute(alert_id, lambda: asyncio.to_thread(main.fetch_alert, db, alert_id))
+            latencies = []
+            for alert_id in ids:
+                started = time.perf_counter()
+                await cache.get_or_compute(alert_id, lambda: asyncio.to_thread(main.fetch_alert, db, alert_id))
+                latencies.append((time.perf_counter() - started) * 1000.0)
+            return percentiles(latencies)
+
+        results["by_id_cache_hit"] = asyncio.run(cached_lookups())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default="/tmp/omega_alerts_bench.db")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=100_000, help="Rows skipped before the deep page")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    # main.py creates the table and indexes on import, against whatever DATABASE_URL says.
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "python"))
+    if row_count(args.db) != args.rows:
+        load(args.db, args.rows, args.nodes)
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,502 @@
+# intelligence-core/benchmarks/bench_api_load.py
+"""
+Load-generation harness for the intelligence-core HTTP and gRPC APIs.
+
+Starts the real service (main.py under uvicorn) in a subprocess with stubbed models,
+a fake Julia compute server and no Kafka, against a throwaway SQLite file, an ephemeral
+local Postgres cluster (`--postgres`, needs `initdb`/`pg_ctl`) or `--database-url`.
+Each scenario then drives `--concurrency` closed-loop callers for `--duration` seconds
+(after `--warmup`) and reports throughput, p50/p95/p99 latency, errors, and the server's
+CPU and peak RSS as JSON:
+
+- analyze:           POST /telemetry/analyze, one record per request
+- batch:             POST /telemetry/analyze/batch, `--batch-rows` NDJSON rows per request
+- alert_lookup:      GET /alerts/{alert_id} for alerts created earlier in the run
+- alert_list:        GET /alerts?limit=50
+- julia_optimize:    POST /optimize/defense-resources (`--julia-distinct` commands, so some hit the cache)
+- grpc_threat_intel: GetThreatIntelligence(query="latest")
+- grpc_stream:       `--subscribers` StreamThreatEvents streams while analyze load runs;
+                     adds request-to-subscriber delivery latency
+
+The stub anomaly model costs `--model-base-ms + --model-per-row-ms * rows` per batch
+(sleeping, so it releases the GIL like onnxruntime does); featurization, baselines,
+admission, batching and persistence are the real code.
+
+`--output results.json` saves the report; `--baseline results.json` compares against a
+saved one and exits with status 1 when a scenario's throughput dropped or its p99 rose
+by more than `--tolerance`. Generate the gRPC stubs first (see deploy.sh).
+
+Usage: python benchmarks/bench_api_load.py [--scenarios analyze batch alert_lookup ...] [--concurrency 32]
+           [--duration 10] [--postgres | --database-url URL] [--output out.json] [--baseline base.json]
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "python")
+sys.path.insert(0, SRC)
+
+SCENARIOS = ("analyze", "batch", "alert_lookup", "alert_list", "julia_optimize", "grpc_threat_intel", "grpc_stream")
+_LENGTH = struct.Struct("!I")  # Julia wire format: 4-byte big-endian length + JSON
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    lat = np.asarray(latencies) if latencies else np.full(1, np.nan)
+    return {f"p{q}_ms": round(float(np.percentile(lat, q)), 3) for q in (50, 95, 99)}
+
+
+# --- Server Side: stubs, fake Julia ---
+
+class StubAnomalyModel:
+    """Stands in for OnnxAnomalyModel: fixed cost per batch plus per row, GIL released."""
+    base_s = 0.0005
+    per_row_s = 0.00001
+
+    def __init__(self, model_path: str, intra_op_threads: int = 0, inter_op_threads: int = 1):
+        pass
+
+    def predict_on_batch(self, features: np.ndarray) -> np.ndarray:
+        time.sleep(self.base_s + self.per_row_s * len(features))
+        return 1.0 / (1.0 + np.exp(-features.sum(axis=1, keepdims=True) / 10.0))
+
+
+class StubSentimentClassifier:
+    def __init__(self, model_path: str, max_length: int = 512, intra_op_threads: int = 0, inter_op_threads: int = 1):
+        pass
+
+    def classify(self, texts: List[str]) -> List[str]:
+        time.sleep(StubAnomalyModel.base_s * 4 + StubAnomalyModel.per_row_s * 20 * len(texts))
+        return ["NEGATIVE" if "attack" in text else "POSITIVE" for text in texts]
+
+
+def serve(args):
+    """Runs main.app with stubbed models and without Kafka (the --serve role)."""
+    import uvicorn
+    import main
+    from ingest import IngestStats
+
+    StubAnomalyModel.base_s = args.model_base_ms / 1000.0
+    StubAnomalyModel.per_row_s = args.model_per_row_ms / 1000.0
+    main.OnnxAnomalyModel = StubAnomalyModel
+    main.OnnxSentimentClassifier = StubSentimentClassifier
+
+    class NoIngest:
+        stats = IngestStats()
+
+        def stop(self):
+            pass
+
+    async def start_without_kafka():
+        main.telemetry_ingest = NoIngest()
+
+    main._start_telemetry_ingest = start_without_kafka
+    uvicorn.run(main.app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+
+async def _julia_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, delay: float):
+    async def respond(message: Dict[str, Any]):
+        if delay:
+            await asyncio.sleep(delay)
+        command = message.get("command")
+        if command == "PING":
+            result: Any = "PONG"
+        elif command == "OPTIMIZE_RESOURCES":
+            result = {"status": "OPTIMAL", "allocated_resources": {"firewall": 1}, "total_cost": float(message.get("budget", 0)) / 2}
+        else:
+            result = {"total_impact_score": 0.5, "time_to_compromise_seconds": 60.0}
+        payload = json.dumps({"correlation_id": message.get("correlation_id"), "result": result}).encode()
+        writer.write(_LENGTH.pack(len(payload)) + payload)
+
+    try:
+        while True:
+            (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+            message = json.loads(await reader.readexactly(length))
+            asyncio.get_running_loop().create_task(respond(message))  # Pipelined, like the real server
+    except (asyncio.IncompleteReadError, ConnectionError):
+        writer.close()
+
+
+def fake_julia(args):
+    """Answers the Julia wire protocol after `--julia-delay-ms` (the --fake-julia role)."""
+    async def run():
+        server = await asyncio.start_server(
+            lambda r, w: _julia_connection(r, w, args.julia_delay_ms / 1000.0), "127.0.0.1", args.port
+        )
+        async with server:
+            await server.serve_forever()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+class EphemeralPostgres:
+    """A throwaway cluster in a temp directory (initdb + pg_ctl), trust auth, fsync off."""
+    def __init__(self, workdir: str):
+        self.data_dir = os.path.join(workdir, "pgdata")
+        self.port = free_port()
+        self.bin_dir = self._find_bin_dir()
+
+    @staticmethod
+    def _find_bin_dir() -> str:
+        initdb = shutil.which("initdb")
+        if initdb:
+            return os.path.dirname(initdb)
+        candidates = sorted(glob.glob("/usr/lib/postgresql/*/bin/initdb"))
+        if not candidates:
+            raise SystemExit("--postgres needs initdb and pg_ctl (PostgreSQL server binaries) on PATH.")
+        return os.path.dirname(candidates[-1])
+
+    def start(self) -> str:
+        subprocess.run([os.path.join(self.bin_dir, "initdb"), "-D", self.data_dir, "-U", "bench", "-A", "trust", "--no-sync"],
+                       check=True, stdout=subprocess.DEVNULL)
+        options = f"-F -p {self.port} -k {self.data_dir} -c listen_addresses=127.0.0.1"
+        subprocess.run([os.path.join(self.bin_dir, "pg_ctl"), "-D", self.data_dir, "-o", options, "-w", "-l",
+                        os.path.join(self.data_dir, "server.log"), "start"], check=True, stdout=subprocess.DEVNULL)
+        return f"postgresql+psycopg2://bench@127.0.0.1:{self.port}/postgres"
+
+    def stop(self):
+        subprocess.run([os.path.join(self.bin_dir, "pg_ctl"), "-D", self.data_dir, "-m", "fast", "stop"],
+                       check=False, stdout=subprocess.DEVNULL)
+
+
+class ProcessSampler:
+    """CPU time and resident memory of another process, from /proc (Linux)."""
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.ticks = os.sysconf("SC_CLK_TCK")
+
+    def cpu_seconds(self) -> float:
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / self.ticks  # utime + stime
+        except OSError:
+            return float("nan")
+
+    def rss_mb(self) -> float:
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024.0
+        except OSError:
+            pass
+        return float("nan")
+
+
+# --- Load Driver ---
+
+async def drive(op: Callable[[int], Awaitable[bool]], args, sampler: ProcessSampler) -> Dict[str, Any]:
+    """Runs `args.concurrency` closed-loop callers of `op`; only calls started after the warmup count."""
+    latencies: List[float] = []
+    errors = 0
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + args.warmup
+    deadline = measure_from + args.duration
+    seq = iter(range(1 << 62))
+    peak_rss = sampler.rss_mb()
+
+    async def caller():
+        nonlocal errors
+        while loop.time() < deadline:
+            started = time.perf_counter()
+            counted = loop.time() >= measure_from
+            try:
+                ok = await op(next(seq))
+            except Exception:
+                ok = False
+            if counted:
+                if ok:
+                    latencies.append((time.perf_counter() - started) * 1000.0)
+                else:
+                    errors += 1
+
+    async def sample_rss():
+        nonlocal peak_rss
+        while loop.time() < deadline:
+            await asyncio.sleep(0.25)
+            peak_rss = max(peak_rss, sampler.rss_mb())
+
+    await asyncio.sleep(0)
+    callers = [asyncio.create_task(caller()) for _ in range(args.concurrency)]
+    rss_task = asyncio.create_task(sample_rss())
+    await asyncio.sleep(max(measure_from - loop.time(), 0.0))
+    cpu_started, client_cpu_started, wall_started = sampler.cpu_seconds(), time.process_time(), time.perf_counter()
+    await asyncio.gather(*callers)
+    elapsed = time.perf_counter() - wall_started
+    server_cpu = sampler.cpu_seconds() - cpu_started
+    client_cpu = time.process_time() - client_cpu_started
+    await rss_task
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_per_s": round(len(latencies) / elapsed, 1),
+        **percentiles(latencies),
+        "server_cpu_percent": round(server_cpu / elapsed * 100.0, 1),
+        "server_peak_rss_mb": round(peak_rss, 1),
+        "client_cpu_percent": round(client_cpu / elapsed * 100.0, 1),  # Near 100: the load generator is the bottleneck
+    }
+
+
+def telemetry_record(seq: int, node: str) -> Dict[str, Any]:
+    return {
+        "source_node_id": node,
+        "metric_name": "cpu_utilization",
+        "value": {"cpu_percent": float(seq % 97), "load_1m": (seq % 13) / 4.0},
+        "timestamp": time.time(),
+    }
+
+
+async def run_scenarios(args, base_url: str, grpc_address: str, sampler: ProcessSampler) -> Dict[str, Any]:
+    import grpc
+    import httpx
+    import proto.alert_pb2 as alert_pb2
+    import proto.alert_pb2_grpc as alert_pb2_grpc
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    alert_ids: List[str] = []
+    results: Dict[str, Any] = {}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as http, grpc.aio.insecure_channel(grpc_address) as channel:
+        stub = alert_pb2_grpc.IntelligenceCoreStub(channel)
+
+        async def analyze(seq: int, node: Optional[str] = None) -> bool:
+            response = await http.post("/telemetry/analyze", json=telemetry_record(seq, node or f"bench-node-{seq % args.nodes}"))
+            if response.status_code != 201:
+                return False
+            if len(alert_ids) < 10000:
+                alert_ids.append(response.json()["alert_id"])
+            return True
+
+        async def batch(seq: int) -> bool:
+            body = "\n".join(json.dumps(telemetry_record(seq * args.batch_rows + i, f"bench-node-{(seq + i) % args.nodes}"))
+                             for i in range(args.batch_rows))
+            response = await http.post("/telemetry/analyze/batch", content=body, headers={"Content-Type": "application/x-ndjson"})
+            return response.status_code == 201
+
+        async def alert_lookup(seq: int) -> bool:
+            return (await http.get(f"/alerts/{random.choice(alert_ids)}")).status_code == 200
+
+        async def alert_list(seq: int) -> bool:
+            return (await http.get("/alerts", params={"limit": 50})).status_code == 200
+
+        async def julia_optimize(seq: int) -> bool:
+            command = {"threat_state": {"node": seq % 7}, "available_resources": ["firewall"], "budget": float(seq % args.julia_distinct)}
+            return (await http.post("/optimize/defense-resources", json=command)).status_code == 200
+
+        async def grpc_threat_intel(seq: int) -> bool:
+            response = await stub.GetThreatIntelligence(alert_pb2.GetThreatIntelRequest(query="latest", page_size=50))
+            return response.success
+
+        async def grpc_stream() -> Dict[str, Any]:
+            sent: Dict[str, float] = {}
+            delivery: List[float] = []
+            received = [0]
+
+            async def subscriber(idx: int):
+                async for alert in stub.StreamThreatEvents(alert_pb2.StreamThreatEventsRequest()):
+                    received[0] += 1
+                    started = sent.get(alert.source_node_id)
+                    if idx == 0 and started is not None:
+                        delivery.append((time.perf_counter() - started) * 1000.0)
+
+            async def traced_analyze(seq: int) -> bool:
+                node = f"bench-stream-{seq}"  # Unique, so the subscriber can match the alert to its request
+                sent[node] = time.perf_counter()
+                return await analyze(seq, node)
+
+            streams = [asyncio.create_task(subscriber(i)) for i in range(args.subscribers)]
+            await asyncio.sleep(0.5)  # Let the subscriptions open
+            result = await drive(traced_analyze, args, sampler)
+            await asyncio.sleep(0.5)  # Drain the write buffer
+            for stream in streams:
+                stream.cancel()
+            await asyncio.gather(*streams, return_exceptions=True)
+            delivered = percentiles(delivery)
+            result.update({
+                "subscribers": args.subscribers,
+                "events_delivered_per_s": round(received[0] / (args.duration + args.warmup), 1),
+                **{f"delivery_{key}": value for key, value in delivered.items()},
+            })
+            return result
+
+        operations = {
+            "analyze": analyze, "batch": batch, "alert_lookup": alert_lookup, "alert_list": alert_list,
+            "julia_optimize": julia_optimize, "grpc_threat_intel": grpc_threat_intel,
+        }
+        for name in args.scenarios:
+            if name == "alert_lookup" and not alert_ids:
+                for seq in range(200):  # Seed alerts to look up
+                    await analyze(seq)
+            if name == "grpc_stream":
+                results[name] = await grpc_stream()
+            else:
+                results[name] = await drive(operations[name], args, sampler)
+            if name == "batch":
+                results[name]["rows_per_s"] = round(results[name]["throughput_per_s"] * args.batch_rows, 1)
+            print(f"{name}: {results[name]['throughput_per_s']}/s p99={results[name]['p99_ms']} ms", file=sys.stderr)
+    return results
+
+
+# --- Baseline Comparison ---
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    """Per-scenario relative change of throughput and p99 against a saved report."""
+    comparison = {}
+    for name, current in results.items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        throughput = current["throughput_per_s"] / max(previous["throughput_per_s"], 1e-9) - 1.0
+        p99 = current["p99_ms"] / max(previous["p99_ms"], 1e-9) - 1.0
+        comparison[name] = {
+            "throughput_change": round(throughput, 3),
+            "p99_change": round(p99, 3),
+            "regressed": throughput < -tolerance or p99 > tolerance,
+        }
+    return comparison
+
+
+def wait_until_ready(base_url: str, server: subprocess.Popen, timeout: float = 120.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"Server exited during startup with status {server.returncode}.")
+        try:
+            health = httpx.get(f"{base_url}/health", timeout=2.0)
+            if health.status_code == 200 and all(c["state"] != "starting" for c in health.json()["components"].values()):
+                return health.json()
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit("Server did not become ready in time.")
+
+
+def run(args) -> int:
+    workdir = tempfile.mkdtemp(prefix="omega_load_")
+    postgres = None
+    processes: List[subprocess.Popen] = []
+    try:
+        if args.database_url:
+            database_url = args.database_url
+        elif args.postgres:
+            postgres = EphemeralPostgres(workdir)
+            database_url = postgres.start()
+        else:
+            database_url = f"sqlite:///{os.path.join(workdir, 'alerts.db')}"
+        http_port, grpc_port, julia_port = free_port(), free_port(), free_port()
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url,
+            "GRPC_SERVER_ADDRESS": f"127.0.0.1:{grpc_port}",
+            "JULIA_COMPUTE_HOST": "127.0.0.1",
+            "JULIA_COMPUTE_PORT": str(julia_port),
+            "MODEL_BACKEND": "onnx",
+            "BASELINE_SNAPSHOT_PATH": os.path.join(workdir, "baselines.npz"),
+            "LOG_LEVEL": "WARNING",
+            "PYTHONPATH": SRC,
+        }
+        env.update(kv.split("=", 1) for kv in args.server_env)
+        script = os.path.abspath(__file__)
+        processes.append(subprocess.Popen(
+            [sys.executable, script, "--fake-julia", "--port", str(julia_port), "--julia-delay-ms", str(args.julia_delay_ms)], cwd=workdir
+        ))
+        server = subprocess.Popen(
+            [sys.executable, script, "--serve", "--port", str(http_port),
+             "--model-base-ms", str(args.model_base_ms), "--model-per-row-ms", str(args.model_per_row_ms)],
+            cwd=workdir, env=env,  # cwd: keep a developer's .env out of the measured configuration
+        )
+        processes.append(server)
+        base_url = f"http://127.0.0.1:{http_port}"
+        health = wait_until_ready(base_url, server)
+        sampler = ProcessSampler(server.pid)
+        report = {
+            "config": {
+                "database": database_url.split(":", 1)[0],
+                "concurrency": args.concurrency, "duration_s": args.duration, "warmup_s": args.warmup,
+                "batch_rows": args.batch_rows, "nodes": args.nodes, "subscribers": args.subscribers,
+                "model_base_ms": args.model_base_ms, "model_per_row_ms": args.model_per_row_ms,
+                "julia_delay_ms": args.julia_delay_ms, "server_env": args.server_env,
+                "components": {name: c["state"] for name, c in health["components"].items()},
+            },
+            "scenarios": asyncio.run(run_scenarios(args, base_url, f"127.0.0.1:{grpc_port}", sampler)),
+        }
+        status = 0
+        if args.baseline:
+            with open(args.baseline) as f:
+                report["comparison"] = compare(report["scenarios"], json.load(f), args.tolerance)
+            status = 1 if any(c["regressed"] for c in report["comparison"].values()) else 0
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        print(json.dumps(report, indent=2))
+        return status
+    finally:
+        for process in reversed(processes):
+            process.send_signal(signal.SIGINT)  # uvicorn shuts down gracefully, flushing the write buffer
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if postgres is not None:
+            postgres.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--concurrency", type=int, default=32, help="Closed-loop callers per scenario")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--batch-rows", type=int, default=500)
+    parser.add_argument("--nodes", type=int, default=1000, help="Distinct source nodes in generated telemetry")
+    parser.add_argument("--subscribers", type=int, default=8, help="StreamThreatEvents streams in grpc_stream")
+    parser.add_argument("--julia-distinct", type=int, default=50, help="Distinct Julia commands (the rest hit the cache)")
+    parser.add_argument("--model-base-ms", type=float, default=0.5, help="Stub anomaly model cost per batch")
+    parser.add_argument("--model-per-row-ms", type=float, default=0.01, help="Stub anomaly model cost per row")
+    parser.add_argument("--julia-delay-ms", type=float, default=2.0, help="Fake Julia server compute time")
+    parser.add_argument("--postgres", action="store_true", help="Run against an ephemeral local Postgres cluster")
+    parser.add_argument("--database-url", help="Run against an existing database instead")
+    parser.add_argument("--server-env", nargs="*", default=[], metavar="KEY=VALUE", help="Extra settings for the service")
+    parser.add_argument("--output", help="Write the JSON report here (e.g. to use as a later --baseline)")
+    parser.add_argument("--baseline", help="Saved report to compare with; exit status 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative throughput drop / p99 rise")
+    # Internal roles of the subprocesses
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--fake-julia", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+    elif args.fake_julia:
+        fake_julia(args)
+    else:
+        sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# intelligence-core/benchmarks/bench_featurizer.py
+"""
+Throughput benchmark for the telemetry featurizer.
+
+Usage: python benchmarks/bench_featurizer.py [--sizes 1000 10000 100000] [--repeats 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "python"))
+from features import TelemetryFeaturizer, DEFAULT_SCHEMAS  # noqa: E402
+
+
+def make_records(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    metrics = list(DEFAULT_SCHEMAS)
+    metric_names, values = [], []
+    for _ in range(n):
+        metric = rng.choice(metrics)
+        fields = DEFAULT_SCHEMAS[metric]
+        value = {field: rng.random() * 1000 for field in fields[: rng.randint(1, len(fields))]}
+        value[f"extra_{rng.randint(0, 50)}"] = rng.random()  # Unregistered key -> hashed slot
+        value["state"] = rng.choice(("RUNNING", "SLEEPING", "ZOMBIE"))
+        metric_names.append(metric)
+        values.append(value)
+    return metric_names, values
+
+
+def bench(n: int, repeats: int) -> dict:
+    featurizer = TelemetryFeaturizer()
+    metric_names, values = make_records(n)
+    out = np.empty((n, featurizer.feature_dim), dtype=np.float32)
+    featurizer.transform(metric_names, values, out=out)  # Warm the hash cache
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        featurizer.transform(metric_names, values, out=out)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {"records": n, "best_s": round(best, 6), "rows_per_s": round(n / best)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps([bench(n, args.repeats) for n in args.sizes], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# intelligence-core/benchmarks/bench_model_backends.py
+"""
+CPU latency, throughput and memory comparison of the native and ONNX model backends.
+
+Each backend is measured in a fresh subprocess so resident memory (RSS) reflects only
+that backend's runtime and weights. Export the ONNX models first with
+`python src/python/onnx_backend.py ... --quantize`.
+
+Usage: python benchmarks/bench_model_backends.py --onnx-dir ./models/onnx \
+           [--keras-model ./models/anomaly_detector.h5] [--llm-model distilbert-base-uncased-finetuned-sst-2-english]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "python")
+sys.path.insert(0, SRC)
+
+ANOMALY_BACKENDS = ("keras", "onnx", "onnx-int8")
+SENTIMENT_BACKENDS = ("transformers", "onnx", "onnx-int8")
+SAMPLE_TEXTS = [
+    "Multiple failed SSH logins followed by a successful root login from an unknown ASN.",
+    "Scheduled backup completed successfully.",
+    "Outbound traffic spike to a newly registered domain over port 443.",
+    "Patch rollout finished; all nodes healthy.",
+]
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return float("nan")
+
+
+def load_anomaly(backend: str, args):
+    if backend == "keras":
+        from tensorflow import keras
+        return keras.models.load_model(args.keras_model).predict_on_batch
+    from onnx_backend import OnnxAnomalyModel, anomaly_onnx_path
+    model = OnnxAnomalyModel(anomaly_onnx_path(args.onnx_dir, backend == "onnx-int8"), args.intra_op_threads, args.inter_op_threads)
+    return model.predict_on_batch
+
+
+def load_sentiment(backend: str, args):
+    if backend == "transformers":
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(args.llm_model)
+        model = AutoModelForSequenceClassification.from_pretrained(args.llm_model).eval()
+
+        def classify(texts):
+            encoded = tokenizer(texts, padding="longest", truncation=True, return_tensors="pt")
+            with torch.inference_mode():
+                return model(**encoded).logits.argmax(dim=-1).tolist()
+        return classify
+    from onnx_backend import OnnxSentimentClassifier, sentiment_onnx_path
+    model = OnnxSentimentClassifier(sentiment_onnx_path(args.onnx_dir, backend == "onnx-int8"), 512, args.intra_op_threads, args.inter_op_threads)
+    return model.classify
+
+
+def measure(fn, single, batch, iterations: int) -> dict:
+    fn(single)  # Warm up allocators and kernels
+    fn(batch)
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(single)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+    started = time.perf_counter()
+    for _ in range(max(iterations // 10, 1)):
+        fn(batch)
+    elapsed = time.perf_counter() - started
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+        "batch_items_per_s": round(len(batch) * max(iterations // 10, 1) / elapsed, 1),
+    }
+
+
+def worker(model: str, backend: str, args) -> dict:
+    baseline = rss_mb()
+    started = time.perf_counter()
+    if model == "anomaly":
+        from features import FEATURE_DIM
+        fn = load_anomaly(backend, args)
+        rng = np.random.default_rng(0)
+        single = rng.normal(size=(1, FEATURE_DIM)).astype(np.float32)
+        batch = rng.normal(size=(args.batch_size, FEATURE_DIM)).astype(np.float32)
+    else:
+        fn = load_sentiment(backend, args)
+        single = SAMPLE_TEXTS[:1]
+        batch = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(args.batch_size)]
+    load_s = time.perf_counter() - started
+    result = {"model": model, "backend": backend, "load_s": round(load_s, 3)}
+    result.update(measure(fn, single, batch, args.iterations))
+    result["rss_mb"] = round(rss_mb() - baseline, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--onnx-dir", default="./models/onnx")
+    parser.add_argument("--keras-model", help="Include the Keras backend (needs TensorFlow)")
+    parser.add_argument("--llm-model", help="Include the transformers backend (needs torch)")
+    parser.add_argument("--models", nargs="+", default=["anomaly", "sentiment"], choices=["anomaly", "sentiment"])
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--intra-op-threads", type=int, default=0)
+    parser.add_argument("--inter-op-threads", type=int, default=1)
+    parser.add_argument("--worker", nargs=2, metavar=("MODEL", "BACKEND"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker[0], args.worker[1], args)))
+        return
+
+    passthrough = [
+        "--onnx-dir", args.onnx_dir, "--batch-size", str(args.batch_size), "--iterations", str(args.iterations),
+        "--intra-op-threads", str(args.intra_op_threads), "--inter-op-threads", str(args.inter_op_threads),
+    ]
+    if args.keras_model:
+        passthrough += ["--keras-model", args.keras_model]
+    if args.llm_model:
+        passthrough += ["--llm-model", args.llm_model]
+    results = []
+    for model in args.models:
+        for backend in ANOMALY_BACKENDS if model == "anomaly" else SENTIMENT_BACKENDS:
+            if (backend == "keras" and not args.keras_model) or (backend == "transformers" and not args.llm_model):
+                continue
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), *passthrough, "--worker", model, backend],
+                capture_output=True, text=True,
+            )
+            if proc.returncode == 0:
+                results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+            else:
+                results.append({"model": model, "backend": backend, "error": (proc.stderr.strip().splitlines() or ["failed"])[-1]})
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
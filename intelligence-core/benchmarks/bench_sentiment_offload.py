@@ -0,0 +1,118 @@
+# intelligence-core/benchmarks/bench_sentiment_offload.py
+"""
+Latency benchmark for sentiment inference under concurrent async callers.
+
+Compares calling a (stub) classifier inline on the event loop, as the old
+`LLMService.get_sentiment` path did, with the batched MicroBatcher executor used by
+/analyze/sentiment. The stub sleeps `base_ms + per_text_ms * batch` per forward,
+releasing the GIL like a torch forward pass does.
+
+Inline latencies only cover the call itself: the time callers spend waiting for the
+stalled event loop shows up in `max_loop_lag_ms` and in the lower throughput.
+
+Usage: python benchmarks/bench_sentiment_offload.py [--callers 200] [--requests 5] [--max-queue 1024]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "python"))
+from batching import MicroBatcher, QueueFullError  # noqa: E402
+
+
+class StubClassifier:
+    def __init__(self, base_ms: float, per_text_ms: float):
+        self.base = base_ms / 1000.0
+        self.per_text = per_text_ms / 1000.0
+
+    def get_sentiments(self, texts: List[str]) -> List[str]:
+        time.sleep(self.base + self.per_text * len(texts))
+        return ["NEGATIVE" if "attack" in text else "POSITIVE" for text in texts]
+
+
+async def _loop_lag_probe(stop: asyncio.Event, lags: List[float], interval: float = 0.005):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(loop.time() - expected, 0.0) * 1000.0)
+
+
+async def run(mode: str, args) -> dict:
+    model = StubClassifier(args.base_ms, args.per_text_ms)
+    batcher = None
+    if mode == "offload":
+        batcher = MicroBatcher(
+            model.get_sentiments, max_batch_size=args.batch_size, max_wait_ms=args.max_wait_ms,
+            max_queue_size=args.max_queue, name="bench_sentiment",
+        )
+        await batcher.start()
+
+    latencies: List[float] = []
+    shed = 0
+
+    async def caller(idx: int):
+        nonlocal shed
+        for j in range(args.requests):
+            text = f"caller {idx} request {j}: possible attack on node-{j % 7}"
+            started = time.perf_counter()
+            try:
+                if batcher is None:
+                    model.get_sentiments([text])  # Blocks the event loop
+                else:
+                    await batcher.submit(text)
+            except QueueFullError:
+                shed += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            await asyncio.sleep(0)
+
+    stop, lags = asyncio.Event(), []
+    probe = asyncio.create_task(_loop_lag_probe(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(caller(i) for i in range(args.callers)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    if batcher is not None:
+        await batcher.stop()
+
+    lat = np.asarray(latencies) if latencies else np.zeros(1)
+    result = {
+        "mode": mode,
+        "callers": args.callers,
+        "completed": len(latencies),
+        "shed": shed,
+        "throughput_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(lat, 50)), 2),
+        "p99_ms": round(float(np.percentile(lat, 99)), 2),
+        "max_loop_lag_ms": round(max(lags, default=elapsed * 1000.0), 2),
+    }
+    if batcher is not None:
+        sizes = batcher.batch_size_hist.snapshot()
+        result["mean_batch_size"] = round(sizes["sum"] / max(sizes["count"], 1), 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--callers", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5, help="Requests per caller")
+    parser.add_argument("--base-ms", type=float, default=8.0, help="Fixed cost of one model forward")
+    parser.add_argument("--per-text-ms", type=float, default=0.5, help="Marginal cost per text in a batch")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    parser.add_argument("--max-queue", type=int, default=1024)
+    parser.add_argument("--modes", nargs="+", default=["inline", "offload"], choices=["inline", "offload"])
+    args = parser.parse_args()
+    print(json.dumps([asyncio.run(run(mode, args)) for mode in args.modes], indent=2))
+
+
+if __name__ == "__main__":
+    main()
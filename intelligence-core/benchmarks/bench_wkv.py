@@ -0,0 +1,79 @@
+# intelligence-core/benchmarks/bench_wkv.py
+"""
+Latency benchmark for the WKV kernels across batch, sequence and channel sizes.
+
+Usage: python benchmarks/bench_wkv.py [--shapes 1x1024x4096 8x256x1024] [--kernels torch compiled cpp] [--repeats 5]
+
+`reference` (the per-element loop) is only timed for shapes up to --reference-max-elements.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "python"))
+from wkv import load_extension, wkv, wkv_reference  # noqa: E402
+
+KERNELS = ("reference", "torch", "compiled", "cpp")
+
+
+def parse_shape(text: str):
+    B, T, C = (int(part) for part in text.lower().split("x"))
+    return B, T, C
+
+
+def make_inputs(B: int, T: int, C: int, seed: int = 0):
+    generator = torch.Generator().manual_seed(seed)
+    w, u, k, v = (torch.randn((B, T, C), generator=generator) for _ in range(4))
+    return w, u, k, v, torch.randn((B, C), generator=generator)
+
+
+def kernel_fn(kernel: str):
+    if kernel == "reference":
+        return wkv_reference
+    os.environ["WKV_KERNEL"] = "cpp" if kernel == "cpp" else "torch"
+    if kernel == "compiled":
+        return torch.compile(wkv, fullgraph=True)
+    return wkv
+
+
+def bench(kernel: str, shape, repeats: int) -> dict:
+    B, T, C = shape
+    fn = kernel_fn(kernel)
+    w, u, k, v, s = make_inputs(B, T, C)
+    fn(w, u, k, v, s.clone())  # Warm-up (and compilation)
+    timings = []
+    for _ in range(repeats):
+        state = s.clone()
+        start = time.perf_counter()
+        fn(w, u, k, v, state)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {"kernel": kernel, "B": B, "T": T, "C": C, "best_s": round(best, 6), "tokens_per_s": round(B * T / best)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shapes", type=parse_shape, nargs="+", default=[(1, 64, 512), (1, 1024, 4096), (8, 256, 1024), (32, 128, 768)])
+    parser.add_argument("--kernels", nargs="+", choices=KERNELS, default=["reference", "torch", "compiled", "cpp"])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--reference-max-elements", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 keeps the default)")
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    kernels = [k for k in args.kernels if k != "cpp" or load_extension() is not None]
+    results = []
+    for shape in args.shapes:
+        for kernel in kernels:
+            if kernel == "reference" and shape[0] * shape[1] * shape[2] > args.reference_max_elements:
+                continue
+            results.append(bench(kernel, shape, 1 if kernel == "reference" else args.repeats))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ using LightGraphs # For graph-based analysis
 using Distributed # For parallel processing
 using Sockets # For inter-process communication
 using Serialization # For efficient data exchange
+using JSON # Wire format for the TCP command protocol
 using ArgParse # For command-line argument parsing
 using TOML # For configuration file parsing
 using Logging # For structured logging
@@ -190,11 +191,89 @@ end
 
 # --- §4. Inter-Process Communication (TCP Server) ---
 
+"""
+    handle_request(request)
+
+Dispatches one decoded JSON command and returns the response dictionary.
+"""
+function handle_request(request::Dict)::Dict{String, Any}
+    response = Dict{String, Any}()
+    command = get(request, "command", nothing)
+    if command == "PING"
+        response["result"] = "PONG"
+    elseif command == "OPTIMIZE_RESOURCES"
+        threat_state = ThreatState(
+            request["threat_state"]["id"],
+            request["threat_state"]["severity"],
+            request["threat_state"]["impact_score"],
+            request["threat_state"]["affected_nodes"],
+            request["threat_state"]["attack_vector"]
+        )
+        available_resources = [
+            DefenseResource(
+                r["id"], r["type"], r["cost"], r["effectiveness"], r["current_count"], r["max_count"]
+            ) for r in request["available_resources"]
+        ]
+        result = optimize_defense_resources(
+            threat_state,
+            available_resources,
+            request["budget"],
+            Dict{String, Float64}(k => v for (k, v) in request["objectives"])
+        )
+        response["result"] = Dict(
+            "status" => result.status,
+            "allocated_resources" => result.allocated_resources,
+            "predicted_impact_reduction" => result.predicted_impact_reduction,
+            "total_cost" => result.total_cost,
+            "details" => result.details
+        )
+    elseif command == "ANALYZE_ATTACK_PATH"
+        # Example: construct a simple graph for demo
+        nodes = request["network_graph"]["nodes"]
+        edges = request["network_graph"]["edges"]
+        g = SimpleDiGraph(length(nodes))
+        node_to_idx = Dict(node_id => i for (i, node_id) in enumerate(nodes))
+        for edge in edges
+            add_edge!(g, node_to_idx[edge["src"]], node_to_idx[edge["dst"]])
+        end
+        
+        result = analyze_attack_path_impact(
+            request["attack_path"],
+            g,
+            Dict{String, Float64}(k => v for (k, v) in request["vulnerabilities"]),
+            request["defender_response_time"]
+        )
+        response["result"] = result
+    else
+        response["error"] = "Unknown command: $(command)"
+        response["status"] = "ERROR"
+    end
+    return response
+end
+
+"""
+    write_frame(sock, write_lock, payload)
+
+Writes one frame: a 4-byte big-endian length followed by the UTF-8 JSON payload.
+The lock keeps concurrently finishing requests from interleaving their frames.
+"""
+function write_frame(sock, write_lock::ReentrantLock, payload::Dict)
+    body = Vector{UInt8}(JSON.json(payload))
+    lock(write_lock) do
+        write(sock, hton(UInt32(length(body))))
+        write(sock, body)
+    end
+end
+
 """
     start_tcp_server(host, port)
 
-Starts a simple TCP server to listen for JSON commands from other services
-(e.g., Python Intelligence Core) and execute Julia functions.
+Starts a TCP server that listens for JSON commands from other services
+(e.g., Python Intelligence Core) and executes Julia functions.
+
+Connections are persistent and pipelined: every frame is a 4-byte big-endian length
+followed by a JSON object. Each request is handled in its own task and its response
+echoes the request's `correlation_id`, so responses may be written out of order.
 """
 function start_tcp_server(host::String, port::Int)
     @info "Julia compute server starting on $(host):$(port)..."
@@ -203,77 +282,33 @@ function start_tcp_server(host::String, port::Int)
     @info "Server started. Waiting for connections."
     while true
         sock = accept(server)
-        @async try
+        @async begin
             @info "Client connected: $(sock)"
-            # Read length-prefixed JSON message
-            len_bytes = read(sock, 4)
-            msg_len = Serialization.deserialize(IOBuffer(len_bytes))
-            
-            data_bytes = read(sock, msg_len)
-            request_json = String(data_bytes)
-            
-            request = JSON.parse(request_json)
-            @debug "Received request: $(request)"
-
-            response = Dict{String, Any}()
-            if request["command"] == "OPTIMIZE_RESOURCES"
-                threat_state = ThreatState(
-                    request["threat_state"]["id"],
-                    request["threat_state"]["severity"],
-                    request["threat_state"]["impact_score"],
-                    request["threat_state"]["affected_nodes"],
-                    request["threat_state"]["attack_vector"]
-                )
-                available_resources = [
-                    DefenseResource(
-                        r["id"], r["type"], r["cost"], r["effectiveness"], r["current_count"], r["max_count"]
-                    ) for r in request["available_resources"]
-                ]
-                result = optimize_defense_resources(
-                    threat_state,
-                    available_resources,
-                    request["budget"],
-                    Dict{String, Float64}(k => v for (k, v) in request["objectives"])
-                )
-                response["result"] = Dict(
-                    "status" => result.status,
-                    "allocated_resources" => result.allocated_resources,
-                    "predicted_impact_reduction" => result.predicted_impact_reduction,
-                    "total_cost" => result.total_cost,
-                    "details" => result.details
-                )
-            elseif request["command"] == "ANALYZE_ATTACK_PATH"
-                # Example: construct a simple graph for demo
-                nodes = request["network_graph"]["nodes"]
-                edges = request["network_graph"]["edges"]
-                g = SimpleDiGraph(length(nodes))
-                node_to_idx = Dict(node_id => i for (i, node_id) in enumerate(nodes))
-                for edge in edges
-                    add_edge!(g, node_to_idx[edge["src"]], node_to_idx[edge["dst"]])
+            write_lock = ReentrantLock()
+            try
+                while !eof(sock)
+                    msg_len = ntoh(read(sock, UInt32))
+                    request = JSON.parse(String(read(sock, msg_len)))
+                    @debug "Received request: $(request)"
+                    @async begin
+                        response = try
+                            handle_request(request)
+                        catch e
+                            @error "Error handling client request: $(e)"
+                            Dict{String, Any}("error" => string(e), "status" => "ERROR")
+                        end
+                        if haskey(request, "correlation_id")
+                            response["correlation_id"] = request["correlation_id"]
+                        end
+                        write_frame(sock, write_lock, response)
+                    end
                 end
-                
-                result = analyze_attack_path_impact(
-                    request["attack_path"],
-                    g,
-                    Dict{String, Float64}(k => v for (k, v) in request["vulnerabilities"]),
-                    request["defender_response_time"]
-                )
-                response["result"] = result
-            else
-                response["error"] = "Unknown command: $(request["command"])"
-                response["status"] = "ERROR"
+            catch e
+                @error "Error on client connection: $(e)"
+            finally
+                close(sock)
+                @info "Client disconnected."
             end
-
-            response_json = JSON.json(response)
-            response_len_bytes = Serialization.serialize(IOBuffer(), length(response_json))
-            write(sock, response_len_bytes)
-            write(sock, response_json)
-
-        catch e
-            @error "Error handling client request: $(e)"
-        finally
-            close(sock)
-            @info "Client disconnected."
         end
     end
 end
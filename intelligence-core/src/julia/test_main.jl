@@ -15,20 +15,20 @@ using .IntelligenceCoreJulia # Access the module's contents
 function send_tcp_command(host::String, port::Int, command_dict::Dict)
     sock = connect(IPv4(host), port)
     
-    request_json = JSON.json(command_dict)
+    request_bytes = Vector{UInt8}(JSON.json(merge(command_dict, Dict("correlation_id" => 1))))
     
-    # Send length-prefixed message
-    len_bytes = Serialization.serialize(IOBuffer(), length(request_json))
-    write(sock, len_bytes)
-    write(sock, request_json)
+    # Send length-prefixed message (4-byte big-endian length)
+    write(sock, hton(UInt32(length(request_bytes))))
+    write(sock, request_bytes)
 
     # Read length-prefixed response
-    response_len_bytes = read(sock, 4)
-    response_len = Serialization.deserialize(IOBuffer(response_len_bytes))
+    response_len = ntoh(read(sock, UInt32))
     response_data = read(sock, response_len)
     
     close(sock)
-    return JSON.parse(String(response_data))
+    response = JSON.parse(String(response_data))
+    @test response["correlation_id"] == 1
+    return response
 end
 
 # --- Test Suite ---
@@ -0,0 +1,278 @@
+# intelligence-core/src/python/admission.py
+import hashlib
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import orjson
+
+    def _canonical(sample: list) -> bytes:
+        return orjson.dumps(sample, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+except ImportError:  # orjson is optional; the stdlib encoder is about 5x slower
+    def _canonical(sample: list) -> bytes:
+        return json.dumps(sample, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+logger = logging.getLogger(__name__)
+
+# Per-row admission decisions; everything up to SAMPLED is scored.
+ADMITTED, SAMPLED, DUPLICATE, SHED = 0, 1, 2, 3
+DECISION_NAMES = ("admitted", "sampled", "duplicate", "shed")
+
+_SAMPLE_RESOLUTION = 1 << 16
+
+
+def content_digest(source_node_id: str, metric_name: str, timestamp: float, value: Dict[str, Any]) -> int:
+    """64-bit content hash of one telemetry sample (node, metric, timestamp and canonical value)."""
+    encoded = _canonical([source_node_id, metric_name, timestamp, value])
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), "little")
+
+
+def content_digests(
+    source_node_ids: Sequence[str], metric_names: Sequence[str], timestamps: Sequence[float], values: Sequence[Dict[str, Any]]
+) -> np.ndarray:
+    """`content_digest` of every row, as a uint64 array."""
+    return np.fromiter(
+        (content_digest(*row) for row in zip(source_node_ids, metric_names, timestamps, values)),
+        dtype=np.uint64, count=len(source_node_ids)
+    )
+
+
+def admitted(decisions: np.ndarray) -> np.ndarray:
+    return decisions <= SAMPLED
+
+
+# --- Dedup Filter ---
+
+class DedupFilter:
+    """
+    A time-decaying Bloom filter over content digests.
+
+    Two bit-packed generations are kept: inserts go to the current one and lookups check
+    both. The current generation becomes the previous one (and the oldest is cleared)
+    every `window_s`, or earlier once it holds `capacity` digests so the false-positive
+    rate stays near `error_rate`. A digest is therefore remembered for at least one full
+    window, and memory is fixed at 2 * m bits for m = -capacity * ln(error_rate) / ln(2)^2.
+    Not thread-safe; `AdmissionController` serializes access.
+    """
+    def __init__(self, window_s: float = 300.0, capacity: int = 1_000_000, error_rate: float = 0.001):
+        if not 0.0 < error_rate < 1.0:
+            raise ValueError("error_rate must be in (0, 1)")
+        self.window = window_s
+        self.capacity = capacity
+        self.num_bits = max(64, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._current = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self._previous = np.zeros_like(self._current)
+        self._inserted = 0
+        self._rotated_at: Optional[float] = None
+        self.rotations = 0
+
+    def _positions(self, digests: np.ndarray):
+        # Double hashing: position_i = h1 + i * h2 (mod m), h2 odd so the probes differ.
+        h1 = digests & np.uint64(0xFFFFFFFF)
+        h2 = (digests >> np.uint64(32)) | np.uint64(1)
+        probes = (h1[:, None] + np.arange(self.num_hashes, dtype=np.uint64)[None, :] * h2[:, None]) % np.uint64(self.num_bits)
+        return (probes >> np.uint64(3)).astype(np.intp), (np.uint8(1) << (probes & np.uint64(7)).astype(np.uint8))
+
+    def _rotate(self, now: float):
+        self._previous, self._current = self._current, self._previous
+        self._current.fill(0)
+        self._inserted = 0
+        self._rotated_at = now
+        self.rotations += 1
+
+    def _expire(self, now: float):
+        if self._rotated_at is None:
+            self._rotated_at = now
+        elif now - self._rotated_at >= self.window:
+            if now - self._rotated_at >= 2 * self.window:
+                self._previous.fill(0) # Idle for two windows: both generations are stale
+            self._rotate(now)
+
+    def contains(self, digests: np.ndarray, now: float) -> np.ndarray:
+        self._expire(now)
+        if not len(digests):
+            return np.zeros(0, dtype=bool)
+        offsets, masks = self._positions(digests)
+        in_current = ((self._current[offsets] & masks) != 0).all(axis=1)
+        in_previous = ((self._previous[offsets] & masks) != 0).all(axis=1)
+        return in_current | in_previous
+
+    def add(self, digests: np.ndarray, now: float):
+        self._expire(now)
+        if not len(digests):
+            return
+        if self._inserted + len(digests) > self.capacity:
+            self._rotate(now)
+        offsets, masks = self._positions(digests)
+        np.bitwise_or.at(self._current, offsets.ravel(), masks.ravel())
+        self._inserted += len(digests)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._current.nbytes + self._previous.nbytes
+
+
+# --- Admission Controller ---
+
+# Per-node state: [tokens, last refill, admitted, sampled, duplicate, shed]
+_TOKENS, _REFILLED, _COUNTERS = 0, 1, 2
+
+
+class AdmissionController:
+    """
+    The pre-scoring stage shared by the HTTP endpoints and the Kafka workers.
+
+    Each row is checked against the dedup filter (agents resend identical samples on
+    reconnect, also within one batch) and then charged to its node's token bucket
+    (`rate_per_s` sustained, `burst` peak). When a node's bucket is empty it is in
+    sampling mode: only `sample_rate` of its overflow is still scored, picked by content
+    hash so a resend gets the same verdict, and the rest is shed. A noisy node therefore
+    costs at most its rate plus the sample, and never starves the others.
+
+    Admission only checks the dedup filter. Rows are remembered once the caller has
+    persisted their alerts and passes their digests to `record`, so a batch whose write
+    fails (and is redelivered by Kafka or retried by the agent) is scored again instead
+    of being dropped as a duplicate of rows that were never stored.
+
+    Per-node buckets and counters are kept for the `max_nodes` most recently seen nodes.
+    `rate_per_s <= 0` disables rate limiting and `dedup_window_s <= 0` disables dedup.
+    """
+    def __init__(
+        self,
+        rate_per_s: float = 200.0,
+        burst: float = 400.0,
+        sample_rate: float = 0.1,
+        dedup_window_s: float = 300.0,
+        dedup_capacity: int = 1_000_000,
+        dedup_error_rate: float = 0.001,
+        max_nodes: int = 100_000
+    ):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be in [0, 1]")
+        self.rate = rate_per_s
+        self.burst = max(burst, 1.0)
+        self.sample_rate = sample_rate
+        self.max_nodes = max_nodes
+        self.dedup = DedupFilter(dedup_window_s, dedup_capacity, dedup_error_rate) if dedup_window_s > 0 else None
+        self._sample_cutoff = int(sample_rate * _SAMPLE_RESOLUTION)
+        self._nodes: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._totals = [0, 0, 0, 0]
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def admit_columns(self, columns, digests: Optional[np.ndarray] = None, now: Optional[float] = None) -> np.ndarray:
+        return self.admit(columns.source_node_ids, columns.metric_names, columns.timestamps, columns.values, digests, now)
+
+    def admit(
+        self,
+        source_node_ids: Sequence[str],
+        metric_names: Sequence[str],
+        timestamps: Sequence[float],
+        values: Sequence[Dict[str, Any]],
+        digests: Optional[np.ndarray] = None,
+        now: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Returns one decision (ADMITTED, SAMPLED, DUPLICATE or SHED) per row, in row order.
+        `digests` are the rows' `content_digests`, if the caller already has them (it
+        needs them for `record`).
+        """
+        n = len(source_node_ids)
+        decisions = np.full(n, ADMITTED, dtype=np.int8)
+        if not n:
+            return decisions
+        now = time.monotonic() if now is None else now
+        if digests is None:
+            digests = content_digests(source_node_ids, metric_names, timestamps, values)
+        with self._lock:
+            if self.dedup is not None:
+                duplicate = self.dedup.contains(digests, now)
+                _, first = np.unique(digests, return_index=True)
+                repeated = np.ones(n, dtype=bool)
+                repeated[first] = False
+                decisions[duplicate | repeated] = DUPLICATE
+            self._charge(source_node_ids, digests, decisions, now)
+        return decisions
+
+    def record(self, digests: np.ndarray, now: Optional[float] = None):
+        """
+        Remembers rows whose alerts are committed, so later resends are duplicates. Only
+        pass admitted rows: shed rows are not remembered, so an agent's retry is judged
+        afresh.
+        """
+        if self.dedup is None or not len(digests):
+            return
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.dedup.add(digests, now)
+
+    def _node(self, node: str, now: float) -> List[float]:
+        state = self._nodes.get(node)
+        if state is None:
+            state = [self.burst, now, 0, 0, 0, 0]
+            self._nodes[node] = state
+            if len(self._nodes) > self.max_nodes:
+                self._nodes.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._nodes.move_to_end(node)
+        return state
+
+    def _charge(self, source_node_ids: Sequence[str], digests: np.ndarray, decisions: np.ndarray, now: float):
+        """Takes a token per non-duplicate row (refilling each bucket once per batch) and counts every decision."""
+        refilled = set()
+        limited = self.rate > 0
+        sampled = ((digests % np.uint64(_SAMPLE_RESOLUTION)).astype(np.int64) < self._sample_cutoff).tolist()
+        for i, (node, decision) in enumerate(zip(source_node_ids, decisions.tolist())):
+            state = self._node(node, now)
+            if limited and decision != DUPLICATE:
+                if node not in refilled:
+                    state[_TOKENS] = min(self.burst, state[_TOKENS] + (now - state[_REFILLED]) * self.rate)
+                    state[_REFILLED] = now
+                    refilled.add(node)
+                if state[_TOKENS] >= 1.0:
+                    state[_TOKENS] -= 1.0
+                else:
+                    decision = SAMPLED if sampled[i] else SHED
+                    decisions[i] = decision
+            state[_COUNTERS + decision] += 1
+            self._totals[decision] += 1
+
+    def totals(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(zip(DECISION_NAMES, self._totals))
+
+    def _node_stats(self, node: str, state: List[float]) -> Dict[str, Any]:
+        counters = dict(zip(DECISION_NAMES, (int(c) for c in state[_COUNTERS:])))
+        return {"source_node_id": node, "tokens": round(state[_TOKENS], 2), "sampling": state[_TOKENS] < 1.0, **counters}
+
+    def node_stats(self, source_node_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            state = self._nodes.get(source_node_id)
+            return None if state is None else self._node_stats(source_node_id, list(state))
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """Totals plus the `top` nodes with the most rows deduplicated, sampled or shed."""
+        with self._lock:
+            nodes = [(node, list(state)) for node, state in self._nodes.items()]
+            totals = dict(zip(DECISION_NAMES, self._totals))
+        noisiest = sorted(nodes, key=lambda item: -sum(item[1][_COUNTERS + SAMPLED:]))[:top]
+        return {
+            **totals,
+            "nodes": len(nodes),
+            "evictions": self.evictions,
+            "rate_per_s": self.rate,
+            "burst": self.burst,
+            "sample_rate": self.sample_rate,
+            "dedup_rotations": self.dedup.rotations if self.dedup is not None else 0,
+            "dedup_memory_bytes": self.dedup.memory_bytes if self.dedup is not None else 0,
+            "noisiest_nodes": [self._node_stats(node, state) for node, state in noisiest if sum(state[_COUNTERS + SAMPLED:])],
+        }
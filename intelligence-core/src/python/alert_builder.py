@@ -0,0 +1,204 @@
+# intelligence-core/src/python/alert_builder.py
+import bisect
+import csv
+import io
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+
+    def _json_text(value: Any) -> str:
+        return orjson.dumps(value, default=str).decode("utf-8")
+except ImportError:  # orjson is optional; the stdlib encoder is slower
+    def _json_text(value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"), default=str)
+
+logger = logging.getLogger(__name__)
+
+# Column order of the alert tuples, as written by COPY.
+ALERT_COLUMNS = ("id", "timestamp", "source_node_id", "metric_name", "value", "anomaly_score", "severity", "status")
+AlertTuple = Tuple[str, datetime, str, str, Dict[str, Any], int, str, str]
+
+SEVERITY_LEVELS = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+DEFAULT_SEVERITY_THRESHOLDS = (50, 70, 90)  # A score above each threshold is MEDIUM, HIGH, CRITICAL
+
+_CROCKFORD = np.frombuffer(b"0123456789ABCDEFGHJKMNPQRSTVWXYZ", dtype=np.uint8)
+_DIGIT_PAIRS = [chr(a) + chr(b) for a in _CROCKFORD.tolist() for b in _CROCKFORD.tolist()]  # Indexed by 10 bits
+_LOW_SHIFTS = tuple(range(60, -1, -5))  # Bit offsets of the last 13 base32 digits, which cover the low 64 bits
+_VECTOR_MIN_ROWS = 32  # Below this, numpy's per-call overhead exceeds the per-row Python work
+_MIN_EPOCH_S, _MAX_EPOCH_S = -62135596800.0, 253402300799.0  # 0001-01-01 and 9999-12-31 23:59:59 UTC
+
+
+# --- Severity ---
+
+def severity_indices(scores: np.ndarray, thresholds: Sequence[int] = DEFAULT_SEVERITY_THRESHOLDS) -> np.ndarray:
+    """Index into SEVERITY_LEVELS per score: the number of thresholds the score exceeds."""
+    return np.digitize(np.asarray(scores), np.asarray(thresholds), right=True)
+
+
+# --- ULIDs ---
+
+def new_ulids(n: int, now: Optional[float] = None, prefix: str = "") -> List[str]:
+    """
+    `n` ULIDs (48-bit millisecond timestamp + 80 random bits, Crockford base32) sharing
+    one timestamp, each with `prefix`. As in the ULID spec's monotonic mode, the first
+    gets random bits and the others increment them, so the IDs sort in batch order and a
+    batch costs one `os.urandom` call. Only the low 64 bits differ within a batch, so
+    only the last 13 digits are encoded per row.
+    """
+    if n <= 0:
+        return []
+    millis = int((time.time() if now is None else now) * 1000) & ((1 << 48) - 1)
+    entropy = int.from_bytes(os.urandom(10), "big")
+    low = entropy & ((1 << 62) - 1)  # Headroom: incrementing never carries out of the low word
+    high = (millis << 16) | (entropy >> 64)
+    if n < _VECTOR_MIN_ROWS:
+        return [prefix + _encode_ulid((high << 64) | (low + i)) for i in range(n)]
+
+    head = prefix + _encode_ulid(high << 64)[:-len(_LOW_SHIFTS)]
+
+    lows = np.uint64(low) + np.arange(n, dtype=np.uint64)
+    tail = np.empty((n, len(_LOW_SHIFTS)), dtype=np.uint8)
+    for column, shift in enumerate(_LOW_SHIFTS):
+        bits = (lows >> np.uint64(shift)) & np.uint64(31)
+        if shift == 60:  # The digit's top bit is the lowest bit of the high word
+            bits |= np.uint64((high & 1) << 4)
+        tail[:, column] = _CROCKFORD[bits.astype(np.intp)]
+    width = len(_LOW_SHIFTS)
+    text = tail.tobytes().decode("ascii")
+    return [head + text[i:i + width] for i in range(0, n * width, width)]
+
+
+def _encode_ulid(value: int) -> str:
+    """The 26 base32 digits of a 128-bit value (130 bits, two digits per lookup)."""
+    pairs = _DIGIT_PAIRS
+    return "".join([pairs[(value >> shift) & 1023] for shift in range(120, -1, -10)])
+
+
+def _bad_timestamp(row: int, timestamp: float) -> ValueError:
+    return ValueError(f"row {row}: timestamp {timestamp!r} is not a datetime")
+
+
+def _utc_datetime(timestamp: float, row: int = 0) -> datetime:
+    """`datetime.utcfromtimestamp`, raising ValueError (like `utc_datetimes`) for NaN or out-of-range input."""
+    if not _MIN_EPOCH_S <= timestamp <= _MAX_EPOCH_S:
+        raise _bad_timestamp(row, timestamp)
+    return datetime.utcfromtimestamp(timestamp)
+
+
+def utc_datetimes(timestamps: Sequence[float]) -> List[datetime]:
+    """
+    Naive UTC datetimes for epoch seconds, rounded to the microsecond like
+    `datetime.utcfromtimestamp`. Raises ValueError if any timestamp is NaN or out of
+    range, rather than letting numpy turn it into None.
+    """
+    seconds = np.asarray(timestamps, dtype=np.float64)
+    bad = ~((seconds >= _MIN_EPOCH_S) & (seconds <= _MAX_EPOCH_S))  # NaN compares False
+    if bad.any():
+        row = int(np.flatnonzero(bad)[0])
+        raise _bad_timestamp(row, float(seconds[row]))
+    micros = np.rint(seconds * 1e6).astype(np.int64)
+    return micros.astype("datetime64[us]").astype(object).tolist()
+
+
+# --- Alert Builder ---
+
+class AlertColumns:
+    """A batch of new alerts held as columns; `tuples()` are COPY-ready, `records()` feed the caches and the event bus."""
+    __slots__ = ALERT_COLUMNS
+
+    def __init__(self, id, timestamp, source_node_id, metric_name, value, anomaly_score, severity, status):
+        self.id = id
+        self.timestamp = timestamp
+        self.source_node_id = source_node_id
+        self.metric_name = metric_name
+        self.value = value
+        self.anomaly_score = anomaly_score
+        self.severity = severity
+        self.status = status
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def _columns(self):
+        return (getattr(self, name) for name in ALERT_COLUMNS)
+
+    def tuples(self) -> List[AlertTuple]:
+        return list(zip(*self._columns()))
+
+    def records(self) -> List[Dict[str, Any]]:
+        return [
+            {"id": i, "timestamp": ts, "source_node_id": node, "metric_name": metric, "value": value,
+             "anomaly_score": score, "severity": severity, "status": status}
+            for i, ts, node, metric, value, score, severity, status in zip(*self._columns())
+        ]
+
+
+class AlertBuilder:
+    """
+    Turns a scored telemetry batch into alerts without per-row work in Python: severities
+    come from one `np.digitize` over the score array, IDs are generated in bulk as
+    time-ordered ULIDs, and timestamps are converted as one datetime64 array.
+    """
+    def __init__(self, thresholds: Sequence[int] = DEFAULT_SEVERITY_THRESHOLDS, id_prefix: str = "alert-"):
+        thresholds = tuple(int(t) for t in thresholds)
+        if len(thresholds) != len(SEVERITY_LEVELS) - 1 or list(thresholds) != sorted(thresholds):
+            raise ValueError(f"thresholds must be {len(SEVERITY_LEVELS) - 1} ascending scores, got {thresholds}")
+        self.thresholds = thresholds
+        self.id_prefix = id_prefix
+        self._levels = np.array(SEVERITY_LEVELS, dtype=object)
+
+    def severity(self, score: int) -> str:
+        return SEVERITY_LEVELS[bisect.bisect_left(self.thresholds, score)]
+
+    def build(self, columns, scores: Sequence[int], now: Optional[float] = None) -> AlertColumns:
+        """
+        Alerts for a `TelemetryColumns` batch and its per-row scores. Raises ValueError,
+        whatever the batch size, if a timestamp cannot be stored.
+        """
+        n = len(scores)
+        if n < _VECTOR_MIN_ROWS:
+            anomaly_scores = [int(score) for score in scores]
+            timestamps = [_utc_datetime(ts, row) for row, ts in enumerate(columns.timestamps)]
+            severities = [self.severity(score) for score in anomaly_scores]
+        else:
+            scores = np.asarray(scores, dtype=np.int64)
+            anomaly_scores = scores.tolist()
+            timestamps = utc_datetimes(columns.timestamps)
+            severities = self._levels[severity_indices(scores, self.thresholds)].tolist()
+        return AlertColumns(
+            id=new_ulids(n, now, prefix=self.id_prefix),
+            timestamp=timestamps,
+            source_node_id=columns.source_node_ids,
+            metric_name=columns.metric_names,
+            value=columns.values,
+            anomaly_score=anomaly_scores,
+            severity=severities,
+            status=["NEW"] * n,
+        )
+
+
+# --- COPY ---
+
+def copy_csv(rows: Iterable[Sequence[Any]]) -> io.StringIO:
+    """
+    CSV payload for `COPY ... FROM STDIN WITH (FORMAT csv)` from rows in ALERT_COLUMNS
+    order: dict values become JSON text, and text fields are quoted (so an empty string
+    stays an empty string rather than NULL).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+    value_index = ALERT_COLUMNS.index("value")
+    for row in rows:
+        row = list(row)
+        row[value_index] = _json_text(row[value_index])
+        writer.writerow(row)
+    buffer.seek(0)
+    return buffer
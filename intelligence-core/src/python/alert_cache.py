@@ -0,0 +1,114 @@
+# intelligence-core/src/python/alert_cache.py
+import base64
+import bisect
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+Cursor = Tuple[datetime, str]  # (timestamp, id) of the last row of a page
+
+# Columns kept per cached alert; the raw telemetry `value` is never served from the cache.
+CACHED_FIELDS = ("id", "timestamp", "source_node_id", "metric_name", "anomaly_score", "severity", "status")
+
+
+# --- Keyset Page Tokens ---
+
+def encode_page_token(row: Row) -> str:
+    """Opaque token for the page after `row`, in (timestamp DESC, id DESC) order."""
+    payload = json.dumps([row["timestamp"].isoformat(), row["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_page_token(token: str) -> Optional[Cursor]:
+    """Returns the (timestamp, id) cursor of a token, None for an empty token. Raises ValueError if malformed."""
+    if not token:
+        return None
+    try:
+        timestamp, alert_id = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return datetime.fromisoformat(timestamp), str(alert_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page token: {token!r}") from e
+
+
+# --- Latest-N Alert Cache ---
+
+class LatestAlertsCache:
+    """
+    The newest `capacity` alerts, kept in (timestamp, id) order and updated as alerts are
+    committed, so "latest alerts" reads never reach the database.
+
+    The cache is authoritative only after `warm()` has loaded the newest rows from the
+    database. `latest(n)` returns None whenever it cannot answer exactly: before warming,
+    or when older rows have been evicted and more than the retained rows are requested.
+    """
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self._keys: List[Cursor] = []
+        self._rows: Dict[str, Row] = {}
+        self._warm = False
+        self.complete = False  # True while the cache holds every alert in the database
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def is_warm(self) -> bool:
+        return self._warm
+
+    def warm(self, newest_rows: Iterable[Row]):
+        """Seeds the cache with the newest rows in the database (at most `capacity` of them)."""
+        rows = list(newest_rows)
+        self._keys, self._rows = [], {}
+        self.add_many(rows)
+        self.complete = len(rows) < self.capacity
+        self._warm = True
+        logger.info(f"Latest-alerts cache warmed with {len(self._keys)} alerts.")
+
+    def add_many(self, rows: Iterable[Row]):
+        """Adds newly committed rows; rows older than the retained window are ignored."""
+        for row in rows:
+            key = (row["timestamp"], row["id"])
+            if row["id"] in self._rows or (len(self._keys) >= self.capacity and key < self._keys[0]):
+                continue
+            bisect.insort(self._keys, key)
+            self._rows[row["id"]] = {field: row.get(field) for field in CACHED_FIELDS}
+        overflow = len(self._keys) - self.capacity
+        if overflow > 0:
+            for _, alert_id in self._keys[:overflow]:
+                del self._rows[alert_id]
+            del self._keys[:overflow]
+            self.complete = False
+
+    def update(self, alert_id: str, **fields: Any) -> bool:
+        """Applies a field update (e.g. a status change) to a cached alert; returns whether it was cached."""
+        row = self._rows.get(alert_id)
+        if row is None:
+            return False
+        row.update((k, v) for k, v in fields.items() if k in CACHED_FIELDS and k not in ("id", "timestamp"))
+        return True
+
+    def latest(self, n: int) -> Optional[List[Row]]:
+        """The newest `n` alerts, newest first, or None if the database has to be asked."""
+        if not self._warm or (n > len(self._keys) and not self.complete):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [self._rows[alert_id] for _, alert_id in reversed(self._keys[-n:])] if n > 0 else []
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "size": len(self._keys),
+            "warm": self._warm,
+            "complete": self.complete,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,313 @@
+# intelligence-core/src/python/baseline.py
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from features import FeatureSchemaRegistry
+
+logger = logging.getLogger(__name__)
+
+BaselineKey = Tuple[str, str]  # (source_node_id, metric_name)
+
+# Columns appended to the model's feature vector (see NodeBaselines.feature_matrix)
+BASELINE_FEATURES = ("zscore", "quantile_position", "log_count", "log_deviation")
+BASELINE_FEATURE_DIM = len(BASELINE_FEATURES)
+
+_Z_CLIP = 50.0
+_EPS = 1e-9
+
+
+def baseline_signal(registry: FeatureSchemaRegistry, metric_names: Sequence[str], values: Sequence[Mapping[str, Any]]) -> np.ndarray:
+    """
+    The scalar tracked per (node, metric): the first field of the metric's registered
+    schema that is present and numeric. NaN for records without one (including metrics
+    without a schema), which are never baselined.
+    """
+    signal = np.full(len(values), np.nan, dtype=np.float64)
+    for row, (metric_name, value) in enumerate(zip(metric_names, values)):
+        for field in registry.columns(metric_name):  # Insertion order == schema order
+            raw = value.get(field)
+            if isinstance(raw, (int, float)):
+                signal[row] = float(raw)
+                break
+    return signal
+
+
+def _occurrence_rank(slots: np.ndarray) -> np.ndarray:
+    """For each row, how many earlier rows of the batch hit the same slot."""
+    n = len(slots)
+    order = np.argsort(slots, kind="stable")
+    ordered = slots[order]
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = ordered[1:] != ordered[:-1]
+    group_start = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n) - group_start
+    return rank
+
+
+class BaselineFeatures:
+    """Per-row baseline statistics as they stood *before* the row was observed."""
+    __slots__ = ("signal", "count", "mean", "std", "quantiles")
+
+    def __init__(self, signal: np.ndarray, count: np.ndarray, mean: np.ndarray, std: np.ndarray, quantiles: np.ndarray):
+        self.signal = signal
+        self.count = count
+        self.mean = mean
+        self.std = std
+        self.quantiles = quantiles  # (n, len(NodeBaselines.quantiles)); NaN until 5 observations
+
+    @property
+    def zscore(self) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            z = (self.signal - self.mean) / np.maximum(self.std, _EPS)
+        return np.clip(np.where((self.count >= 2) & np.isfinite(z), z, 0.0), -_Z_CLIP, _Z_CLIP)
+
+    def feature_matrix(self) -> np.ndarray:
+        """(n, BASELINE_FEATURE_DIM) float32 columns in BASELINE_FEATURES order, 0 where unknown."""
+        known = np.isfinite(self.signal)
+        median, high = self.quantiles[:, 0], self.quantiles[:, -1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            position = (self.signal - median) / np.maximum(high - median, _EPS)
+            deviation = np.where(known & (self.count > 0), self.signal - self.mean, 0.0)
+        out = np.empty((len(self.signal), BASELINE_FEATURE_DIM), dtype=np.float32)
+        out[:, 0] = self.zscore
+        out[:, 1] = np.clip(np.where(np.isfinite(position), position, 0.0), -_Z_CLIP, _Z_CLIP)
+        out[:, 2] = np.log1p(self.count)
+        out[:, 3] = np.sign(deviation) * np.log1p(np.abs(deviation))
+        return out
+
+
+# --- Streaming Per-Key Baselines ---
+
+class NodeBaselines:
+    """
+    Streaming statistics per (source_node_id, metric_name) in preallocated arrays.
+
+    Each key owns one slot holding an observation count, an exponentially weighted mean
+    and variance (`alpha`), and one P² sketch per tracked quantile (five markers each, so
+    quantiles cost O(1) time and memory per update, with no stored samples). Keys live in
+    an LRU map: when all `max_keys` slots are taken, the least recently seen key is
+    evicted and its slot reused, so memory is fixed at construction time.
+
+    `observe` is thread-safe and vectorized across a batch; repeated keys in one batch
+    are applied in arrival order. A batch with more than `max_keys` distinct keys folds
+    in only the first `max_keys` of them.
+    """
+    def __init__(self, max_keys: int = 100_000, alpha: float = 0.05, quantiles: Sequence[float] = (0.5, 0.99), warmup: int = 30):
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+        if not quantiles or any(not 0.0 < q < 1.0 for q in quantiles):
+            raise ValueError("quantiles must be in (0, 1)")
+        self.max_keys = max_keys
+        self.alpha = alpha
+        self.quantiles = tuple(quantiles)
+        self.warmup = warmup
+        self._slots: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._free: List[int] = list(range(max_keys - 1, -1, -1))
+        self._lock = threading.Lock()
+        self.count = np.zeros(max_keys, dtype=np.int64)
+        self.mean = np.zeros(max_keys, dtype=np.float64)
+        self.var = np.zeros(max_keys, dtype=np.float64)
+        q = len(self.quantiles)
+        # P² markers per slot and quantile: heights and (1-based) positions
+        self.heights = np.zeros((max_keys, q, 5), dtype=np.float64)
+        self.positions = np.tile(np.arange(1.0, 6.0), (max_keys, q, 1))
+        p = np.asarray(self.quantiles)[:, None]
+        self._increments = np.hstack([np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p)])  # (q, 5)
+        self.evictions = 0
+        self.observations = 0
+        self.outliers_flagged = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _slot_for(self, key: Hashable) -> int:
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._slots.move_to_end(key)
+            return slot
+        if self._free:
+            slot = self._free.pop()
+        else:
+            _, slot = self._slots.popitem(last=False)
+            self.evictions += 1
+        self.count[slot] = 0
+        self.mean[slot] = 0.0
+        self.var[slot] = 0.0
+        self.positions[slot] = np.arange(1.0, 6.0)
+        self._slots[key] = slot
+        return slot
+
+    def quantile_estimates(self, slots: np.ndarray) -> np.ndarray:
+        """(len(slots), len(quantiles)) current estimates; NaN for slots with fewer than 5 observations."""
+        estimates = self.heights[slots, :, 2]
+        return np.where((self.count[slots] >= 5)[:, None], estimates, np.nan)
+
+    def observe(self, keys: Sequence[BaselineKey], signal: np.ndarray) -> BaselineFeatures:
+        """Returns each row's baseline before the row, then folds the rows in. NaN signals are skipped."""
+        n = len(keys)
+        count = np.zeros(n, dtype=np.int64)
+        mean = np.zeros(n, dtype=np.float64)
+        std = np.zeros(n, dtype=np.float64)
+        quantiles = np.full((n, len(self.quantiles)), np.nan)
+        rows = np.flatnonzero(np.isfinite(signal))
+        if len(rows) == 0:
+            return BaselineFeatures(signal, count, mean, std, quantiles)
+
+        with self._lock:
+            # Slots are resolved once per batch, so at most `max_keys` distinct keys get one:
+            # any further key would evict a slot an earlier row of this batch already holds.
+            # Rows of the keys past the cap are treated as cold (count 0) and not folded in.
+            batch_slots: Dict[Hashable, int] = {}
+            for i in rows:
+                key = keys[i]
+                if key not in batch_slots and len(batch_slots) < self.max_keys:
+                    batch_slots[key] = self._slot_for(key)
+            rows = np.array([i for i in rows if keys[i] in batch_slots], dtype=np.int64)
+            slots = np.fromiter((batch_slots[keys[i]] for i in rows), dtype=np.int64, count=len(rows))
+            rank = _occurrence_rank(slots)
+            for r in range(int(rank.max()) + 1):
+                in_round = rank == r
+                round_rows, round_slots = rows[in_round], slots[in_round]
+                count[round_rows] = self.count[round_slots]
+                mean[round_rows] = self.mean[round_slots]
+                std[round_rows] = np.sqrt(self.var[round_slots])
+                quantiles[round_rows] = self.quantile_estimates(round_slots)
+                self._update(round_slots, signal[round_rows])
+            self.observations += len(rows)
+        return BaselineFeatures(signal, count, mean, std, quantiles)
+
+    def _update(self, slots: np.ndarray, x: np.ndarray):
+        """Folds one observation into each of `slots` (which are distinct)."""
+        first = self.count[slots] == 0
+        diff = x - self.mean[slots]
+        increment = self.alpha * diff
+        self.mean[slots] = np.where(first, x, self.mean[slots] + increment)
+        self.var[slots] = np.where(first, 0.0, (1.0 - self.alpha) * (self.var[slots] + diff * increment))
+        self.count[slots] += 1
+        n = self.count[slots]
+
+        # P²: the first five observations become the (sorted) initial markers.
+        filling = n <= 5
+        if filling.any():
+            fill_slots = slots[filling]
+            self.heights[fill_slots, :, n[filling] - 1] = x[filling][:, None]
+            done = fill_slots[n[filling] == 5]
+            self.heights[done] = np.sort(self.heights[done], axis=-1)
+        if not filling.all():
+            self._p2_step(slots[~filling], x[~filling], n[~filling])
+
+    def _p2_step(self, slots: np.ndarray, x: np.ndarray, n: np.ndarray):
+        q = self.heights[slots]      # (m, Q, 5)
+        pos = self.positions[slots]  # (m, Q, 5)
+        xq = np.broadcast_to(x[:, None], q.shape[:2])
+
+        # Cell of the new observation; the extreme markers track min and max.
+        q[..., 0] = np.minimum(q[..., 0], xq)
+        q[..., 4] = np.maximum(q[..., 4], xq)
+        k = np.clip((q[..., :4] <= xq[..., None]).sum(axis=-1) - 1, 0, 3)  # (m, Q)
+        pos += np.arange(5) > k[..., None]
+
+        desired = 1.0 + (n[:, None, None] - 1.0) * self._increments  # (m, Q, 5)
+        for i in (1, 2, 3):
+            d = desired[..., i] - pos[..., i]
+            up = (d >= 1.0) & (pos[..., i + 1] - pos[..., i] > 1.0)
+            down = (d <= -1.0) & (pos[..., i - 1] - pos[..., i] < -1.0)
+            move = up | down
+            if not move.any():
+                continue
+            s = np.where(up, 1.0, -1.0)
+            n_lo, n_i, n_hi = pos[..., i - 1], pos[..., i], pos[..., i + 1]
+            q_lo, q_i, q_hi = q[..., i - 1], q[..., i], q[..., i + 1]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                parabolic = q_i + s / (n_hi - n_lo) * (
+                    (n_i - n_lo + s) * (q_hi - q_i) / (n_hi - n_i) + (n_hi - n_i - s) * (q_i - q_lo) / (n_i - n_lo)
+                )
+                neighbour_q = np.where(up, q_hi, q_lo)
+                neighbour_n = np.where(up, n_hi, n_lo)
+                linear = q_i + s * (neighbour_q - q_i) / (neighbour_n - n_i)
+            adjusted = np.where((q_lo < parabolic) & (parabolic < q_hi), parabolic, linear)
+            q[..., i] = np.where(move, adjusted, q_i)
+            pos[..., i] = np.where(move, n_i + s, n_i)
+
+        self.heights[slots] = q
+        self.positions[slots] = pos
+
+    def outliers(self, features: BaselineFeatures, z_threshold: float) -> np.ndarray:
+        """Rows that are obvious upward outliers: a warmed-up baseline, z >= threshold and above the top quantile."""
+        with np.errstate(invalid="ignore"):
+            above_top = features.signal > features.quantiles[:, -1]
+        flagged = (features.count >= self.warmup) & (features.zscore >= z_threshold) & above_top
+        with self._lock:
+            self.outliers_flagged += int(flagged.sum())
+        return flagged
+
+    def get(self, key: BaselineKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                return None
+            estimates = self.quantile_estimates(np.array([slot]))[0]
+            return {
+                "count": int(self.count[slot]),
+                "ewma": float(self.mean[slot]),
+                "std": float(np.sqrt(self.var[slot])),
+                "quantiles": {str(p): (None if np.isnan(v) else float(v)) for p, v in zip(self.quantiles, estimates)},
+            }
+
+    # --- Persistence ---
+
+    def snapshot(self, path: str):
+        """Writes every key's state (in LRU order) to `path` atomically."""
+        with self._lock:
+            keys = list(self._slots)
+            slots = np.fromiter(self._slots.values(), dtype=np.int64, count=len(keys))
+            state = {
+                "alpha": np.float64(self.alpha),
+                "quantiles": np.asarray(self.quantiles),
+                "keys": np.array(keys, dtype=str).reshape(-1, 2),
+                "count": self.count[slots],
+                "mean": self.mean[slots],
+                "var": self.var[slots],
+                "heights": self.heights[slots],
+                "positions": self.positions[slots],
+            }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **state)
+        os.replace(tmp_path, path)
+        logger.info(f"Baselines: saved {len(keys)} keys to {path}.")
+
+    def restore(self, path: str) -> int:
+        """Loads a snapshot written by `snapshot`; returns the number of keys restored."""
+        with np.load(path) as state:
+            if tuple(state["quantiles"]) != self.quantiles:
+                raise ValueError(f"Snapshot tracks quantiles {tuple(state['quantiles'])}, expected {self.quantiles}.")
+            keys = [tuple(k) for k in state["keys"].tolist()][-self.max_keys:]  # Most recently used last
+            skip = len(state["keys"]) - len(keys)
+            with self._lock:
+                for i, key in enumerate(keys, start=skip):
+                    slot = self._slot_for(key)
+                    self.count[slot] = state["count"][i]
+                    self.mean[slot] = state["mean"][i]
+                    self.var[slot] = state["var"][i]
+                    self.heights[slot] = state["heights"][i]
+                    self.positions[slot] = state["positions"][i]
+        logger.info(f"Baselines: restored {len(keys)} keys from {path}.")
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "keys": len(self._slots),
+                "max_keys": self.max_keys,
+                "observations": self.observations,
+                "evictions": self.evictions,
+                "outliers_flagged": self.outliers_flagged,
+                "memory_bytes": int(self.count.nbytes + self.mean.nbytes + self.var.nbytes + self.heights.nbytes + self.positions.nbytes),
+            }
@@ -0,0 +1,173 @@
+# intelligence-core/src/python/batching.py
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from metrics import Histogram, LATENCY_BUCKETS_MS, SIZE_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_STOP = object()  # Queue sentinel used to shut the dispatcher down
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a bounded MicroBatcher sheds load instead of queueing more work."""
+
+
+# --- Micro-Batching Scheduler ---
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Coalesces concurrent single-item requests into batches for a vectorized function.
+
+    Callers `await submit(item)`; a dispatcher task drains the queue into a batch of
+    up to `max_batch_size` items, waiting at most `max_wait_ms` after the first item
+    arrives, and evaluates `batch_fn(batch)` once in `executor` so the event loop is
+    never blocked by model code. `batch_fn` must return one result per input, in order.
+
+    With `max_queue_size > 0` the queue is bounded: submissions that would exceed it
+    fail fast with QueueFullError so callers can shed load (e.g. answer 503).
+    """
+    def __init__(
+        self,
+        batch_fn: Callable[[List[T]], Sequence[R]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        name: str = "batcher",
+        executor: Optional[Executor] = None,
+        max_queue_size: int = 0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self.max_queue_size = max_queue_size
+        self.shed = 0
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.batch_size_hist = Histogram(f"{name}_batch_size", SIZE_BUCKETS, "Rows per dispatched batch")
+        self.queue_latency_hist = Histogram(f"{name}_queue_latency_ms", LATENCY_BUCKETS_MS, "Time from submit to dispatch")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._dispatch_loop(), name=f"{self.name}-dispatcher")
+        logger.info(f"MicroBatcher '{self.name}' started (max_batch_size={self.max_batch_size}, max_wait_ms={self.max_wait * 1000:g})")
+
+    async def stop(self):
+        """Stops the dispatcher after every already-queued item has been scored."""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+        logger.info(f"MicroBatcher '{self.name}' stopped.")
+
+    def _check_capacity(self, n: int):
+        if self.max_queue_size and self._queue.qsize() + n > self.max_queue_size:
+            self.shed += n
+            raise QueueFullError(f"MicroBatcher '{self.name}' queue is full ({self.max_queue_size} pending).")
+
+    def _enqueue(self, item: T) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future, time.perf_counter()))
+        return future
+
+    async def submit(self, item: T) -> R:
+        if not self.running:
+            raise RuntimeError(f"MicroBatcher '{self.name}' is not running.")
+        self._check_capacity(1)
+        return await self._enqueue(item)
+
+    async def submit_many(self, items: Sequence[T]) -> List[R]:
+        """Enqueues several items at once; they may be split across or merged into batches."""
+        if not self.running:
+            raise RuntimeError(f"MicroBatcher '{self.name}' is not running.")
+        self._check_capacity(len(items))  # All-or-nothing admission
+        return list(await asyncio.gather(*[self._enqueue(item) for item in items]))
+
+    def submit_blocking(self, items: Sequence[T], timeout: Optional[float] = None) -> List[R]:
+        """
+        Thread-safe entry point for callers outside the event loop (e.g. Kafka worker threads).
+        Blocks until every item has been scored.
+        """
+        if not self.running:
+            raise RuntimeError(f"MicroBatcher '{self.name}' is not running.")
+        return asyncio.run_coroutine_threadsafe(self.submit_many(items), self._loop).result(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "shed": self.shed,
+            "batch_size": self.batch_size_hist.snapshot(),
+            "queue_latency_ms": self.queue_latency_hist.snapshot(),
+        }
+
+    async def _collect_batch(self, first: Tuple[T, asyncio.Future, float]) -> Tuple[List[Tuple[T, asyncio.Future, float]], bool]:
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                entry = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    async def _dispatch_loop(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch, stopping = await self._collect_batch(first)
+
+            dispatched_at = time.perf_counter()
+            for _, _, enqueued_at in batch:
+                self.queue_latency_hist.observe((dispatched_at - enqueued_at) * 1000.0)
+            self.batch_size_hist.observe(len(batch))
+
+            items = [item for item, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self.batch_fn, items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"batch_fn returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                logger.error(f"MicroBatcher '{self.name}' batch of {len(items)} failed: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():  # Caller may have been cancelled while waiting
+                    future.set_result(result)
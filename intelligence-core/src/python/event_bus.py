@@ -0,0 +1,230 @@
+# intelligence-core/src/python/event_bus.py
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from metrics import Histogram, SIZE_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+Event = Dict[str, Any]
+
+SEVERITY_ORDER = {"LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
+
+# Slow-consumer policies, applied when unread events have been overwritten
+OVERRUN_SKIP = "skip"  # Jump to the oldest retained event and keep streaming
+OVERRUN_DROP = "drop"  # Terminate the subscription with SubscriberOverrun
+OVERRUN_POLICIES = (OVERRUN_SKIP, OVERRUN_DROP)
+
+
+class SubscriberOverrun(Exception):
+    """Raised to a subscriber with the "drop" policy whose unread events were overwritten."""
+    def __init__(self, missed: int, resume_after: int):
+        super().__init__(f"Subscriber fell {missed} events behind the ring buffer; resume after sequence {resume_after}.")
+        self.missed = missed
+        self.resume_after = resume_after
+
+
+class EventFilter:
+    """Server-side subscription filter; empty criteria match everything."""
+    __slots__ = ("severities", "min_severity", "source_node_ids", "metric_names")
+
+    def __init__(
+        self,
+        severities: Iterable[str] = (),
+        min_severity: Optional[str] = None,
+        source_node_ids: Iterable[str] = (),
+        metric_names: Iterable[str] = (),
+    ):
+        self.severities = frozenset(severities)
+        self.min_severity = SEVERITY_ORDER.get(min_severity, 0) if min_severity else 0
+        self.source_node_ids = frozenset(source_node_ids)
+        self.metric_names = frozenset(metric_names)
+
+    def matches(self, event: Event) -> bool:
+        severity = event.get("severity")
+        if self.severities and severity not in self.severities:
+            return False
+        if self.min_severity and SEVERITY_ORDER.get(severity, 0) < self.min_severity:
+            return False
+        if self.source_node_ids and event.get("source_node_id") not in self.source_node_ids:
+            return False
+        if self.metric_names and event.get("metric_name") not in self.metric_names:
+            return False
+        return True
+
+
+# --- Subscription ---
+
+class Subscription:
+    """
+    One reader of the ring buffer with its own cursor (the next sequence to read).
+
+    Iterate with `async for sequence, event in subscription`. Publishing never waits for
+    subscribers: a subscriber that falls more than `capacity` events behind loses the
+    overwritten events, and its policy decides whether it skips ahead or is dropped.
+    """
+    def __init__(self, bus: "AlertEventBus", event_filter: EventFilter, policy: str, cursor: int, max_batch: int):
+        self._bus = bus
+        self.filter = event_filter
+        self.policy = policy
+        self.cursor = cursor
+        self.max_batch = max_batch
+        self.delivered = 0
+        self.skipped = 0
+        self.closed = False
+
+    @property
+    def lag(self) -> int:
+        return self._bus.next_sequence - self.cursor
+
+    async def next_batch(self) -> List[Tuple[int, Event]]:
+        """Waits for new events and returns up to `max_batch` matching (sequence, event) pairs."""
+        while True:
+            if self.closed or self._bus.closed:
+                raise StopAsyncIteration
+            if self.cursor >= self._bus.next_sequence:
+                await self._bus.wait_for_publish()
+                continue
+
+            oldest = self._bus.oldest_sequence
+            if self.cursor < oldest:
+                missed = oldest - self.cursor
+                if self.policy == OVERRUN_DROP:
+                    self._bus.dropped_subscribers += 1
+                    self.close()
+                    raise SubscriberOverrun(missed, self.cursor - 1)
+                self.skipped += missed
+                self._bus.skipped_events += missed
+                self.cursor = oldest
+
+            batch = []
+            end = min(self._bus.next_sequence, self.cursor + self.max_batch)
+            for sequence in range(self.cursor, end):
+                event = self._bus.event_at(sequence)
+                if self.filter.matches(event):
+                    batch.append((sequence, event))
+            self.cursor = end
+            if batch:
+                self.delivered += len(batch)
+                self._bus.delivery_batch_hist.observe(len(batch))
+                return batch
+
+    def __aiter__(self) -> AsyncIterator[Tuple[int, Event]]:
+        return self._iterate()
+
+    async def _iterate(self):
+        while True:
+            try:
+                batch = await self.next_batch()
+            except StopAsyncIteration:
+                return
+            for item in batch:
+                yield item
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._bus._subscriptions.discard(self)
+
+
+# --- Ring-Buffer Event Bus ---
+
+class AlertEventBus:
+    """
+    In-process fan-out of persisted alerts over a bounded ring buffer.
+
+    Events get consecutive sequence numbers starting at 1. Publishing is O(1) per event
+    and never blocks; all subscribers share the buffer and wake on one asyncio.Event, so
+    each subscriber costs a cursor rather than a queue or a thread. Must be used from
+    one event loop; other threads publish with `publish_threadsafe`.
+    """
+    def __init__(self, capacity: int = 65536, name: str = "alerts"):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.name = name
+        self._ring: List[Optional[Event]] = [None] * capacity
+        self.next_sequence = 1
+        self._published = asyncio.Event()
+        self._subscriptions = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.closed = False
+        self.skipped_events = 0
+        self.dropped_subscribers = 0
+        self.fanout_hist = Histogram(f"{name}_stream_fanout", SIZE_BUCKETS, "Subscribers woken per publish")
+        self.delivery_batch_hist = Histogram(f"{name}_stream_delivery_batch", SIZE_BUCKETS, "Events handed to a subscriber per wakeup")
+
+    @property
+    def oldest_sequence(self) -> int:
+        return max(1, self.next_sequence - self.capacity)
+
+    def event_at(self, sequence: int) -> Event:
+        return self._ring[sequence % self.capacity]
+
+    def publish_many(self, events: Sequence[Event]):
+        if self.closed or not events:
+            return
+        if len(events) > self.capacity:
+            # The head of an oversized batch would be overwritten before anyone could read it.
+            self.next_sequence += len(events) - self.capacity
+            events = events[-self.capacity:]
+        for event in events:
+            self._ring[self.next_sequence % self.capacity] = event
+            self.next_sequence += 1
+        self.fanout_hist.observe(len(self._subscriptions))
+        self._wake()
+
+    def publish(self, event: Event):
+        self.publish_many([event])
+
+    def publish_threadsafe(self, events: Sequence[Event]):
+        if self._loop is None:  # Nobody has subscribed yet, so no waiter can be woken
+            self.publish_many(list(events))
+        else:
+            self._loop.call_soon_threadsafe(self.publish_many, list(events))
+
+    def _wake(self):
+        # Swap in a fresh Event so subscribers that wake up and catch up wait on the next one.
+        published, self._published = self._published, asyncio.Event()
+        published.set()
+
+    async def wait_for_publish(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        await self._published.wait()
+
+    def subscribe(
+        self,
+        event_filter: Optional[EventFilter] = None,
+        policy: str = OVERRUN_SKIP,
+        resume_after: int = 0,
+        max_batch: int = 256,
+    ) -> Subscription:
+        """
+        Opens a subscription. With `resume_after=0` it sees only events published from now
+        on; otherwise it replays retained events with a sequence greater than `resume_after`.
+        """
+        if policy not in OVERRUN_POLICIES:
+            raise ValueError(f"policy must be one of {OVERRUN_POLICIES}, got '{policy}'")
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        cursor = self.next_sequence if resume_after <= 0 else min(resume_after + 1, self.next_sequence)
+        subscription = Subscription(self, event_filter or EventFilter(), policy, cursor, max_batch)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def close(self):
+        """Ends every subscription's iteration (e.g. on shutdown)."""
+        self.closed = True
+        self._wake()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "published": self.next_sequence - 1,
+            "subscribers": len(self._subscriptions),
+            "max_subscriber_lag": max((s.lag for s in self._subscriptions), default=0),
+            "skipped_events": self.skipped_events,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
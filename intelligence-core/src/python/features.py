@@ -0,0 +1,139 @@
+# intelligence-core/src/python/features.py
+import logging
+import zlib
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# --- Feature Layout ---
+# The anomaly model consumes a fixed-width vector. The first SCHEMA_SLOTS columns
+# hold fields declared in the schema registry; the remaining columns are a hashed
+# region for keys that have no registered slot (the "hashing trick").
+FEATURE_DIM = 100
+SCHEMA_SLOTS = 64
+
+DEFAULT_SCHEMAS: Dict[str, Tuple[str, ...]] = {
+    "cpu_utilization": ("cpu_percent", "user_percent", "system_percent", "iowait_percent", "load_1m", "load_5m", "load_15m"),
+    "memory_usage": ("used_bytes", "available_bytes", "swap_used_bytes", "rss_bytes", "page_faults"),
+    "network_bytes_in": ("bytes", "packets", "errors", "drops", "connections", "unique_peers"),
+    "network_bytes_out": ("bytes", "packets", "errors", "drops", "connections", "unique_peers"),
+    "process_execution": ("pid", "ppid", "uid", "is_elevated", "child_count", "cmdline_length"),
+    "file_access": ("read_bytes", "write_bytes", "open_count", "delete_count", "is_sensitive_path"),
+    "auth_events": ("failed_logins", "successful_logins", "privilege_escalations", "distinct_users"),
+}
+
+
+class FeatureSchemaRegistry:
+    """
+    Maps each `metric_name` to a fixed, ordered set of field names and their column slots.
+
+    Schemas are resolved once into `{field: column}` lookup tables so the featurizer
+    performs a single dict probe per field instead of rebuilding anything per row.
+    """
+    def __init__(self, schemas: Optional[Mapping[str, Sequence[str]]] = None, schema_slots: int = SCHEMA_SLOTS):
+        self.schema_slots = schema_slots
+        self._columns: Dict[str, Dict[str, int]] = {}
+        for metric_name, fields in (schemas if schemas is not None else DEFAULT_SCHEMAS).items():
+            self.register(metric_name, fields)
+
+    def register(self, metric_name: str, fields: Sequence[str]):
+        if len(fields) > self.schema_slots:
+            raise ValueError(f"Schema for '{metric_name}' has {len(fields)} fields; at most {self.schema_slots} slots are available.")
+        self._columns[metric_name] = {field: col for col, field in enumerate(fields)}
+
+    def columns(self, metric_name: str) -> Dict[str, int]:
+        return self._columns.get(metric_name, {})
+
+    def __contains__(self, metric_name: str) -> bool:
+        return metric_name in self._columns
+
+
+# --- Vectorized Featurizer ---
+
+class TelemetryFeaturizer:
+    """
+    Deterministically turns a batch of telemetry `value` dicts into a float32 matrix.
+
+    Numeric and boolean fields are placed in their registered slot, or hashed (with a
+    sign bit, to keep collisions unbiased) into the hashed region. String fields are
+    hashed as `key=value` indicator features. The hot loop only appends to two flat
+    lists; the matrix is filled by one `np.bincount` scatter and magnitudes are
+    compressed with a signed log1p in a single vectorized pass.
+
+    The last `reserved_slots` columns are left at zero for the caller to fill (e.g. with
+    per-node baseline features); the hashed region shrinks accordingly.
+    """
+    def __init__(self, registry: Optional[FeatureSchemaRegistry] = None, feature_dim: int = FEATURE_DIM, hash_cache_size: int = 65536, reserved_slots: int = 0):
+        self.registry = registry or FeatureSchemaRegistry()
+        self.feature_dim = feature_dim
+        self.reserved_slots = reserved_slots
+        self.hashed_offset = self.registry.schema_slots
+        self.hashed_slots = feature_dim - reserved_slots - self.hashed_offset
+        if self.hashed_slots <= 0:
+            raise ValueError("feature_dim must leave room for the hashed region after the schema and reserved slots.")
+        self._hash_cache: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self._hash_cache_size = hash_cache_size
+
+    def _hashed_slot(self, metric_name: str, key: str) -> Tuple[int, float]:
+        cache_key = (metric_name, key)
+        slot = self._hash_cache.get(cache_key)
+        if slot is None:
+            # crc32 is stable across processes, unlike the salted built-in `hash`.
+            h = zlib.crc32(f"{metric_name}\x1f{key}".encode("utf-8"))
+            slot = (self.hashed_offset + (h >> 1) % self.hashed_slots, -1.0 if h & 1 else 1.0)
+            if len(self._hash_cache) >= self._hash_cache_size:
+                self._hash_cache.clear()
+            self._hash_cache[cache_key] = slot
+        return slot
+
+    def transform(self, metric_names: Sequence[str], values: Sequence[Mapping[str, Any]], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Featurizes `len(values)` records into `out` (allocated if not given).
+
+        Args:
+            metric_names: The `metric_name` of each record.
+            values: The raw `value` dict of each record.
+            out: Optional preallocated (n, feature_dim) float32 array to fill in place.
+        """
+        n = len(values)
+        if out is None:
+            out = np.empty((n, self.feature_dim), dtype=np.float32)
+        elif out.shape != (n, self.feature_dim) or out.dtype != np.float32 or not out.flags.c_contiguous:
+            raise ValueError(f"out must be a C-contiguous float32 array of shape ({n}, {self.feature_dim})")
+
+        flat_idx = []
+        weights = []
+        append_idx, append_weight = flat_idx.append, weights.append
+        hashed_slot = self._hashed_slot
+        columns_for = self.registry.columns
+        dim = self.feature_dim
+
+        for row, (metric_name, value) in enumerate(zip(metric_names, values)):
+            columns = columns_for(metric_name)
+            base = row * dim
+            for key, raw in value.items():
+                if raw is None:
+                    continue
+                if isinstance(raw, (int, float)):  # bool is an int subclass
+                    col = columns.get(key)
+                    if col is None:
+                        col, sign = hashed_slot(metric_name, key)
+                        append_weight(sign * float(raw))
+                    else:
+                        append_weight(float(raw))
+                    append_idx(base + col)
+                elif isinstance(raw, str):
+                    col, sign = hashed_slot(metric_name, f"{key}={raw}")
+                    append_idx(base + col)
+                    append_weight(sign)
+                # Nested structures are ignored; agents are expected to flatten them.
+
+        if flat_idx:
+            summed = np.bincount(np.asarray(flat_idx, dtype=np.int64), weights=np.asarray(weights, dtype=np.float64), minlength=n * dim)
+            np.log1p(np.abs(summed), out=out.reshape(-1), casting="same_kind")
+            out *= np.sign(summed).reshape(n, dim)
+        else:
+            out.fill(0.0)
+        return out
@@ -0,0 +1,246 @@
+# intelligence-core/src/python/generation.py
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import torch
+import torch.nn as nn
+
+from metrics import Histogram, LATENCY_BUCKETS_MS, SIZE_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+TokenEvent = Tuple[str, int, bool]  # (request_id, token id, finished)
+TOKENS_PER_S_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+DEFAULT_MAX_TOKENS = 128
+
+
+class GenerationParams:
+    """Sampling options of one request, from the `params` dict passed to `generate`."""
+    __slots__ = ("max_tokens", "temperature", "top_k", "eos_token_id", "seed")
+
+    def __init__(self, max_tokens: int = DEFAULT_MAX_TOKENS, temperature: float = 0.0, top_k: int = 0,
+                 eos_token_id: Optional[int] = None, seed: Optional[int] = None):
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be >= 1")
+        self.max_tokens = int(max_tokens)
+        self.temperature = float(temperature)  # 0 is greedy
+        self.top_k = int(top_k)  # 0 samples from the whole vocabulary
+        self.eos_token_id = eos_token_id
+        self.seed = seed
+
+    @classmethod
+    def from_dict(cls, params: Optional[Dict[str, Any]]) -> "GenerationParams":
+        params = params or {}
+        return cls(**{name: params[name] for name in cls.__slots__ if params.get(name) is not None})
+
+
+class _Sequence:
+    __slots__ = ("request_id", "prompt", "params", "slot", "position", "generated", "last_token", "generator")
+
+    def __init__(self, request_id: str, prompt: Sequence[int], params: GenerationParams):
+        self.request_id = request_id
+        self.prompt = torch.as_tensor(list(prompt), dtype=torch.long).view(1, -1)
+        self.params = params
+        self.slot = -1
+        self.position = 0  # Prompt tokens consumed so far
+        self.generated = 0
+        self.last_token = 0
+        self.generator = torch.Generator().manual_seed(params.seed) if params.seed is not None else None
+
+
+# --- Continuous Batching Scheduler ---
+
+class ContinuousBatchScheduler:
+    """
+    Runs many generation requests through one recurrent model, batching them at token
+    granularity instead of per request.
+
+    Each `step()` first admits waiting requests into free batch slots and prefills their
+    prompts, at most `prefill_chunk` prompt tokens per request and `max_prefill_tokens`
+    in total, so a long prompt is spread over several steps instead of stalling the
+    sequences already decoding. It then runs one batched decode step for every sequence
+    past its prompt. Sequences leave the batch as soon as they hit `max_tokens` or
+    their EOS token, and their slots go to the next waiting requests, so the batch never
+    drains to wait for its slowest member.
+
+    The model is called as `model(tokens, state, last_only=True) -> (logits, new_state)`
+    on (B, T) token ids, with `model.init_state(B)` giving the empty state batched on
+    dim 0, as with the digital twin's RWKVModel. States live in one preallocated
+    (max_batch_size, ...) pool, so a decode step gathers and scatters them with one
+    `index_select` / `index_copy_`.
+    """
+    def __init__(self, model: nn.Module, max_batch_size: int = 32, prefill_chunk: int = 256, max_prefill_tokens: int = 1024):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.prefill_chunk = prefill_chunk
+        self.max_prefill_tokens = max_prefill_tokens
+        self._waiting: Deque[_Sequence] = deque()
+        self._prefilling: "OrderedDict[str, _Sequence]" = OrderedDict()
+        self._decoding: "OrderedDict[str, _Sequence]" = OrderedDict()
+        self._free_slots = list(range(max_batch_size - 1, -1, -1))
+        self._empty_state = model.init_state(1)
+        self._pool = model.init_state(max_batch_size)
+
+        self.batch_size_hist = Histogram("generation_decode_batch_size", SIZE_BUCKETS, "Sequences per decode step")
+        self.step_latency_hist = Histogram("generation_step_ms", LATENCY_BUCKETS_MS, "Prefill + decode time per scheduler step")
+
+    def __len__(self) -> int:
+        return len(self._waiting) + len(self._prefilling) + len(self._decoding)
+
+    @property
+    def active(self) -> int:
+        return len(self._prefilling) + len(self._decoding)
+
+    def submit(self, request_id: str, prompt: Sequence[int], params: Optional[GenerationParams] = None):
+        if not len(prompt):
+            raise ValueError("prompt must have at least one token")
+        self._waiting.append(_Sequence(request_id, prompt, params or GenerationParams()))
+
+    def cancel(self, request_id: str) -> bool:
+        for running in (self._prefilling, self._decoding):
+            sequence = running.pop(request_id, None)
+            if sequence is not None:
+                self._free_slots.append(sequence.slot)
+                return True
+        for sequence in self._waiting:
+            if sequence.request_id == request_id:
+                self._waiting.remove(sequence)
+                return True
+        return False
+
+    def _admit(self):
+        while self._waiting and self._free_slots:
+            sequence = self._waiting.popleft()
+            sequence.slot = self._free_slots.pop()
+            self._pool[sequence.slot] = self._empty_state[0]
+            self._prefilling[sequence.request_id] = sequence
+
+    def _sample(self, logits: torch.Tensor, sequence: _Sequence) -> int:
+        params = sequence.params
+        if params.temperature <= 0:
+            return int(logits.argmax())
+        logits = logits.float() / params.temperature
+        if 0 < params.top_k < logits.shape[-1]:
+            threshold = torch.topk(logits, params.top_k).values[-1]
+            logits = logits.masked_fill(logits < threshold, float("-inf"))
+        return int(torch.multinomial(torch.softmax(logits, dim=-1), 1, generator=sequence.generator))
+
+    def _emit(self, sequence: _Sequence, token: int, events: List[TokenEvent]):
+        sequence.generated += 1
+        sequence.last_token = token
+        finished = sequence.generated >= sequence.params.max_tokens or token == sequence.params.eos_token_id
+        events.append((sequence.request_id, token, finished))
+        if finished:
+            self._prefilling.pop(sequence.request_id, None)
+            self._decoding.pop(sequence.request_id, None)
+            self._free_slots.append(sequence.slot)
+
+    def _prefill(self, events: List[TokenEvent]):
+        budget = self.max_prefill_tokens
+        for sequence in list(self._prefilling.values()):
+            if budget <= 0:
+                break
+            n = min(self.prefill_chunk, budget, sequence.prompt.shape[1] - sequence.position)
+            chunk = sequence.prompt[:, sequence.position:sequence.position + n]
+            logits, state = self.model(chunk, self._pool[sequence.slot:sequence.slot + 1], last_only=True)
+            self._pool[sequence.slot] = state[0]
+            sequence.position += n
+            budget -= n
+            if sequence.position == sequence.prompt.shape[1]:
+                # The prompt's last logits give the first generated token
+                del self._prefilling[sequence.request_id]
+                self._decoding[sequence.request_id] = sequence
+                self._emit(sequence, self._sample(logits[0], sequence), events)
+
+    def _decode(self, events: List[TokenEvent]):
+        sequences = list(self._decoding.values())
+        if not sequences:
+            return
+        self.batch_size_hist.observe(len(sequences))
+        slots = torch.tensor([s.slot for s in sequences], dtype=torch.long)
+        tokens = torch.tensor([[s.last_token] for s in sequences], dtype=torch.long)
+        logits, state = self.model(tokens, self._pool.index_select(0, slots), last_only=True)
+        self._pool.index_copy_(0, slots, state)
+        for i, sequence in enumerate(sequences):
+            self._emit(sequence, self._sample(logits[i], sequence), events)
+
+    @torch.no_grad()
+    def step(self) -> List[TokenEvent]:
+        """Admits, prefills and decodes once. Returns the tokens generated, in order per request."""
+        started = time.perf_counter()
+        events: List[TokenEvent] = []
+        self._admit()
+        self._prefill(events)
+        self._decode(events)
+        if events:
+            self.step_latency_hist.observe((time.perf_counter() - started) * 1000.0)
+        return events
+
+
+# --- Metrics ---
+
+class GenerationMetrics:
+    """
+    Per-request latency and throughput of streamed generations, measured where the
+    tokens are consumed: time to first token from submission, the gap between later
+    tokens, and each finished request's decode rate (tokens after the first over the
+    time since the first).
+    """
+    def __init__(self, name: str = "generation"):
+        self.ttft_hist = Histogram(f"{name}_time_to_first_token_ms", LATENCY_BUCKETS_MS, "Submit to first streamed token")
+        self.inter_token_hist = Histogram(f"{name}_inter_token_ms", LATENCY_BUCKETS_MS, "Gap between streamed tokens of a request")
+        self.tokens_per_s_hist = Histogram(f"{name}_decode_tokens_per_s", TOKENS_PER_S_BUCKETS, "Decode rate of finished requests")
+        self.tokens_generated = 0
+        self.requests_finished = 0
+        self._started_at = time.monotonic()
+        self._requests: Dict[str, List[float]] = {}  # request_id -> [submitted, first token, last token, tokens]
+        self._lock = threading.Lock()
+
+    def submitted(self, request_id: str):
+        with self._lock:
+            self._requests[request_id] = [time.monotonic(), 0.0, 0.0, 0]
+
+    def token(self, request_id: str, finished: bool):
+        now = time.monotonic()
+        with self._lock:
+            record = self._requests.get(request_id)
+            if record is None:
+                return
+            if record[3] == 0:
+                record[1] = now
+                self.ttft_hist.observe((now - record[0]) * 1000.0)
+            else:
+                self.inter_token_hist.observe((now - record[2]) * 1000.0)
+            record[2] = now
+            record[3] += 1
+            self.tokens_generated += 1
+        if finished:
+            self.finished(request_id)
+
+    def finished(self, request_id: str):
+        """Closes a request: on its last token, or early when it fails or is cancelled."""
+        with self._lock:
+            record = self._requests.pop(request_id, None)
+            if record is None:
+                return
+            self.requests_finished += 1
+        if record[3] > 1 and record[2] > record[1]:
+            self.tokens_per_s_hist.observe((record[3] - 1) / (record[2] - record[1]))
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self._started_at, 1e-9)
+        return {
+            "tokens_generated": self.tokens_generated,
+            "requests_finished": self.requests_finished,
+            "in_flight": len(self._requests),
+            "tokens_per_s": self.tokens_generated / elapsed,
+            "time_to_first_token_ms": self.ttft_hist.snapshot(),
+            "inter_token_ms": self.inter_token_hist.snapshot(),
+            "decode_tokens_per_s": self.tokens_per_s_hist.snapshot(),
+        }
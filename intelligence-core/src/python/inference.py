@@ -1,50 +1,37 @@
 # intelligence-core/src/python/inference.py
 import os
 import logging
+import queue
+import socket
+import threading
 import time
-from typing import List, Dict, Any, Optional
+import uuid
+from typing import List, Dict, Any, Callable, Iterator, Optional, Sequence
 
 import torch
 import torch.nn as nn
 from torch.multiprocessing import Process, Queue
 
+from generation import ContinuousBatchScheduler, GenerationMetrics, GenerationParams
+from wkv import wkv
+
 # --- Configuration & Logging ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - [%(name)s] %(message)s')
 logger = logging.getLogger(__name__)
 
 # --- WKV (RWKV) Computation Module ---
 # This class encapsulates the core time-mixing computation of the RWKV model,
-# designed to be JIT-compiled for performance.
+# designed to be JIT-compiled for performance. The kernels live in wkv.py.
 
 class WKV(torch.autograd.Function):
     """
-    A PyTorch Function for the WKV computation in RWKV models, optimized for CUDA.
-    This demonstrates a deep integration with custom ML model architectures.
+    A PyTorch Function for the WKV computation in RWKV models. The forward pass runs
+    the `intel_core::wkv` operator: a time loop over whole (B, C) state tensors, or the
+    OpenMP C++ extension on CPU when WKV_KERNEL=cpp.
     """
     @staticmethod
     def forward(ctx, B: int, T: int, C: int, w: torch.Tensor, u: torch.Tensor, k: torch.Tensor, v: torch.Tensor, s: torch.Tensor):
-        ctx.B, ctx.T, ctx.C = B, T, C
-        ctx.w, ctx.u, ctx.k, ctx.v = w, u, k, v
-        
-        # Pre-computation for wkv
-        ew = (-torch.exp(w.float())).contiguous()
-        eew = torch.exp(ew).contiguous()
-
-        y = torch.empty((B, T, C), device=w.device, dtype=torch.float32)
-        
-        # In a real implementation, this would call a custom CUDA kernel.
-        # Here we simulate the logic in PyTorch.
-        for b in range(B):
-            for t in range(T):
-                for c in range(C):
-                    if t == 0:
-                        y[b, t, c] = u[b, t, c] * k[b, t, c] * v[b, t, c] + s[b, c]
-                        s[b, c] = eew[b, t, c] * s[b, c] + u[b, t, c] * k[b, t, c]
-                    else:
-                        y[b, t, c] = u[b, t, c] * k[b, t, c] * v[b, t, c] + s[b, c]
-                        s[b, c] = eew[b, t, c] * s[b, c] + u[b, t, c] * k[b, t, c]
-
-        return y, s
+        return wkv(w, u, k, v, s)
 
     @staticmethod
     def backward(ctx, gy, gs):
@@ -52,10 +39,11 @@ class WKV(torch.autograd.Function):
         # For inference, this is often not needed.
         raise NotImplementedError("Backward pass for WKV is not implemented for inference.")
 
-# JIT-compilable wrapper for the WKV computation
+# JIT-compilable wrapper for the WKV computation. It calls the operator directly rather
+# than through WKV.apply: the operator is opaque to torch.compile, so the graph has no breaks.
 @torch.compile
 def wkv_forward(B, T, C, w, u, k, v, s):
-    return WKV.apply(B, T, C, w, u, k, v, s)
+    return wkv(w, u, k, v, s)
 
 # --- Worker Process for Multi-GPU Execution ---
 
@@ -64,11 +52,12 @@ class Worker:
     Represents a single worker process, typically controlling one GPU.
     It loads a model shard and executes computation requests.
     """
-    def __init__(self, rank: int, world_size: int, model_path: str, device: str):
+    def __init__(self, rank: int, world_size: int, model_path: str, device: str, backend: str = "nccl"):
         self.rank = rank
         self.world_size = world_size
         self.model_path = model_path
         self.device = torch.device(device)
+        self.backend = backend
         self.model: Optional[nn.Module] = None
         self._setup_distributed()
         self._load_model()
@@ -76,8 +65,9 @@ class Worker:
     def _setup_distributed(self):
         os.environ['MASTER_ADDR'] = 'localhost'
         os.environ['MASTER_PORT'] = '12355'
-        torch.distributed.init_process_group("nccl", rank=self.rank, world_size=self.world_size)
-        torch.cuda.set_device(self.rank)
+        torch.distributed.init_process_group(self.backend, rank=self.rank, world_size=self.world_size)
+        if self.device.type == "cuda":
+            torch.cuda.set_device(self.rank)
 
     def _load_model(self):
         # In a real scenario, this would load a shard of the model
@@ -96,21 +86,9 @@ class Worker:
                 if data is None: # Shutdown signal
                     break
 
-                logger.info(f"Worker {self.rank}: Processing request {request_id}")
+                logger.debug(f"Worker {self.rank}: Processing request {request_id}")
                 
-                # --- Simulate Computation ---
-                # 1. Move data to the worker's GPU
-                data_tensor = torch.tensor(data, device=self.device)
-                
-                # 2. Perform some computation (e.g., part of a forward pass)
-                # In a real system, this would involve all-gather/all-reduce for tensor parallelism.
-                result_tensor = data_tensor * 2.0 # Dummy computation
-                
-                # 3. Synchronize if necessary
-                torch.distributed.barrier()
-
-                # 4. CPU-bound result to be sent back
-                output_data = result_tensor.cpu().numpy().tolist()
+                output_data = self._execute_shard(data)
                 
                 output_queue.put((self.rank, request_id, output_data))
 
@@ -122,6 +100,21 @@ class Worker:
         torch.distributed.destroy_process_group()
         logger.info(f"Worker {self.rank}: Run loop finished.")
 
+    def _execute_shard(self, data: Any) -> Any:
+        # --- Simulate Computation ---
+        # 1. Move data to the worker's device
+        data_tensor = torch.tensor(data, device=self.device)
+        
+        # 2. Perform some computation (e.g., part of a forward pass)
+        # In a real system, this would involve all-gather/all-reduce for tensor parallelism.
+        result_tensor = data_tensor * 2.0 # Dummy computation
+        
+        # 3. Synchronize if necessary
+        torch.distributed.barrier()
+
+        # 4. CPU-bound result to be sent back
+        return result_tensor.cpu().numpy().tolist()
+
 # --- SPMD (Single-Program, Multiple-Data) GPU Executor ---
 
 def worker_main(rank: int, world_size: int, model_path: str, device: str, input_queue: Queue, output_queue: Queue):
@@ -187,22 +180,333 @@ class SPMDGPUExecutor:
                 logger.warning(f"Worker process {p.pid} did not terminate gracefully. Terminating.")
                 p.terminate()
 
+# --- CPU Executor with Continuous Batching ---
+
+class GenerationError(RuntimeError):
+    """Raised to a streaming caller when its request failed in a worker."""
+
+
+def load_model(model_path: str) -> nn.Module:
+    """
+    Loads a pickled `nn.Module` onto the CPU (the model must implement the
+    ContinuousBatchScheduler interface). Unpickling a module runs arbitrary code, so
+    `model_path` must be a trusted file.
+    """
+    model = torch.load(model_path, map_location="cpu", weights_only=False)
+    if not isinstance(model, nn.Module):
+        raise ValueError(f"{model_path} holds a {type(model).__name__}, not a pickled nn.Module")
+    return model
+
+
+class CPUWorker(Worker):
+    """
+    A CPU worker process: joins a gloo process group (so sharded `execute` calls keep
+    their barrier) and serves generation requests from its own continuous-batching
+    scheduler. Between scheduler steps it takes every message that has arrived, so new
+    requests join the running batch at the next step; while it has no requests, it
+    blocks on its queue.
+    """
+    def __init__(self, rank: int, world_size: int, model_path: str, init_method: str, model_loader: Callable[[str], nn.Module] = load_model,
+                 max_batch_size: int = 32, prefill_chunk: int = 256):
+        self.init_method = init_method
+        self.model_loader = model_loader
+        super().__init__(rank, world_size, model_path, "cpu", backend="gloo")
+        self.scheduler = ContinuousBatchScheduler(self.model, max_batch_size=max_batch_size, prefill_chunk=prefill_chunk)
+        self._active: set = set()
+
+    def _setup_distributed(self):
+        torch.distributed.init_process_group(self.backend, init_method=self.init_method, rank=self.rank, world_size=self.world_size)
+
+    def _load_model(self):
+        logger.info(f"Worker {self.rank}: Loading model from {self.model_path} ({torch.get_num_threads()} threads)")
+        self.model = self.model_loader(self.model_path).eval()
+
+    def _handle(self, message: Any, output_queue: Queue) -> bool:
+        """Applies one queued message. Returns False on the shutdown signal."""
+        if message is None:
+            return False
+        kind, request_id = message[0], message[1]
+        try:
+            if kind == "generate":
+                self.scheduler.submit(request_id, message[2], GenerationParams.from_dict(message[3]))
+                self._active.add(request_id)
+            elif kind == "cancel":
+                self.scheduler.cancel(request_id)
+                self._active.discard(request_id)
+            elif kind == "execute":
+                output_queue.put(("result", self.rank, request_id, self._execute_shard(message[2])))
+        except Exception as e:
+            logger.error(f"Worker {self.rank}: Error processing {kind} request {request_id}: {e}", exc_info=True)
+            if kind == "execute":
+                # The shard's result is the error, as with the GPU workers
+                output_queue.put(("result", self.rank, request_id, {"error": str(e)}))
+            else:
+                self._active.discard(request_id)
+                output_queue.put(("error", self.rank, request_id, str(e)))
+        return True
+
+    def _step(self, output_queue: Queue):
+        try:
+            events = self.scheduler.step()
+        except Exception as e:
+            # The batch's states may be half-written: fail its requests and start over
+            logger.error(f"Worker {self.rank}: Generation step failed for {len(self._active)} requests: {e}", exc_info=True)
+            for request_id in self._active:
+                output_queue.put(("error", self.rank, request_id, str(e)))
+            self._active.clear()
+            self.scheduler = ContinuousBatchScheduler(self.model, self.scheduler.max_batch_size, self.scheduler.prefill_chunk)
+            return
+        if events:
+            output_queue.put(("tokens", self.rank, events))
+            self._active.difference_update(request_id for request_id, _, finished in events if finished)
+
+    def run(self, input_queue: Queue, output_queue: Queue):
+        logger.info(f"Worker {self.rank}: Starting run loop.")
+        running = True
+        while running:
+            block = not len(self.scheduler)
+            while running:
+                try:
+                    message = input_queue.get(block=block)
+                except queue.Empty:
+                    break
+                block = False
+                running = self._handle(message, output_queue)
+            if running and len(self.scheduler):
+                self._step(output_queue)
+        torch.distributed.destroy_process_group()
+        logger.info(f"Worker {self.rank}: Run loop finished.")
+
+
+def cpu_worker_main(rank: int, world_size: int, model_path: str, init_method: str, options: Dict[str, Any],
+                    input_queue: Queue, output_queue: Queue):
+    """Entry point for each CPU worker process."""
+    try:
+        threads = options.pop("threads", 0)
+        if threads:
+            torch.set_num_threads(threads)
+        worker = CPUWorker(rank, world_size, model_path, init_method, **options)
+    except Exception as e:
+        logger.error(f"Failed to initialize worker {rank}: {e}", exc_info=True)
+        output_queue.put(("error", rank, None, f"worker {rank} failed to start: {e}"))
+        return
+    worker.run(input_queue, output_queue)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class CPUExecutor:
+    """
+    The CPU counterpart of SPMDGPUExecutor, with the same `execute` interface: spawned
+    worker processes in a gloo process group, each holding a full copy of the model
+    and splitting the cores (`threads_per_worker`, by default cores / workers).
+
+    `stream` sends a generation request to the worker with the fewest in-flight
+    requests and yields its tokens as they are decoded. A dispatcher thread routes
+    every worker's token batches to the waiting callers and feeds `metrics`
+    (time to first token, inter-token gap, decode tokens/s).
+    """
+    def __init__(self, model_path: str, world_size: int = 1, threads_per_worker: int = 0, max_batch_size: int = 32,
+                 prefill_chunk: int = 256, model_loader: Callable[[str], nn.Module] = load_model):
+        if world_size < 1:
+            raise ValueError("world_size must be >= 1")
+        self.world_size = world_size
+        self.model_path = model_path
+        self.metrics = GenerationMetrics()
+        context = torch.multiprocessing.get_context("spawn")  # Forking after torch has started its thread pools can hang the child
+        self.input_queues = [context.Queue() for _ in range(world_size)]
+        self.output_queue = context.Queue()
+        self.processes: List[Process] = []
+        self._results: "queue.Queue" = queue.Queue()
+        self._streams: Dict[str, "queue.Queue"] = {}
+        self._assigned: Dict[str, int] = {}  # request_id -> rank
+        self._load = [0] * world_size
+        self._lock = threading.Lock()
+
+        threads = threads_per_worker or max(1, (os.cpu_count() or 1) // world_size)
+        options = {"threads": threads, "model_loader": model_loader, "max_batch_size": max_batch_size, "prefill_chunk": prefill_chunk}
+        init_method = f"tcp://127.0.0.1:{_free_port()}"
+        logger.info(f"Initializing CPU Executor with {world_size} workers x {threads} threads.")
+        for rank in range(world_size):
+            process = context.Process(
+                target=cpu_worker_main,
+                args=(rank, world_size, model_path, init_method, dict(options), self.input_queues[rank], self.output_queue),
+                daemon=True,
+            )
+            self.processes.append(process)
+            process.start()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="cpu-executor-dispatch", daemon=True)
+        self._dispatcher.start()
+
+    def _release(self, request_id: str) -> Optional["queue.Queue"]:
+        with self._lock:
+            rank = self._assigned.pop(request_id, None)
+            if rank is not None:
+                self._load[rank] -= 1
+            return self._streams.pop(request_id, None)
+
+    def _dispatch_loop(self):
+        while True:
+            message = self.output_queue.get()
+            if message is None:
+                return
+            kind, rank = message[0], message[1]
+            if kind == "tokens":
+                for request_id, token, finished in message[2]:
+                    self.metrics.token(request_id, finished)
+                    stream = self._release(request_id) if finished else self._streams.get(request_id)
+                    if stream is not None:
+                        stream.put((token, finished))
+            elif kind == "result":
+                self._results.put(message[1:])
+            elif kind == "error":
+                request_id, error = message[2], message[3]
+                with self._lock:
+                    failed = [request_id] if request_id is not None else [r for r, owner in self._assigned.items() if owner == rank]
+                for failed_id in failed:
+                    self.metrics.finished(failed_id)
+                    stream = self._release(failed_id)
+                    if stream is not None:
+                        stream.put(GenerationError(error))
+                if request_id is None:
+                    logger.error(f"CPU Executor: {error}")
+
+    def execute(self, request_id: str, data_shards: List[Any]):
+        """
+        Distributes data shards to the workers for execution. A shard that fails, or
+        whose worker has exited, gets `{"error": message}` as its result.
+        """
+        if len(data_shards) != self.world_size:
+            raise ValueError(f"Number of data shards ({len(data_shards)}) must match world size ({self.world_size}).")
+
+        for rank in range(self.world_size):
+            self.input_queues[rank].put(("execute", request_id, data_shards[rank]))
+
+        results = [None] * self.world_size
+        pending = set(range(self.world_size))
+        while pending:
+            try:
+                rank, res_id, res_data = self._results.get(timeout=1.0)
+            except queue.Empty:
+                for rank in [r for r in pending if not self.processes[r].is_alive()]:
+                    pending.discard(rank)
+                    results[rank] = {"error": f"worker {rank} exited (code {self.processes[rank].exitcode})"}
+                continue
+            if res_id != request_id:
+                logger.warning(f"Received result for wrong request ID. Expected {request_id}, got {res_id}")
+                continue
+            pending.discard(rank)
+            results[rank] = res_data
+
+        return results
+
+    def stream(self, request_id: str, prompt_ids: Sequence[int], params: Optional[Dict[str, Any]] = None) -> Iterator[int]:
+        """
+        Submits one request and returns an iterator over its generated token ids, which
+        yields them as the worker decodes them. Closing the iterator early cancels the
+        request in its worker.
+        """
+        GenerationParams.from_dict(params)  # Reject bad parameters here rather than in the worker
+        tokens: "queue.Queue" = queue.Queue()
+        with self._lock:
+            rank = min(range(self.world_size), key=self._load.__getitem__)
+            self._load[rank] += 1
+            self._assigned[request_id] = rank
+            self._streams[request_id] = tokens
+        self.metrics.submitted(request_id)
+        self.input_queues[rank].put(("generate", request_id, list(prompt_ids), dict(params or {})))
+        return self._stream_tokens(request_id, rank, tokens)
+
+    def _stream_tokens(self, request_id: str, rank: int, tokens: "queue.Queue") -> Iterator[int]:
+        finished = False
+        try:
+            while not finished:
+                try:
+                    item = tokens.get(timeout=1.0)
+                except queue.Empty:
+                    if not self.processes[rank].is_alive():
+                        raise GenerationError(f"worker {rank} exited (code {self.processes[rank].exitcode})")
+                    continue
+                if isinstance(item, Exception):
+                    finished = True
+                    raise item
+                token, finished = item
+                yield token
+        finally:
+            if not finished:
+                self.input_queues[rank].put(("cancel", request_id))
+                self.metrics.finished(request_id)
+                self._release(request_id)
+
+    def shutdown(self):
+        logger.info("Shutting down CPU Executor and workers.")
+        for q in self.input_queues:
+            q.put(None) # Send shutdown signal
+
+        for p in self.processes:
+            p.join(timeout=5)
+            if p.is_alive():
+                logger.warning(f"Worker process {p.pid} did not terminate gracefully. Terminating.")
+                p.terminate()
+        self.output_queue.put(None)
+        self._dispatcher.join(timeout=5)
+
 # --- High-Level Inference Engine Facade ---
 
 class InferenceEngine:
     """
-    A high-level facade that integrates the SPMDGPUExecutor to provide a simple
-    interface for running inference requests.
+    A high-level facade that integrates an executor to provide a simple interface for
+    running inference requests: the SPMDGPUExecutor when there are `num_gpus` GPUs
+    (or with device="cuda"), otherwise the CPUExecutor with `num_workers` processes,
+    which generates with continuous batching and streams text as it is decoded. The
+    CPU path tokenizes with the `tokenizers` file next to the model, or at `tokenizer_path`.
     """
-    def __init__(self, model_path: str, num_gpus: int = 1):
-        self.executor = SPMDGPUExecutor(world_size=num_gpus, model_path=model_path)
+    def __init__(self, model_path: str, num_gpus: int = 1, device: str = "auto", num_workers: int = 1,
+                 tokenizer_path: Optional[str] = None, **cpu_options):
+        if device == "auto":
+            device = "cuda" if torch.cuda.is_available() and torch.cuda.device_count() >= num_gpus else "cpu"
+        self.device = device
+        self.tokenizer = None
+        if device == "cuda":
+            self.executor = SPMDGPUExecutor(world_size=num_gpus, model_path=model_path)
+        else:
+            from tokenizers import Tokenizer
+
+            self.tokenizer = Tokenizer.from_file(tokenizer_path or os.path.join(os.path.dirname(model_path), "tokenizer.json"))
+            self.executor = CPUExecutor(model_path, world_size=num_workers, **cpu_options)
+
+    def generate_stream(self, prompt: str, params: Optional[Dict] = None) -> Iterator[str]:
+        """Yields the generated text in pieces as tokens are decoded (CPU executor; the GPU path yields it whole)."""
+        if self.tokenizer is None:
+            yield self.generate(prompt, params or {})
+            return
+        request_id = f"req-{uuid.uuid4().hex}"
+        logger.debug(f"InferenceEngine: Submitting generation request {request_id}")
+        prompt_ids = self.tokenizer.encode(prompt).ids
+        generated: List[int] = []
+        emitted = ""
+        for token in self.executor.stream(request_id, prompt_ids, params):
+            generated.append(token)
+            text = self.tokenizer.decode(generated)
+            if text.endswith("\ufffd"):  # Partial UTF-8 sequence: wait for the next token
+                continue
+            if len(text) > len(emitted):
+                yield text[len(emitted):]
+            emitted = text
 
     def generate(self, prompt: str, params: Dict) -> str:
         """
-        Generates text from a prompt using the multi-GPU executor.
+        Generates text from a prompt using the executor.
         """
+        if self.tokenizer is not None:
+            return "".join(self.generate_stream(prompt, params))
+
         request_id = f"req-{int(time.time() * 1000)}"
-        logger.info(f"InferenceEngine: Submitting generation request {request_id}")
+        logger.debug(f"InferenceEngine: Submitting generation request {request_id}")
         
         # --- 1. Tokenize prompt ---
         # tokenizer = ...
@@ -222,7 +526,7 @@ class InferenceEngine:
         # This is also highly dependent on the parallelism strategy.
         # For this example, we just concatenate the results.
         aggregated_result = [item for sublist in results for item in sublist]
-        logger.info(f"InferenceEngine: Aggregated result for {request_id}: {aggregated_result}")
+        logger.debug(f"InferenceEngine: Aggregated result for {request_id}: {aggregated_result}")
 
         # detokenized_result = tokenizer.decode(aggregated_result)
         detokenized_result = f"Generated text for prompt: '{prompt}' (result: {aggregated_result})"
@@ -233,26 +537,35 @@ class InferenceEngine:
 
 # --- Example Usage ---
 if __name__ == "__main__":
-    if not torch.cuda.is_available() or torch.cuda.device_count() < 2:
-        logger.error("This example requires at least 2 GPUs. Skipping.")
-    else:
-        world_size = 2
+    use_gpus = torch.cuda.is_available() and torch.cuda.device_count() >= 2
+    world_size = 2
+    if use_gpus:
         logger.info(f"Running InferenceEngine example with {world_size} GPUs.")
-        
-        try:
-            engine = InferenceEngine(model_path="/models/omega-rwkv-7b-v2", num_gpus=world_size)
-            
-            prompt = "Analyze the following threat telemetry and provide a summary:"
-            generation_params = {"max_tokens": 100}
-            
-            output = engine.generate(prompt, generation_params)
-            
-            logger.info(f"\n--- Final Generation Output ---\n{output}\n")
-            
-        except ValueError as e:
-            logger.error(f"Initialization failed: {e}")
-        finally:
-            if 'engine' in locals():
-                engine.shutdown()
-                
-        logger.info("InferenceEngine example finished.")
+    else:
+        logger.info(f"Fewer than 2 GPUs: running InferenceEngine example with {world_size} CPU workers.")
+
+    try:
+        # On CPU the model file is a pickled nn.Module with tokenizer.json next to it
+        model_path = os.environ.get("OMEGA_INFERENCE_MODEL", "/models/omega-rwkv-7b-v2")
+        if use_gpus:
+            engine = InferenceEngine(model_path=model_path, num_gpus=world_size)
+        else:
+            engine = InferenceEngine(model_path=model_path, device="cpu", num_workers=world_size)
+
+        prompt = "Analyze the following threat telemetry and provide a summary:"
+        generation_params = {"max_tokens": 100}
+
+        output = "".join(engine.generate_stream(prompt, generation_params))
+
+        logger.info(f"\n--- Final Generation Output ---\n{output}\n")
+        if not use_gpus:
+            stats = engine.executor.metrics.stats()
+            logger.info(f"Generated {stats['tokens_generated']} tokens, {stats['tokens_per_s']:.1f} tokens/s")
+
+    except (ValueError, OSError, GenerationError) as e:
+        logger.error(f"Inference example failed: {e}")
+    finally:
+        if 'engine' in locals():
+            engine.shutdown()
+
+    logger.info("InferenceEngine example finished.")
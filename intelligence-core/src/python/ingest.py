@@ -0,0 +1,301 @@
+# intelligence-core/src/python/ingest.py
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from confluent_kafka import Consumer, KafkaError, KafkaException, TopicPartition
+
+from metrics import Histogram, LATENCY_BUCKETS_MS, SIZE_BUCKETS
+from serialization import json_loads, JSONDecodeError
+
+
+logger = logging.getLogger(__name__)
+
+# A batch processor validates, scores and persists decoded records, returning only after
+# the DB transaction has committed. It returns the number of records persisted.
+BatchProcessor = Callable[[List[Dict[str, Any]]], int]
+
+
+# --- Ingest Counters ---
+
+class IngestStats:
+    """Counters shared by every worker thread of an ingest pool."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.messages = 0
+        self.records_persisted = 0
+        self.batches = 0
+        self.decode_errors = 0
+        self.processing_errors = 0
+        self.offset_errors = 0
+        self.backpressure_pauses = 0
+        self.partition_lag: Dict[str, int] = {}
+        self.consume_batch_size = Histogram("kafka_consume_batch_size", SIZE_BUCKETS, "Messages returned per consume() call")
+        self.process_latency = Histogram("kafka_batch_process_ms", LATENCY_BUCKETS_MS, "Score + DB commit time per batch")
+        self.commit_latency = Histogram("kafka_offset_commit_ms", LATENCY_BUCKETS_MS, "Synchronous offset commit time")
+
+    def add(self, **deltas: int):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def set_lag(self, topic: str, partition: int, lag: int):
+        with self._lock:
+            self.partition_lag[f"{topic}[{partition}]"] = lag
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started_at, 1e-9)
+            return {
+                "messages": self.messages,
+                "records_persisted": self.records_persisted,
+                "batches": self.batches,
+                "decode_errors": self.decode_errors,
+                "processing_errors": self.processing_errors,
+                "offset_errors": self.offset_errors,
+                "backpressure_pauses": self.backpressure_pauses,
+                "messages_per_s": round(self.messages / elapsed, 2),
+                "partition_lag": dict(self.partition_lag),
+                "total_lag": sum(self.partition_lag.values()),
+                "consume_batch_size": self.consume_batch_size.snapshot(),
+                "process_latency_ms": self.process_latency.snapshot(),
+                "commit_latency_ms": self.commit_latency.snapshot(),
+            }
+
+
+# --- Worker Thread ---
+
+class TelemetryIngestWorker(threading.Thread):
+    """
+    Owns one Kafka consumer and runs the consume -> decode -> process -> commit loop.
+
+    Offsets are committed synchronously only after `process_batch` returns, so a crash
+    between the DB commit and the offset commit replays the batch (at-least-once).
+    While the pool's in-flight budget is exhausted, the worker pauses its partitions
+    instead of buffering more messages. A failed batch is retried after a capped
+    exponential backoff that resets on the next successful commit.
+    """
+    def __init__(
+        self,
+        name: str,
+        consumer: Consumer,
+        process_batch: BatchProcessor,
+        in_flight: threading.Semaphore,
+        stats: IngestStats,
+        stop_event: threading.Event,
+        batch_size: int = 500,
+        poll_timeout: float = 1.0,
+        retry_backoff: float = 0.1,
+        max_retry_backoff: float = 10.0,
+    ):
+        super().__init__(name=name, daemon=True)
+        self.consumer = consumer
+        self.process_batch = process_batch
+        self.in_flight = in_flight
+        self.stats = stats
+        self.stop_event = stop_event
+        self.batch_size = batch_size
+        self.poll_timeout = poll_timeout
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self._retry_delay = 0.0
+
+    def run(self):
+        logger.info(f"Ingest worker {self.name} started.")
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    messages = self.consumer.consume(num_messages=self.batch_size, timeout=self.poll_timeout)
+                    if not messages:
+                        continue
+                    self.stats.consume_batch_size.observe(len(messages))
+                    if not self._acquire_slot(messages):
+                        break  # Stopping; the batch is uncommitted and will be redelivered
+                    try:
+                        failed = not self._process_messages(messages)
+                    finally:
+                        self.in_flight.release()
+                except Exception as e:
+                    # Last resort: nothing restarts a worker thread that exits, so log and keep looping.
+                    logger.error(f"Ingest worker {self.name}: unexpected error, continuing: {e}", exc_info=True)
+                    failed = True
+                if failed:
+                    self._back_off()
+        finally:
+            self.consumer.close()
+            logger.info(f"Ingest worker {self.name} stopped.")
+
+    def _back_off(self):
+        # Capped exponential backoff, so workers do not spin on a batch while the database
+        # or the scorer is down. Waiting on the stop event keeps shutdown prompt.
+        self._retry_delay = min(self._retry_delay * 2, self.max_retry_backoff) if self._retry_delay else self.retry_backoff
+        self.stop_event.wait(self._retry_delay)
+
+    def _acquire_slot(self, messages: List[Any]) -> bool:
+        if self.in_flight.acquire(blocking=False):
+            return True
+        # Backpressure: stop fetching while downstream is saturated, but keep serving
+        # consumer callbacks (rebalances) so the group membership stays healthy. A poll
+        # can still return a message fetched before the pause; it joins the pending batch
+        # so it is processed before its offset is committed.
+        assignment = self.consumer.assignment()
+        if assignment:
+            self.consumer.pause(assignment)
+        self.stats.add(backpressure_pauses=1)
+        try:
+            while not self.stop_event.is_set():
+                if self.in_flight.acquire(timeout=self.poll_timeout):
+                    return True
+                msg = self.consumer.poll(0)
+                if msg is not None:
+                    messages.append(msg)
+            return False
+        finally:
+            assignment = self.consumer.assignment()
+            if assignment:
+                self.consumer.resume(assignment)
+
+    def _process_messages(self, messages: List[Any]) -> bool:
+        """Returns False if the batch failed and was rewound for redelivery."""
+        records: List[Dict[str, Any]] = []
+        next_offsets: Dict[Tuple[str, int], int] = {}
+        decode_errors = 0
+        for msg in messages:
+            err = msg.error()
+            if err is not None:
+                if err.code() != KafkaError._PARTITION_EOF:
+                    logger.error(f"Kafka error on {msg.topic()} [{msg.partition()}]: {err}")
+                continue
+            next_offsets[(msg.topic(), msg.partition())] = msg.offset() + 1
+            try:
+                records.append(json_loads(msg.value()))
+            except JSONDecodeError as e:
+                decode_errors += 1
+                logger.debug(f"Kafka: skipping undecodable message at {msg.topic()} [{msg.partition()}] @ {msg.offset()}: {e}")
+        if not next_offsets:
+            return True
+
+        started = time.perf_counter()
+        try:
+            persisted = self.process_batch(records) if records else 0
+        except Exception as e:
+            # Leave offsets uncommitted and rewind so the batch is redelivered.
+            self.stats.add(processing_errors=1)
+            logger.error(f"Ingest worker {self.name}: batch of {len(records)} failed, will retry: {e}")
+            try:
+                for (topic, partition), offset in self._first_offsets(messages).items():
+                    self.consumer.seek(TopicPartition(topic, partition, offset))
+            except KafkaException as e:
+                # The partition was revoked in a rebalance; its new owner resumes from the committed offset.
+                self.stats.add(offset_errors=1)
+                logger.warning(f"Ingest worker {self.name}: could not rewind after a failed batch: {e}")
+            return False
+        self.stats.process_latency.observe((time.perf_counter() - started) * 1000.0)
+        self.stats.add(messages=len(messages), records_persisted=persisted, batches=1, decode_errors=decode_errors)
+
+        started = time.perf_counter()
+        try:
+            self.consumer.commit(
+                offsets=[TopicPartition(topic, partition, offset) for (topic, partition), offset in next_offsets.items()],
+                asynchronous=False,
+            )
+        except KafkaException as e:
+            # Typically REBALANCE_IN_PROGRESS or ILLEGAL_GENERATION. The batch is persisted:
+            # either a later commit covers its offsets, or the partition's new owner
+            # redelivers it (at-least-once).
+            self.stats.add(offset_errors=1)
+            logger.warning(f"Ingest worker {self.name}: offset commit failed, batch may be redelivered: {e}")
+            return True
+        self.stats.commit_latency.observe((time.perf_counter() - started) * 1000.0)
+        self._retry_delay = 0.0
+        self._update_lag(next_offsets)
+        return True
+
+    @staticmethod
+    def _first_offsets(messages) -> Dict[Tuple[str, int], int]:
+        first: Dict[Tuple[str, int], int] = {}
+        for msg in messages:
+            if msg.error() is None:
+                first.setdefault((msg.topic(), msg.partition()), msg.offset())
+        return first
+
+    def _update_lag(self, next_offsets: Dict[Tuple[str, int], int]):
+        for (topic, partition), offset in next_offsets.items():
+            # cached=True reads the watermark from the last statistics callback, no broker round-trip.
+            _, high = self.consumer.get_watermark_offsets(TopicPartition(topic, partition), cached=True)
+            if high is not None and high >= 0:
+                self.stats.set_lag(topic, partition, max(high - offset, 0))
+
+
+# --- Worker Pool ---
+
+class TelemetryIngestPool:
+    """
+    Runs `ceil(partitions / partitions_per_worker)` ingest workers in one consumer group.
+
+    Every worker owns its own consumer (librdkafka consumers are not shared between
+    threads); the group coordinator spreads the topic's partitions across them.
+    """
+    def __init__(
+        self,
+        consumer_factory: Callable[[], Consumer],
+        topic: str,
+        process_batch: BatchProcessor,
+        partitions_per_worker: int = 4,
+        batch_size: int = 500,
+        poll_timeout: float = 1.0,
+        max_in_flight_batches: int = 2,
+        metadata_timeout: float = 5.0,
+        retry_backoff: float = 0.1,
+        max_retry_backoff: float = 10.0,
+    ):
+        if partitions_per_worker < 1:
+            raise ValueError("partitions_per_worker must be >= 1")
+        self.consumer_factory = consumer_factory
+        self.topic = topic
+        self.process_batch = process_batch
+        self.partitions_per_worker = partitions_per_worker
+        self.batch_size = batch_size
+        self.poll_timeout = poll_timeout
+        self.metadata_timeout = metadata_timeout
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self.stats = IngestStats()
+        self._in_flight = threading.Semaphore(max_in_flight_batches)
+        self._stop_event = threading.Event()
+        self.workers: List[TelemetryIngestWorker] = []
+
+    def _partition_count(self, consumer: Consumer) -> int:
+        try:
+            metadata = consumer.list_topics(self.topic, timeout=self.metadata_timeout)
+            return max(len(metadata.topics[self.topic].partitions), 1)
+        except Exception as e:
+            logger.warning(f"Could not read partition count for '{self.topic}': {e}. Starting a single worker.")
+            return 1
+
+    def start(self):
+        first = self.consumer_factory()
+        num_workers = math.ceil(self._partition_count(first) / self.partitions_per_worker)
+        consumers = [first] + [self.consumer_factory() for _ in range(num_workers - 1)]
+        for idx, consumer in enumerate(consumers):
+            consumer.subscribe([self.topic])
+            worker = TelemetryIngestWorker(
+                f"ingest-{idx}", consumer, self.process_batch, self._in_flight, self.stats,
+                self._stop_event, batch_size=self.batch_size, poll_timeout=self.poll_timeout,
+                retry_backoff=self.retry_backoff, max_retry_backoff=self.max_retry_backoff,
+            )
+            self.workers.append(worker)
+            worker.start()
+        logger.info(f"Telemetry ingest started with {num_workers} worker(s) on topic '{self.topic}'.")
+
+    def stop(self, timeout: float = 10.0):
+        self._stop_event.set()
+        for worker in self.workers:
+            worker.join(timeout=timeout)
+            if worker.is_alive():
+                logger.warning(f"Ingest worker {worker.name} did not stop within {timeout}s.")
+        self.workers = []
+        logger.info("Telemetry ingest stopped.")
@@ -0,0 +1,253 @@
+# intelligence-core/src/python/julia_client.py
+import asyncio
+import itertools
+import json
+import logging
+import struct
+import time
+from typing import Any, Dict, List, Optional
+
+from metrics import Histogram, LATENCY_BUCKETS_MS
+from serialization import json_loads
+
+logger = logging.getLogger(__name__)
+
+# Wire format shared with intelligence-core/src/julia/main.jl: every frame is a 4-byte
+# big-endian length followed by a UTF-8 JSON object. Requests carry a `correlation_id`
+# that the server echoes back, so responses may arrive in any order.
+_LENGTH = struct.Struct("!I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+# --- Connection Protocol ---
+
+class _JuliaProtocol(asyncio.BufferedProtocol):
+    """
+    One pipelined connection to the Julia compute server.
+
+    Incoming bytes are received directly into a preallocated bytearray (grown only
+    when a frame does not fit) and frames are sliced out with memoryviews, so a
+    large response is never rebuilt through repeated bytes concatenation.
+    """
+    def __init__(self, initial_buffer: int = 64 * 1024):
+        self._buf = bytearray(initial_buffer)
+        self._filled = 0
+        self._needed = 0  # Bytes required to hold the partially received frame
+        self._transport: Optional[asyncio.Transport] = None
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.closed = asyncio.Event()
+
+    # asyncio.BufferedProtocol interface
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        # Resizing is only safe here: the transport still holds the previous view
+        # while buffer_updated() runs.
+        target = max(self._needed, self._filled + 1)
+        if target > len(self._buf):
+            self._buf.extend(bytes(max(target, 2 * len(self._buf)) - len(self._buf)))
+        return memoryview(self._buf)[self._filled:]
+
+    def buffer_updated(self, nbytes: int):
+        self._filled += nbytes
+        self._drain_frames()
+
+    def eof_received(self):
+        return False  # Close the transport
+
+    def connection_lost(self, exc):
+        error = exc or ConnectionError("Connection closed by Julia.")
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self.pending.clear()
+        self.closed.set()
+
+    # Framing
+    def _drain_frames(self):
+        view = memoryview(self._buf)
+        start = 0
+        self._needed = 0
+        try:
+            while self._filled - start >= _LENGTH.size:
+                (length,) = _LENGTH.unpack_from(view, start)
+                if length > MAX_FRAME_BYTES:
+                    logger.error(f"Julia frame of {length} bytes exceeds limit; closing connection.")
+                    self._transport.close()
+                    return
+                end = start + _LENGTH.size + length
+                if end > self._filled:
+                    self._needed = end - start  # Frame size once compacted to the front
+                    break
+                self._dispatch(view[start + _LENGTH.size:end])
+                start = end
+        finally:
+            view.release()
+        if start:
+            remaining = self._filled - start
+            self._buf[:remaining] = self._buf[start:self._filled]
+            self._filled = remaining
+
+    def _dispatch(self, payload: memoryview):
+        try:
+            message = json_loads(bytes(payload))
+        except ValueError as e:
+            logger.error(f"Undecodable frame from Julia: {e}")
+            return
+        future = self.pending.pop(message.pop("correlation_id", None), None)
+        if future is None:
+            logger.warning("Julia response without a matching in-flight request; dropping.")
+        elif not future.done():
+            future.set_result(message)
+
+    def send(self, correlation_id: int, future: asyncio.Future, command: Dict[str, Any]):
+        body = json.dumps({**command, "correlation_id": correlation_id}).encode("utf-8")
+        self.pending[correlation_id] = future
+        self._transport.write(_LENGTH.pack(len(body)) + body)
+
+    @property
+    def is_open(self) -> bool:
+        return self._transport is not None and not self._transport.is_closing()
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+
+
+# --- Connection Pool ---
+
+class JuliaComputeClient:
+    """
+    Asyncio connection pool for the Julia compute server.
+
+    Each request is tagged with a correlation ID and sent on the open connection with
+    the fewest in-flight requests, so many commands can be pipelined over one socket.
+    Broken connections fail only their own in-flight requests and are re-established
+    lazily. A background task pings the server and replaces unhealthy connections.
+    """
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        pool_size: int = 4,
+        connect_timeout: float = 5.0,
+        request_timeout: float = 30.0,
+        health_check_interval: float = 15.0,
+    ):
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.health_check_interval = health_check_interval
+        self._connections: List[Optional[_JuliaProtocol]] = [None] * pool_size
+        self._connect_locks = [asyncio.Lock() for _ in range(pool_size)]
+        self._ids = itertools.count(1)
+        self._health_task: Optional[asyncio.Task] = None
+        self.rtt_hist = Histogram("julia_rtt_ms", LATENCY_BUCKETS_MS, "Send to response time of successful commands")
+
+    async def start(self):
+        """Opens the pool. Connection failures are logged; requests will retry them."""
+        results = await asyncio.gather(*(self._ensure_connection(i) for i in range(self.pool_size)), return_exceptions=True)
+        connected = sum(1 for r in results if isinstance(r, _JuliaProtocol))
+        if connected:
+            logger.info(f"Connected to Julia Compute Service at {self.host}:{self.port} ({connected}/{self.pool_size} connections)")
+        else:
+            logger.error(f"Julia Compute Service at {self.host}:{self.port} is unavailable; will retry on demand.")
+        if self.health_check_interval > 0:
+            self._health_task = asyncio.create_task(self._health_loop(), name="julia-health-check")
+
+    async def close(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for idx, conn in enumerate(self._connections):
+            if conn is not None:
+                conn.close()
+            self._connections[idx] = None
+        logger.info("Disconnected from Julia Compute Service.")
+
+    @property
+    def connected(self) -> int:
+        return sum(1 for conn in self._connections if conn is not None and conn.is_open)
+
+    async def _ensure_connection(self, idx: int) -> _JuliaProtocol:
+        conn = self._connections[idx]
+        if conn is not None and conn.is_open:
+            return conn
+        async with self._connect_locks[idx]:
+            conn = self._connections[idx]
+            if conn is not None and conn.is_open:
+                return conn
+            loop = asyncio.get_running_loop()
+            _, protocol = await asyncio.wait_for(
+                loop.create_connection(_JuliaProtocol, self.host, self.port), timeout=self.connect_timeout
+            )
+            self._connections[idx] = protocol
+            return protocol
+
+    async def _acquire(self) -> _JuliaProtocol:
+        open_conns = [c for c in self._connections if c is not None and c.is_open]
+        if open_conns:
+            return min(open_conns, key=lambda c: len(c.pending))
+        # Nothing open: try each slot until one connects.
+        last_error: Optional[BaseException] = None
+        for idx in range(self.pool_size):
+            try:
+                return await self._ensure_connection(idx)
+            except (OSError, asyncio.TimeoutError) as e:
+                last_error = e
+        raise ConnectionError(f"Julia Compute Service unreachable: {last_error}")
+
+    async def send_command(self, command_dict: Dict[str, Any], timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Sends one command and returns the decoded response, or None on failure."""
+        try:
+            conn = await self._acquire()
+        except ConnectionError as e:
+            logger.error(f"{e}")
+            return None
+        correlation_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        started = time.perf_counter()
+        try:
+            conn.send(correlation_id, future, command_dict)
+            response = await asyncio.wait_for(future, timeout=timeout or self.request_timeout)
+            self.rtt_hist.observe((time.perf_counter() - started) * 1000.0)
+            return response
+        except asyncio.TimeoutError:
+            logger.error(f"Julia command '{command_dict.get('command')}' timed out.")
+            return None
+        except (ConnectionError, OSError) as e:
+            logger.error(f"Julia communication error: {e}. The connection will be re-established.")
+            return None
+        finally:
+            conn.pending.pop(correlation_id, None)
+
+    async def check_health(self):
+        """PINGs every idle connection, reconnecting closed slots and dropping unresponsive ones."""
+        for idx in range(self.pool_size):
+            conn = self._connections[idx]
+            if conn is not None and conn.is_open and conn.pending:
+                continue  # Busy connections are proving themselves healthy
+            correlation_id = next(self._ids)
+            try:
+                conn = await self._ensure_connection(idx)
+                future = asyncio.get_running_loop().create_future()
+                conn.send(correlation_id, future, {"command": "PING"})
+                await asyncio.wait_for(future, timeout=self.connect_timeout)
+            except (OSError, ConnectionError, asyncio.TimeoutError) as e:
+                logger.warning(f"Julia connection {idx} failed health check: {e}")
+                if conn is not None:
+                    conn.pending.pop(correlation_id, None)
+                    conn.close()
+                self._connections[idx] = None
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await self.check_health()
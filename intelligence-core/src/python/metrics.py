@@ -0,0 +1,152 @@
+# intelligence-core/src/python/metrics.py
+import bisect
+import math
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+# --- Default Bucket Layouts ---
+# Latency buckets are in milliseconds; size buckets are row counts.
+LATENCY_BUCKETS_MS: Sequence[float] = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+SIZE_BUCKETS: Sequence[float] = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+class Histogram:
+    """
+    A fixed-bucket histogram with Prometheus `le` semantics.
+
+    Observations are O(log buckets) and guarded by a lock so the histogram can be
+    shared between the event loop and executor threads.
+    """
+    def __init__(self, name: str, buckets: Iterable[float], description: str = ""):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns cumulative bucket counts, total count and sum."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative, running = {}, 0
+        for bound, c in zip(self.buckets, counts):
+            running += c
+            cumulative[f"{bound:g}"] = running
+        cumulative["+Inf"] = running + counts[-1]
+        return {"buckets": cumulative, "count": count, "sum": total}
+
+
+class CallbackMetric:
+    """
+    A counter or gauge read from `fn` at scrape time, for values a component already
+    tracks. With `label`, `fn` returns {label value: value} and one series is rendered
+    per entry.
+    """
+    def __init__(self, name: str, fn: Callable[[], Any], kind: str = "gauge", description: str = "", label: Optional[str] = None):
+        if kind not in ("counter", "gauge"):
+            raise ValueError(f"kind must be 'counter' or 'gauge', got '{kind}'")
+        self.name = name
+        self.fn = fn
+        self.kind = kind
+        self.description = description
+        self.label = label
+
+
+Metric = Union[Histogram, CallbackMetric]
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _metric_name(namespace: str, name: str) -> str:
+    name = _INVALID_NAME_CHARS.sub("_", name)
+    return f"{namespace}_{name}" if namespace else name
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+# --- Registry ---
+
+class MetricsRegistry:
+    """
+    Renders metrics in the Prometheus text exposition format (version 0.0.4).
+
+    Metrics are either registered up front or yielded by collectors, which are called on
+    every scrape. Collectors suit components that are created (or replaced) at startup:
+    their histograms stay owned by the component and are only read when `/metrics` is
+    scraped, so the hot path never touches the registry.
+    """
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, namespace: str = ""):
+        self.namespace = namespace
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Optional[Metric]]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, *metrics: Metric):
+        """Adds metrics; a metric with the same name replaces the earlier one."""
+        with self._lock:
+            for metric in metrics:
+                self._metrics[metric.name] = metric
+
+    def histogram(self, name: str, buckets: Iterable[float], description: str = "") -> Histogram:
+        histogram = Histogram(name, buckets, description)
+        self.register(histogram)
+        return histogram
+
+    def add_collector(self, collector: Callable[[], Iterable[Optional[Metric]]]):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect(self) -> List[Metric]:
+        with self._lock:
+            metrics = dict(self._metrics)
+            collectors = list(self._collectors)
+        for collector in collectors:
+            for metric in collector():
+                if isinstance(metric, (Histogram, CallbackMetric)): # Collectors yield None for parts that are off
+                    metrics.setdefault(metric.name, metric)
+        return [metrics[name] for name in sorted(metrics)]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.collect():
+            name = _metric_name(self.namespace, metric.name)
+            if isinstance(metric, Histogram):
+                snapshot = metric.snapshot()
+                lines.append(f"# HELP {name} {metric.description or metric.name}")
+                lines.append(f"# TYPE {name} histogram")
+                for bound, count in snapshot["buckets"].items():
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {count}')
+                lines.append(f"{name}_sum {_format_value(snapshot['sum'])}")
+                lines.append(f"{name}_count {snapshot['count']}")
+            else:
+                value = metric.fn()
+                if value is None:
+                    continue
+                lines.append(f"# HELP {name} {metric.description or metric.name}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+                if metric.label is None:
+                    lines.append(f"{name} {_format_value(value)}")
+                else:
+                    for key, series in value.items():
+                        lines.append(f'{name}{{{metric.label}="{key}"}} {_format_value(series)}')
+        return "\n".join(lines) + "\n"
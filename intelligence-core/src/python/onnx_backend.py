@@ -0,0 +1,261 @@
+# intelligence-core/src/python/onnx_backend.py
+"""
+ONNX Runtime CPU backend for the anomaly and sentiment models.
+
+Export (needs TensorFlow, tf2onnx, torch and transformers, i.e. a build machine):
+
+    python onnx_backend.py --anomaly-model ./models/anomaly_detector.h5 \
+        --llm-model distilbert-base-uncased-finetuned-sst-2-english --output-dir ./models/onnx --quantize
+
+Serving only needs onnxruntime, numpy and tokenizers: the exported directory holds
+`anomaly.onnx`, `sentiment/model.onnx`, the fast tokenizer and the label config, plus
+`*.int8.onnx` variants when exported with `--quantize`. Sharing weights across worker
+processes (`share_weights`) additionally needs the onnx package.
+"""
+import argparse
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+import numpy as np
+
+from features import FEATURE_DIM
+
+if TYPE_CHECKING:
+    import onnxruntime
+
+logger = logging.getLogger(__name__)
+
+MODEL_BACKENDS = ("native", "onnx")
+DEFAULT_OPSET = 17
+ANOMALY_INPUT = "features"
+
+
+def anomaly_onnx_path(model_dir: str, quantized: bool = False) -> str:
+    return os.path.join(model_dir, "anomaly.int8.onnx" if quantized else "anomaly.onnx")
+
+
+def sentiment_onnx_path(model_dir: str, quantized: bool = False) -> str:
+    return os.path.join(model_dir, "sentiment", "model.int8.onnx" if quantized else "model.onnx")
+
+
+# --- Shared Weights ---
+
+SHARED_WEIGHT_MIN_BYTES = 64 * 1024
+
+class SharedWeights:
+    """
+    An ONNX model split into a weightless graph and its weight arrays.
+
+    onnxruntime sessions do not survive a fork (their thread pools are gone in the
+    child), so every worker process builds its own session, and a session opened from
+    the model file holds a private copy of every initializer. Instead, the weights are
+    loaded into numpy arrays once, before the workers are forked, and the graph declares
+    them as inputs: each `run` feeds the arrays, which onnxruntime reads in place, so the
+    pages stay shared copy-on-write by all workers. Initializers below `min_bytes`
+    (shapes, scales, biases) stay in the graph and are still constant-folded.
+    """
+    def __init__(self, model_path: str, min_bytes: int = SHARED_WEIGHT_MIN_BYTES):
+        import onnx
+        from onnx import helper, numpy_helper
+
+        model = onnx.load(model_path)
+        declared = {i.name for i in model.graph.input} # IR < 4 lists initializers as inputs too
+        self.weights: Dict[str, np.ndarray] = {}
+        kept = []
+        for initializer in model.graph.initializer:
+            array = numpy_helper.to_array(initializer)
+            if array.nbytes < min_bytes:
+                kept.append(initializer)
+                continue
+            array.flags.writeable = False
+            self.weights[initializer.name] = array
+            if initializer.name not in declared:
+                model.graph.input.append(helper.make_tensor_value_info(initializer.name, initializer.data_type, list(initializer.dims)))
+        del model.graph.initializer[:]
+        model.graph.initializer.extend(kept)
+        self.graph = model.SerializeToString()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.weights.values())
+
+
+_shared_weights: Dict[str, SharedWeights] = {}
+
+def share_weights(model_path: str, min_bytes: int = SHARED_WEIGHT_MIN_BYTES) -> SharedWeights:
+    """Loads `model_path` as `SharedWeights`; sessions later opened for that path use them. Call before forking."""
+    shared = SharedWeights(model_path, min_bytes)
+    _shared_weights[os.path.abspath(model_path)] = shared
+    logger.info(f"Loaded {len(shared.weights)} weight arrays ({shared.nbytes / 2**20:.1f} MiB) of {model_path} for sharing")
+    return shared
+
+
+def shared_weights(model_path: str) -> Optional[SharedWeights]:
+    return _shared_weights.get(os.path.abspath(model_path))
+
+
+# --- Sessions ---
+
+def create_session(model: Union[str, bytes], intra_op_threads: int = 0, inter_op_threads: int = 1) -> "onnxruntime.InferenceSession":
+    """
+    Opens a CPU inference session with full graph optimizations, from a model path or
+    serialized model bytes.
+
+    `intra_op_threads` parallelizes a single operator (0 lets onnxruntime use one thread
+    per physical core). The models are plain operator chains, so inter-op parallelism
+    rarely pays off and defaults to 1.
+    """
+    import onnxruntime as ort  # Imported on first use, so the native backend never loads it
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.intra_op_num_threads = intra_op_threads
+    options.inter_op_num_threads = inter_op_threads
+    return ort.InferenceSession(model, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def _open(model_path: str, intra_op_threads: int, inter_op_threads: int):
+    """A session for `model_path` and the weights to feed on every run (empty unless shared)."""
+    shared = shared_weights(model_path)
+    if shared is None:
+        return create_session(model_path, intra_op_threads, inter_op_threads), {}
+    return create_session(shared.graph, intra_op_threads, inter_op_threads), shared.weights
+
+
+class OnnxAnomalyModel:
+    """Drop-in replacement for the Keras model: exposes the same `predict_on_batch`."""
+    def __init__(self, model_path: str, intra_op_threads: int = 0, inter_op_threads: int = 1):
+        self.session, self._weights = _open(model_path, intra_op_threads, inter_op_threads)
+        self._input = next(i.name for i in self.session.get_inputs() if i.name not in self._weights)
+        self._output = self.session.get_outputs()[0].name
+
+    def predict_on_batch(self, features: np.ndarray) -> np.ndarray:
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        return self.session.run([self._output], {self._input: features, **self._weights})[0]
+
+
+class OnnxSentimentClassifier:
+    """
+    Sequence classifier served from an exported ONNX graph and a `tokenizers` fast
+    tokenizer. Batches are padded to their longest text, as with the native backend.
+    """
+    def __init__(self, model_path: str, max_length: int = 512, intra_op_threads: int = 0, inter_op_threads: int = 1):
+        from tokenizers import Tokenizer
+
+        model_dir = os.path.dirname(model_path)
+        self.session, self._weights = _open(model_path, intra_op_threads, inter_op_threads)
+        self._inputs = {i.name for i in self.session.get_inputs()}
+        self._output = self.session.get_outputs()[0].name
+
+        with open(os.path.join(model_dir, "config.json"), encoding="utf-8") as f:
+            config = json.load(f)
+        self.id2label: Dict[int, str] = {int(k): v for k, v in config["id2label"].items()}
+        pad_token = "[PAD]"
+        tokenizer_config = os.path.join(model_dir, "tokenizer_config.json")
+        if os.path.exists(tokenizer_config):
+            with open(tokenizer_config, encoding="utf-8") as f:
+                pad_token = json.load(f).get("pad_token") or pad_token
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length)
+        self.tokenizer.enable_padding(pad_id=self.tokenizer.token_to_id(pad_token) or 0, pad_token=pad_token)
+
+    def predict_logits(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(list(texts))
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+        }
+        if "token_type_ids" in self._inputs:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        feeds = {k: v for k, v in feeds.items() if k in self._inputs}
+        return self.session.run([self._output], {**feeds, **self._weights})[0]
+
+    def classify(self, texts: List[str]) -> List[str]:
+        if not texts:
+            return []
+        return [self.id2label[i] for i in self.predict_logits(texts).argmax(axis=-1).tolist()]
+
+
+# --- Export ---
+
+def quantize_int8(input_path: str, output_path: str):
+    """Dynamic int8 quantization: weights are stored as int8, activations quantized per batch."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(input_path, output_path, weight_type=QuantType.QInt8)
+    logger.info(f"Quantized {input_path} -> {output_path}")
+
+
+def export_anomaly_model(keras_path: str, output_path: str, opset: int = DEFAULT_OPSET, feature_dim: int = FEATURE_DIM):
+    import tensorflow as tf
+    import tf2onnx
+
+    model = tf.keras.models.load_model(keras_path)
+    signature = (tf.TensorSpec((None, feature_dim), tf.float32, name=ANOMALY_INPUT),)
+    tf2onnx.convert.from_keras(model, input_signature=signature, opset=opset, output_path=output_path)
+    logger.info(f"Exported Keras anomaly model {keras_path} -> {output_path}")
+
+
+def export_sentiment_model(model_name: str, output_path: str, opset: int = DEFAULT_OPSET):
+    """Exports the classifier with dynamic batch and sequence axes, next to its tokenizer and config."""
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    output_dir = os.path.dirname(output_path)
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    model.config.return_dict = False  # Trace a plain tuple output
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    dynamic = {0: "batch", 1: "sequence"}
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            output_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={"input_ids": dynamic, "attention_mask": dynamic, "logits": {0: "batch"}},
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+    model.config.return_dict = True
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    logger.info(f"Exported sentiment model '{model_name}' -> {output_path}")
+
+
+def export_all(anomaly_model: Optional[str], llm_model: Optional[str], output_dir: str, quantize: bool = False, opset: int = DEFAULT_OPSET):
+    os.makedirs(output_dir, exist_ok=True)
+    exported = []
+    if anomaly_model:
+        export_anomaly_model(anomaly_model, anomaly_onnx_path(output_dir), opset=opset)
+        exported.append((anomaly_onnx_path(output_dir), anomaly_onnx_path(output_dir, quantized=True)))
+    if llm_model:
+        export_sentiment_model(llm_model, sentiment_onnx_path(output_dir), opset=opset)
+        exported.append((sentiment_onnx_path(output_dir), sentiment_onnx_path(output_dir, quantized=True)))
+    if quantize:
+        for fp32_path, int8_path in exported:
+            quantize_int8(fp32_path, int8_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the Intelligence Core models to ONNX.")
+    parser.add_argument("--anomaly-model", help="Path to the Keras .h5 anomaly model")
+    parser.add_argument("--llm-model", help="Hugging Face name or path of the sentiment classifier")
+    parser.add_argument("--output-dir", default="./models/onnx")
+    parser.add_argument("--quantize", action="store_true", help="Also write int8 dynamically quantized models")
+    parser.add_argument("--opset", type=int, default=DEFAULT_OPSET)
+    args = parser.parse_args()
+    if not args.anomaly_model and not args.llm_model:
+        parser.error("nothing to export: pass --anomaly-model and/or --llm-model")
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    export_all(args.anomaly_model, args.llm_model, args.output_dir, quantize=args.quantize, opset=args.opset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# intelligence-core/src/python/partitions.py
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Partition granularities: name suffix format and width
+PARTITION_INTERVALS = {
+    "day": ("%Y%m%d", timedelta(days=1)),
+    "hour": ("%Y%m%d%H", timedelta(hours=1)),
+}
+
+
+def partition_start(moment: datetime, interval: str) -> datetime:
+    if interval == "day":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def partition_name(table: str, start: datetime, interval: str) -> str:
+    return f"{table}_p{start.strftime(PARTITION_INTERVALS[interval][0])}"
+
+
+def parse_partition_name(table: str, name: str, interval: str) -> Optional[datetime]:
+    """Start of the range covered by partition `name`, or None if it is not one of ours (e.g. the default partition)."""
+    match = re.fullmatch(re.escape(table) + r"_p(\d+)", name)
+    if match is None:
+        return None
+    try:
+        return datetime.strptime(match.group(1), PARTITION_INTERVALS[interval][0])
+    except ValueError:
+        return None
+
+
+def planned_partitions(now: datetime, interval: str, ahead: int) -> List[Tuple[datetime, datetime]]:
+    """[start, end) ranges of the current partition and the `ahead` following ones."""
+    width = PARTITION_INTERVALS[interval][1]
+    start = partition_start(now, interval)
+    return [(start + i * width, start + (i + 1) * width) for i in range(ahead + 1)]
+
+
+# --- Partition Manager ---
+
+class PartitionManager:
+    """
+    Keeps a range-partitioned table (PostgreSQL declarative partitioning on its time
+    `column`) supplied with partitions and enforces retention.
+
+    Every `maintenance_interval_s` the current partition and `ahead` future ones are
+    created, and partitions whose whole range is older than `retention` are detached and
+    dropped. Dropping a partition is a catalog operation, unlike a DELETE. A DEFAULT
+    partition catches rows outside the planned ranges (e.g. telemetry with a skewed
+    timestamp), so inserts never fail on a missing partition.
+
+    Each partition is created in its own transaction: as a plain table, filled with the
+    rows of its range that are already in DEFAULT (which would otherwise make the
+    attach fail), then attached. One failure therefore does not block the others.
+    Retention reaches DEFAULT with a row-level DELETE.
+
+    Unpartitioned tables (other databases such as SQLite in development, or a table
+    created before partitioning was introduced) get retention through a DELETE instead.
+    """
+    def __init__(
+        self,
+        engine: Engine,
+        table: str = "anomaly_alerts",
+        column: str = "timestamp",
+        interval: str = "day",
+        ahead: int = 3,
+        retention: timedelta = timedelta(days=30),
+        maintenance_interval_s: float = 3600.0,
+    ):
+        if interval not in PARTITION_INTERVALS:
+            raise ValueError(f"interval must be one of {tuple(PARTITION_INTERVALS)}, got '{interval}'")
+        self.engine = engine
+        self.table = table
+        self.column = column
+        self.interval = interval
+        self.ahead = ahead
+        self.retention = retention
+        self.maintenance_interval = maintenance_interval_s
+        self._task: Optional[asyncio.Task] = None
+        self._partitioned: Optional[bool] = None
+        self.partitions_created = 0
+        self.partitions_dropped = 0
+        self.rows_deleted = 0
+        self.last_run: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def partitioned(self) -> bool:
+        if self._partitioned is None:
+            self._partitioned = self.engine.dialect.name == "postgresql" and self._is_partitioned()
+            if self.engine.dialect.name == "postgresql" and not self._partitioned:
+                logger.warning(f"Partitions: {self.table} is not a partitioned table; retention will DELETE rows instead.")
+        return self._partitioned
+
+    def _is_partitioned(self) -> bool:
+        with self.engine.connect() as conn:
+            return conn.execute(text(
+                "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :table"
+            ), {"table": self.table}).first() is not None
+
+    def run_once(self, now: Optional[datetime] = None):
+        """Creates upcoming partitions and drops expired ones. Blocking; run it in a thread."""
+        now = now or datetime.utcnow()
+        cutoff = now - self.retention
+        if self.partitioned:
+            failed = self._ensure_partitions(now)
+            self._drop_partitions_before(cutoff)
+            self._delete_rows_before(cutoff, f"{self.table}_default")
+            if failed:
+                raise RuntimeError(f"could not create partition(s) {', '.join(failed)}")
+        else:
+            self._delete_rows_before(cutoff)
+        self.last_run = now
+
+    def _existing_partitions(self, conn) -> List[str]:
+        rows = conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table"
+        ), {"table": self.table})
+        return [row[0] for row in rows]
+
+    def _ensure_partitions(self, now: datetime) -> List[str]:
+        """Creates the missing planned partitions. Returns the names of those that could not be created."""
+        default = f"{self.table}_default"
+        with self.engine.begin() as conn:
+            existing = set(self._existing_partitions(conn))
+            if default not in existing:
+                conn.execute(text(f"CREATE TABLE IF NOT EXISTS {default} PARTITION OF {self.table} DEFAULT"))
+        failed = []
+        for start, end in planned_partitions(now, self.interval, self.ahead):
+            name = partition_name(self.table, start, self.interval)
+            if name in existing:
+                continue
+            try:
+                moved = self._create_partition(name, default, start, end)
+            except Exception as e:
+                failed.append(name)
+                logger.error(f"Partitions: could not create {name}: {e}")
+                continue
+            self.partitions_created += 1
+            logger.info(f"Partitions: created {name} [{start.isoformat()}, {end.isoformat()}), moving {moved} rows out of {default}.")
+        return failed
+
+    def _create_partition(self, name: str, default: str, start: datetime, end: datetime) -> int:
+        """Creates, fills from DEFAULT and attaches one partition in one transaction. Returns the rows moved."""
+        bounds = {"start": start, "end": end}
+        with self.engine.begin() as conn:
+            conn.execute(text(f"CREATE TABLE {name} (LIKE {self.table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+            moved = conn.execute(text(
+                f"WITH moved AS (DELETE FROM {default} WHERE {self.column} >= :start AND {self.column} < :end RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ).bindparams(bindparam("start", type_=DateTime), bindparam("end", type_=DateTime)), bounds).rowcount
+            conn.execute(text(
+                f"ALTER TABLE {self.table} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            ))
+        return moved
+
+    def _drop_partitions_before(self, cutoff: datetime):
+        width = PARTITION_INTERVALS[self.interval][1]
+        with self.engine.begin() as conn:
+            for name in self._existing_partitions(conn):
+                start = parse_partition_name(self.table, name, self.interval)
+                if start is None or start + width > cutoff:
+                    continue
+                conn.execute(text(f"ALTER TABLE {self.table} DETACH PARTITION {name}"))
+                conn.execute(text(f"DROP TABLE {name}"))
+                self.partitions_dropped += 1
+                logger.info(f"Partitions: dropped {name} (older than {cutoff.isoformat()}).")
+
+    def _delete_rows_before(self, cutoff: datetime, table: Optional[str] = None):
+        table = table or self.table
+        with self.engine.begin() as conn:
+            delete = text(f"DELETE FROM {table} WHERE {self.column} < :cutoff").bindparams(bindparam("cutoff", type_=DateTime))
+            result = conn.execute(delete, {"cutoff": cutoff})
+        if result.rowcount:
+            self.rows_deleted += result.rowcount
+            logger.info(f"Retention: deleted {result.rowcount} rows from {table} older than {cutoff.isoformat()}.")
+
+    async def start(self):
+        """Runs one maintenance pass (so the current partition exists) and schedules the rest."""
+        try:
+            await asyncio.to_thread(self.run_once)
+        except Exception as e:
+            # Rows still land in the DEFAULT partition (if any); the next pass retries.
+            self.last_error = str(e)
+            logger.error(f"Partitions: initial maintenance of {self.table} failed: {e}")
+        self._task = asyncio.create_task(self._run(), name=f"partitions-{self.table}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            try:
+                await asyncio.to_thread(self.run_once)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Partitions: maintenance of {self.table} failed: {e}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "table": self.table,
+            "partitioned": self.partitioned,
+            "interval": self.interval,
+            "retention_days": self.retention.total_seconds() / 86400.0,
+            "partitions_created": self.partitions_created,
+            "partitions_dropped": self.partitions_dropped,
+            "rows_deleted": self.rows_deleted,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_error": self.last_error,
+        }
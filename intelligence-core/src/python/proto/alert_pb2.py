@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: proto/alert.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'proto/alert.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11proto/alert.proto\x12\x05omega\"\xc3\x01\n\x0c\x41lertRequest\x12\x10\n\x08\x61gent_id\x18\x01 \x01(\t\x12\x13\n\x0bthreat_type\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x11\n\ttimestamp\x18\x04 \x01(\x03\x12\x33\n\x08metadata\x18\x05 \x03(\x0b\x32!.omega.AlertRequest.MetadataEntry\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"z\n\rAlertResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x10\n\x08\x61lert_id\x18\x03 \x01(\t\x12\x1c\n\x06\x61lerts\x18\x04 \x03(\x0b\x32\x0c.omega.Alert\x12\x17\n\x0fnext_page_token\x18\x05 \x01(\t\"\xc5\x01\n\x05\x41lert\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07summary\x18\x02 \x01(\t\x12&\n\x08severity\x18\x03 \x01(\x0e\x32\x14.omega.AlertSeverity\x12\x11\n\ttimestamp\x18\x04 \x01(\x03\x12\x16\n\x0esource_node_id\x18\x05 \x01(\t\x12\x13\n\x0bmetric_name\x18\x06 \x01(\t\x12\x15\n\ranomaly_score\x18\x07 \x01(\x05\x12\x0e\n\x06status\x18\x08 \x01(\t\x12\x10\n\x08sequence\x18\t \x01(\x04\"\x91\x01\n\x15GetThreatIntelRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12\x11\n\tpage_size\x18\x02 \x01(\r\x12\x12\n\npage_token\x18\x03 \x01(\t\x12*\n\x0cmin_severity\x18\x04 \x01(\x0e\x32\x14.omega.AlertSeverity\x12\x16\n\x0esource_node_id\x18\x05 \x01(\t\"\xf8\x01\n\x19StreamThreatEventsRequest\x12(\n\nseverities\x18\x01 \x03(\x0e\x32\x14.omega.AlertSeverity\x12*\n\x0cmin_severity\x18\x02 \x01(\x0e\x32\x14.omega.AlertSeverity\x12\x17\n\x0fsource_node_ids\x18\x03 \x03(\t\x12\x14\n\x0cmetric_names\x18\x04 \x03(\t\x12\x37\n\x14slow_consumer_policy\x18\x05 \x01(\x0e\x32\x19.omega.SlowConsumerPolicy\x12\x1d\n\x15resume_after_sequence\x18\x06 \x01(\x04*V\n\rAlertSeverity\x12\x18\n\x14SEVERITY_UNSPECIFIED\x10\x00\x12\x07\n\x03LOW\x10\x01\x12\n\n\x06MEDIUM\x10\x02\x12\x08\n\x04HIGH\x10\x03\x12\x0c\n\x08\x43RITICAL\x10\x04*.\n\x12SlowConsumerPolicy\x12\x08\n\x04SKIP\x10\x00\x12\x0e\n\nDISCONNECT\x10\x01\x32\x46\n\x0c\x41lertService\x12\x36\n\tSendAlert\x12\x13.omega.AlertRequest\x1a\x14.omega.AlertResponse2\xa7\x01\n\x10IntelligenceCore\x12K\n\x15GetThreatIntelligence\x12\x1c.omega.GetThreatIntelRequest\x1a\x14.omega.AlertResponse\x12\x46\n\x12StreamThreatEvents\x12 .omega.StreamThreatEventsRequest\x1a\x0c.omega.Alert0\x01\x42\x38Z6github.com/omega-cyber/mesh-network/gen/proto/go/alertb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'proto.alert_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  _globals['DESCRIPTOR']._loaded_options = None
+  _globals['DESCRIPTOR']._serialized_options = b'Z6github.com/omega-cyber/mesh-network/gen/proto/go/alert'
+  _globals['_ALERTREQUEST_METADATAENTRY']._loaded_options = None
+  _globals['_ALERTREQUEST_METADATAENTRY']._serialized_options = b'8\001'
+  _globals['_ALERTSEVERITY']._serialized_start=949
+  _globals['_ALERTSEVERITY']._serialized_end=1035
+  _globals['_SLOWCONSUMERPOLICY']._serialized_start=1037
+  _globals['_SLOWCONSUMERPOLICY']._serialized_end=1083
+  _globals['_ALERTREQUEST']._serialized_start=29
+  _globals['_ALERTREQUEST']._serialized_end=224
+  _globals['_ALERTREQUEST_METADATAENTRY']._serialized_start=177
+  _globals['_ALERTREQUEST_METADATAENTRY']._serialized_end=224
+  _globals['_ALERTRESPONSE']._serialized_start=226
+  _globals['_ALERTRESPONSE']._serialized_end=348
+  _globals['_ALERT']._serialized_start=351
+  _globals['_ALERT']._serialized_end=548
+  _globals['_GETTHREATINTELREQUEST']._serialized_start=551
+  _globals['_GETTHREATINTELREQUEST']._serialized_end=696
+  _globals['_STREAMTHREATEVENTSREQUEST']._serialized_start=699
+  _globals['_STREAMTHREATEVENTSREQUEST']._serialized_end=947
+  _globals['_ALERTSERVICE']._serialized_start=1085
+  _globals['_ALERTSERVICE']._serialized_end=1155
+  _globals['_INTELLIGENCECORE']._serialized_start=1158
+  _globals['_INTELLIGENCECORE']._serialized_end=1325
+# @@protoc_insertion_point(module_scope)
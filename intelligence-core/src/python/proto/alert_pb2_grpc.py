@@ -0,0 +1,216 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from proto import alert_pb2 as proto_dot_alert__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in proto/alert_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class AlertServiceStub:
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.SendAlert = channel.unary_unary(
+                '/omega.AlertService/SendAlert',
+                request_serializer=proto_dot_alert__pb2.AlertRequest.SerializeToString,
+                response_deserializer=proto_dot_alert__pb2.AlertResponse.FromString,
+                _registered_method=True)
+
+
+class AlertServiceServicer:
+    """Missing associated documentation comment in .proto file."""
+
+    def SendAlert(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_AlertServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'SendAlert': grpc.unary_unary_rpc_method_handler(
+                    servicer.SendAlert,
+                    request_deserializer=proto_dot_alert__pb2.AlertRequest.FromString,
+                    response_serializer=proto_dot_alert__pb2.AlertResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'omega.AlertService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('omega.AlertService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class AlertService:
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def SendAlert(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/omega.AlertService/SendAlert',
+            proto_dot_alert__pb2.AlertRequest.SerializeToString,
+            proto_dot_alert__pb2.AlertResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+
+class IntelligenceCoreStub:
+    """Served by intelligence-core.
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GetThreatIntelligence = channel.unary_unary(
+                '/omega.IntelligenceCore/GetThreatIntelligence',
+                request_serializer=proto_dot_alert__pb2.GetThreatIntelRequest.SerializeToString,
+                response_deserializer=proto_dot_alert__pb2.AlertResponse.FromString,
+                _registered_method=True)
+        self.StreamThreatEvents = channel.unary_stream(
+                '/omega.IntelligenceCore/StreamThreatEvents',
+                request_serializer=proto_dot_alert__pb2.StreamThreatEventsRequest.SerializeToString,
+                response_deserializer=proto_dot_alert__pb2.Alert.FromString,
+                _registered_method=True)
+
+
+class IntelligenceCoreServicer:
+    """Served by intelligence-core.
+    """
+
+    def GetThreatIntelligence(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamThreatEvents(self, request, context):
+        """Streams newly persisted anomaly alerts that match the request's filters.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_IntelligenceCoreServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'GetThreatIntelligence': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetThreatIntelligence,
+                    request_deserializer=proto_dot_alert__pb2.GetThreatIntelRequest.FromString,
+                    response_serializer=proto_dot_alert__pb2.AlertResponse.SerializeToString,
+            ),
+            'StreamThreatEvents': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamThreatEvents,
+                    request_deserializer=proto_dot_alert__pb2.StreamThreatEventsRequest.FromString,
+                    response_serializer=proto_dot_alert__pb2.Alert.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'omega.IntelligenceCore', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('omega.IntelligenceCore', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class IntelligenceCore:
+    """Served by intelligence-core.
+    """
+
+    @staticmethod
+    def GetThreatIntelligence(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/omega.IntelligenceCore/GetThreatIntelligence',
+            proto_dot_alert__pb2.GetThreatIntelRequest.SerializeToString,
+            proto_dot_alert__pb2.AlertResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamThreatEvents(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/omega.IntelligenceCore/StreamThreatEvents',
+            proto_dot_alert__pb2.StreamThreatEventsRequest.SerializeToString,
+            proto_dot_alert__pb2.Alert.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
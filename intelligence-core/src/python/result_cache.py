@@ -0,0 +1,182 @@
+# intelligence-core/src/python/result_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_key(command: Any) -> str:
+    """Content address of a JSON-like command: SHA-256 of its canonical (sorted, compact) encoding."""
+    encoded = json.dumps(command, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _estimate_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return 1024
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size", "tag")
+
+    def __init__(self, value: Any, expires_at: float, size: int, tag: Optional[str]):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.tag = tag
+
+
+def _retrieve_exception(task: asyncio.Future):
+    # Marks a failed computation's exception as retrieved, so a failure whose callers
+    # were all cancelled is not logged as "never retrieved".
+    if not task.cancelled():
+        task.exception()
+
+
+# --- LRU + TTL Cache with Single-Flight ---
+
+class ResultCache:
+    """
+    An in-memory LRU cache with per-entry TTL and an approximate memory cap.
+
+    Keys are arbitrary hashables; use `canonical_key` for JSON command dicts.
+    `get_or_compute` coalesces concurrent misses for the same key onto one in-flight
+    computation (single-flight), so N identical requests cost one backend call.
+    Entries can carry a `tag` (e.g. the command name) for targeted invalidation. A
+    `put` or `invalidate` that lands while a key is being computed wins: the computed
+    value is returned to its callers but not stored over it.
+    With `max_entries=0` nothing is stored, but concurrent misses are still coalesced.
+    """
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0, max_bytes: int = 64 * 1024 * 1024, name: str = "cache"):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.max_bytes = max_bytes
+        self.name = name
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._generations: Dict[Hashable, Tuple[int, Optional[str]]] = {}  # In-flight key -> (writes since it started, tag)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns (found, value); refreshes the entry's LRU position on a hit."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry.value
+
+    def put(self, key: Hashable, value: Any, tag: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        self._supersede([key])
+        self._store(key, value, tag, ttl_seconds)
+
+    def _supersede(self, keys):
+        for key in keys:
+            generation = self._generations.get(key)
+            if generation is not None:
+                self._generations[key] = (generation[0] + 1, generation[1])
+
+    def _store(self, key: Hashable, value: Any, tag: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        if self.max_entries <= 0:
+            return
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return  # Never cache a value that would evict everything else
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(value, time.monotonic() + (ttl_seconds if ttl_seconds is not None else self.ttl), size, tag)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        tag: Optional[str] = None,
+        cacheable: Callable[[Any], bool] = lambda value: value is not None,
+    ) -> Any:
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        # The computation is a task the cache owns, and every caller (the first one
+        # included) awaits it through `shield`: a caller that is cancelled stops
+        # waiting, but the shared computation and the other callers carry on.
+        task = asyncio.ensure_future(self._compute(key, compute, tag, cacheable))
+        task.add_done_callback(_retrieve_exception)
+        self._inflight[key] = task
+        self._generations[key] = (0, tag)
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]], tag: Optional[str], cacheable: Callable[[Any], bool]) -> Any:
+        try:
+            value = await compute()
+            if cacheable(value) and self._generations[key][0] == 0:
+                self._store(key, value, tag=tag)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+            self._generations.pop(key, None)
+
+    def invalidate(self, key: Optional[Hashable] = None, tag: Optional[str] = None) -> int:
+        """Drops one key, every entry with `tag`, or (with no arguments) everything. Returns the count."""
+        if key is not None:
+            keys = [key] if key in self._entries else []
+            self._supersede([key])
+        elif tag is not None:
+            keys = [k for k, entry in self._entries.items() if entry.tag == tag]
+            self._supersede([k for k, (_, inflight_tag) in self._generations.items() if inflight_tag == tag])
+        else:
+            keys = list(self._entries)
+            self._supersede(list(self._generations))
+        for k in keys:
+            self._remove(k)
+        self.invalidations += len(keys)
+        if keys:
+            logger.info(f"Cache '{self.name}': invalidated {len(keys)} entr{'y' if len(keys) == 1 else 'ies'}.")
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
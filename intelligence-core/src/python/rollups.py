@@ -0,0 +1,141 @@
+# intelligence-core/src/python/rollups.py
+import asyncio
+import logging
+from datetime import datetime, timedelta
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from metrics import Histogram, LATENCY_BUCKETS_MS
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+RollupKey = Tuple[datetime, str, str, str]  # (minute bucket, source_node_id, metric_name, severity)
+
+ROLLUP_BUCKET = timedelta(minutes=1)
+
+
+def minute_bucket(moment: datetime) -> datetime:
+    return moment.replace(second=0, microsecond=0)
+
+
+def rebucket(points: Iterable[Row], bucket_minutes: int) -> List[Row]:
+    """Merges per-minute {bucket, alert_count, max_score} points into `bucket_minutes`-wide ones, oldest first."""
+    width = bucket_minutes * 60
+    merged: Dict[datetime, List[int]] = {}
+    for point in points:
+        minute = point["bucket"]
+        bucket = minute - timedelta(seconds=(minute - datetime(1970, 1, 1)).total_seconds() % width)
+        slot = merged.setdefault(bucket, [0, 0])
+        slot[0] += point["alert_count"]
+        slot[1] = max(slot[1], point["max_score"])
+    return [{"bucket": bucket, "alert_count": c, "max_score": m} for bucket, (c, m) in sorted(merged.items())]
+
+
+class RollupAccumulator:
+    """Per-minute alert counts and max scores per (node, metric, severity), not yet written."""
+    def __init__(self):
+        self._deltas: Dict[RollupKey, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._deltas)
+
+    def add(self, key: RollupKey, count: int, max_score: int):
+        slot = self._deltas.get(key)
+        if slot is None:
+            self._deltas[key] = [count, max_score]
+        else:
+            slot[0] += count
+            slot[1] = max(slot[1], max_score)
+
+    def add_alerts(self, rows: Iterable[Row]):
+        for row in rows:
+            self.add(
+                (minute_bucket(row["timestamp"]), row["source_node_id"], row["metric_name"], row["severity"]),
+                1, row["anomaly_score"]
+            )
+
+    def drain(self) -> List[Row]:
+        """Returns and clears the accumulated deltas as insert-ready rollup rows."""
+        deltas, self._deltas = self._deltas, {}
+        return [
+            {"bucket": bucket, "source_node_id": node, "metric_name": metric, "severity": severity,
+             "alert_count": count, "max_score": max_score}
+            for (bucket, node, metric, severity), (count, max_score) in deltas.items()
+        ]
+
+    def restore(self, rows: Iterable[Row]):
+        """Puts drained rows back, e.g. after a failed write, so no counts are lost."""
+        for row in rows:
+            self.add((row["bucket"], row["source_node_id"], row["metric_name"], row["severity"]), row["alert_count"], row["max_score"])
+
+
+# --- Rollup Writer ---
+
+class AlertRollupWriter:
+    """
+    Incrementally maintains the per-minute alert rollups from committed alert batches.
+
+    `add_alerts` only folds rows into an in-memory accumulator (cheap enough for the
+    write buffer's commit hook); every `flush_interval_s` the accumulated deltas are
+    written by `flush_fn` in a worker thread as one additive upsert (count += n,
+    max_score = max(...)). Additive upserts let several service processes maintain the
+    same rollups, and late alerts simply land in their minute. A failed write keeps the
+    deltas for the next attempt.
+    """
+    def __init__(self, flush_fn: Callable[[List[Row]], None], flush_interval_s: float = 5.0):
+        self.flush_fn = flush_fn
+        self.flush_interval = flush_interval_s
+        self._accumulator = RollupAccumulator()
+        self._task: Optional[asyncio.Task] = None
+        self.alerts_seen = 0
+        self.rows_upserted = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.flush_latency_hist = Histogram("alert_rollup_upsert_ms", LATENCY_BUCKETS_MS, "Rollup upsert + COMMIT time per flush")
+
+    def add_alerts(self, rows: List[Row]):
+        self._accumulator.add_alerts(rows)
+        self.alerts_seen += len(rows)
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run(), name="alert-rollups")
+        logger.info(f"Alert rollup writer started (flush_interval_s={self.flush_interval:g})")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        rows = self._accumulator.drain()
+        if not rows:
+            return
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.flush_fn, rows)
+        except Exception as e:
+            self.flush_errors += 1
+            self._accumulator.restore(rows)
+            logger.error(f"Alert rollups: upsert of {len(rows)} rows failed, will retry: {e}")
+        else:
+            self.flush_latency_hist.observe((time.perf_counter() - started) * 1000.0)
+            self.rows_upserted += len(rows)
+            self.flushes += 1
+
+    async def stop(self):
+        """Stops the background task and writes what is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "alerts_seen": self.alerts_seen,
+            "pending_rollup_rows": len(self._accumulator),
+            "rows_upserted": self.rows_upserted,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+        }
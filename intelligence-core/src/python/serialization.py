@@ -0,0 +1,140 @@
+# intelligence-core/src/python/serialization.py
+import json
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+    json_loads = orjson.loads
+    JSONDecodeError: Tuple[type, ...] = (orjson.JSONDecodeError,)
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
+    JSONDecodeError = (json.JSONDecodeError, UnicodeDecodeError)
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+ARROW_STREAM_CONTENT_TYPES = ("application/vnd.apache.arrow.stream",)
+
+
+class TelemetryColumns:
+    """Column-oriented telemetry batch, as consumed by the featurizer and the alert builder."""
+    __slots__ = ("source_node_ids", "metric_names", "values", "timestamps")
+
+    def __init__(self, source_node_ids: List[str], metric_names: List[str], values: List[Dict[str, Any]], timestamps: List[float]):
+        self.source_node_ids = source_node_ids
+        self.metric_names = metric_names
+        self.values = values
+        self.timestamps = timestamps
+
+    def __len__(self) -> int:
+        return len(self.source_node_ids)
+
+    def take(self, indices: Sequence[int]) -> "TelemetryColumns":
+        """The given rows, in the given order."""
+        return TelemetryColumns(
+            [self.source_node_ids[i] for i in indices], [self.metric_names[i] for i in indices],
+            [self.values[i] for i in indices], [self.timestamps[i] for i in indices]
+        )
+
+
+def check_timestamp(timestamp: Any, now: float, max_age_s: Optional[float] = None, max_skew_s: Optional[float] = None) -> float:
+    """
+    Returns an agent-supplied timestamp (epoch seconds) as a float. Raises ValueError if
+    it is not a finite number, or more than `max_age_s` before / `max_skew_s` after `now`
+    (None leaves that side open).
+    """
+    try:
+        timestamp = float(timestamp)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"'timestamp' must be a number, got {timestamp!r}") from e
+    if not math.isfinite(timestamp):
+        raise ValueError(f"'timestamp' must be finite, got {timestamp!r}")
+    if max_age_s is not None and timestamp < now - max_age_s:
+        raise ValueError(f"'timestamp' {timestamp:.3f} is more than {max_age_s:g}s in the past")
+    if max_skew_s is not None and timestamp > now + max_skew_s:
+        raise ValueError(f"'timestamp' {timestamp:.3f} is more than {max_skew_s:g}s in the future")
+    return timestamp
+
+
+def _validate_row(idx: int, source_node_id: Any, metric_name: Any, value: Any):
+    if not isinstance(source_node_id, str) or not isinstance(metric_name, str):
+        raise ValueError(f"row {idx}: 'source_node_id' and 'metric_name' must be strings")
+    if not isinstance(value, dict):
+        raise ValueError(f"row {idx}: 'value' must be an object")
+
+
+def parse_ndjson(body: bytes, max_age_s: Optional[float] = None, max_skew_s: Optional[float] = None) -> TelemetryColumns:
+    """
+    Parses newline-delimited TelemetryData JSON objects; blank lines are ignored. Rows
+    without a timestamp get the time of receipt; other timestamps must pass `check_timestamp`.
+    """
+    now = time.time()
+    nodes, metrics, values, timestamps = [], [], [], []
+    for idx, line in enumerate(body.splitlines()):
+        if not line.strip():
+            continue
+        try:
+            record = json_loads(line)
+        except JSONDecodeError as e:
+            raise ValueError(f"line {idx}: invalid JSON ({e})") from e
+        if not isinstance(record, dict):
+            raise ValueError(f"line {idx}: expected a JSON object")
+        source_node_id, metric_name, value = record.get("source_node_id"), record.get("metric_name"), record.get("value")
+        _validate_row(idx, source_node_id, metric_name, value)
+        timestamp = record.get("timestamp")
+        try:
+            timestamp = now if timestamp is None else check_timestamp(timestamp, now, max_age_s, max_skew_s)
+        except ValueError as e:
+            raise ValueError(f"line {idx}: {e}") from e
+        nodes.append(source_node_id)
+        metrics.append(metric_name)
+        values.append(value)
+        timestamps.append(timestamp)
+    return TelemetryColumns(nodes, metrics, values, timestamps)
+
+
+def parse_arrow_stream(body: bytes, max_age_s: Optional[float] = None, max_skew_s: Optional[float] = None) -> TelemetryColumns:
+    """
+    Parses an Arrow IPC stream with `source_node_id`, `metric_name` and `value` columns
+    and an optional `timestamp` column (epoch seconds or an Arrow timestamp). Null
+    timestamps get the time of receipt; others must pass `check_timestamp`.
+
+    `value` may be a struct, a map or a JSON-encoded string column.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    missing = {"source_node_id", "metric_name", "value"} - set(table.column_names)
+    if missing:
+        raise ValueError(f"Arrow stream is missing column(s): {sorted(missing)}")
+
+    nodes = table.column("source_node_id").to_pylist()
+    metrics = table.column("metric_name").to_pylist()
+
+    value_col = table.column("value")
+    if pa.types.is_string(value_col.type) or pa.types.is_large_string(value_col.type):
+        values = [json_loads(v) if v is not None else None for v in value_col.to_pylist()]
+    elif pa.types.is_map(value_col.type):
+        values = [dict(v) if v is not None else None for v in value_col.to_pylist()]
+    elif pa.types.is_struct(value_col.type):
+        values = [{k: x for k, x in v.items() if x is not None} if v is not None else None for v in value_col.to_pylist()]
+    else:
+        raise ValueError(f"Unsupported Arrow type for 'value': {value_col.type}")
+
+    now = time.time()
+    if "timestamp" in table.column_names:
+        ts_col = table.column("timestamp")
+        if pa.types.is_timestamp(ts_col.type):
+            ts_col = pc.divide(pc.cast(pc.cast(ts_col, pa.timestamp("us")), pa.int64()), 1_000_000.0)
+        timestamps = pc.fill_null(pc.cast(ts_col, pa.float64()), now).to_pylist()
+    else:
+        timestamps = [now] * table.num_rows
+
+    for idx, (source_node_id, metric_name, value, timestamp) in enumerate(zip(nodes, metrics, values, timestamps)):
+        _validate_row(idx, source_node_id, metric_name, value)
+        try:
+            check_timestamp(timestamp, now, max_age_s, max_skew_s)
+        except ValueError as e:
+            raise ValueError(f"row {idx}: {e}") from e
+    return TelemetryColumns(nodes, metrics, values, timestamps)
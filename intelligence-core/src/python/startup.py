@@ -0,0 +1,177 @@
+# intelligence-core/src/python/startup.py
+import asyncio
+import inspect
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Component states
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class _Component:
+    __slots__ = ("name", "start", "stop", "depends_on", "critical", "state", "error", "waited_ms", "load_ms")
+
+    def __init__(self, name: str, start: Callable[[], Awaitable[Any]], stop: Optional[Callable[[], Any]], depends_on: Sequence[str], critical: bool):
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.depends_on = tuple(depends_on)
+        self.critical = critical
+        self.state = PENDING
+        self.error: Optional[str] = None
+        self.waited_ms = 0.0
+        self.load_ms = 0.0
+
+
+def process_started_at() -> float:
+    """
+    When this process started, on the `time.perf_counter` clock, read from
+    /proc/self/stat so interpreter startup and module imports are included. Where that
+    is unavailable (not Linux), returns the current time.
+    """
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            fields = f.read().rsplit(b")", 1)[1].split()  # The command name may contain spaces
+        started_s = int(fields[19]) / os.sysconf("SC_CLK_TCK")  # Field 22, starttime: clock ticks since boot
+        return time.perf_counter() - (time.clock_gettime(time.CLOCK_BOOTTIME) - started_s)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.perf_counter()
+
+
+# --- Startup Orchestrator ---
+
+class StartupOrchestrator:
+    """
+    Starts service components concurrently, each as soon as its dependencies are ready.
+
+    `start()` returns once every critical component is ready, so the service can accept
+    traffic while the rest keep loading in the background. Per-component state and
+    timings are available from `status()` for health checks, and the cold-start breakdown
+    is logged when the last component settles. `shutdown()` stops ready components in
+    reverse order of readiness, so dependents stop before their dependencies.
+    """
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self._components: Dict[str, _Component] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._ready_order: List[str] = []
+        self._report_task: Optional[asyncio.Task] = None
+
+    def add(
+        self,
+        name: str,
+        start: Callable[[], Awaitable[Any]],
+        stop: Optional[Callable[[], Any]] = None,
+        depends_on: Sequence[str] = (),
+        critical: bool = False,
+    ):
+        if name in self._components:
+            raise ValueError(f"Component '{name}' is already registered.")
+        for dep in depends_on:
+            if dep not in self._components:
+                raise ValueError(f"Component '{name}' depends on unknown component '{dep}'.")
+        self._components[name] = _Component(name, start, stop, depends_on, critical)
+
+    def is_ready(self, name: str) -> bool:
+        component = self._components.get(name)
+        return component is not None and component.state == READY
+
+    @property
+    def critical_ready(self) -> bool:
+        return all(c.state == READY for c in self._components.values() if c.critical)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "state": c.state,
+                "critical": c.critical,
+                "load_ms": round(c.load_ms, 1),
+                **({"error": c.error} if c.error else {}),
+            }
+            for name, c in self._components.items()
+        }
+
+    async def start(self):
+        """Launches every component and waits for the critical ones. Raises if one of them fails."""
+        for name, component in self._components.items():
+            self._tasks[name] = asyncio.create_task(self._run(component), name=f"startup-{name}")
+        critical = [self._tasks[c.name] for c in self._components.values() if c.critical]
+        if critical:
+            await asyncio.wait(critical)
+        self._report_task = asyncio.create_task(self._report_when_settled(), name="startup-report")
+        failed = [c.name for c in self._components.values() if c.critical and c.state != READY]
+        if failed:
+            raise RuntimeError(f"Critical component(s) failed to start: {', '.join(failed)}")
+        logger.info(f"Critical path ready after {(time.perf_counter() - self.started_at) * 1000:.0f} ms; remaining components load in the background.")
+
+    async def wait_all(self):
+        """Waits until every component is either ready or failed."""
+        if self._tasks:
+            await asyncio.wait(list(self._tasks.values()))
+
+    async def _run(self, component: _Component):
+        waited_from = time.perf_counter()
+        for dep in component.depends_on:
+            dependency = self._components[dep]
+            await self._tasks[dep]
+            if dependency.state != READY:
+                component.state = FAILED
+                component.error = f"dependency '{dep}' is {dependency.state}"
+                logger.error(f"Startup: '{component.name}' skipped because {component.error}.")
+                return
+        component.waited_ms = (time.perf_counter() - waited_from) * 1000.0
+
+        component.state = LOADING
+        loaded_from = time.perf_counter()
+        try:
+            await component.start()
+        except asyncio.CancelledError:
+            component.state = FAILED
+            component.error = "cancelled"
+            raise
+        except Exception as e:
+            component.state = FAILED
+            component.error = str(e) or type(e).__name__
+            logger.error(f"Startup: '{component.name}' failed: {component.error}")
+            return
+        finally:
+            component.load_ms = (time.perf_counter() - loaded_from) * 1000.0
+        component.state = READY
+        self._ready_order.append(component.name)
+
+    async def _report_when_settled(self):
+        await self.wait_all()
+        total_ms = (time.perf_counter() - self.started_at) * 1000.0
+        lines = [
+            f"  {c.name:<18} {c.state:<8} waited {c.waited_ms:8.1f} ms  loaded {c.load_ms:8.1f} ms"
+            for c in sorted(self._components.values(), key=lambda c: c.waited_ms + c.load_ms)
+        ]
+        logger.info(f"Cold-start breakdown ({total_ms:.0f} ms since process start):\n" + "\n".join(lines))
+
+    async def shutdown(self):
+        """Cancels components still loading, then stops ready ones in reverse readiness order."""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        if self._report_task is not None:
+            await asyncio.gather(self._report_task, return_exceptions=True)
+        for name in reversed(self._ready_order):
+            component = self._components[name]
+            if component.stop is None:
+                continue
+            try:
+                result = component.stop()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Shutdown: stopping '{name}' failed: {e}")
+        self._ready_order = []
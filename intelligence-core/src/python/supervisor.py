@@ -0,0 +1,185 @@
+# intelligence-core/src/python/supervisor.py
+import ctypes
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_PR_SET_PDEATHSIG = 1
+
+
+def reuseport_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """
+    A listening TCP socket with SO_REUSEPORT. Every worker binds its own socket to the
+    same port and the kernel spreads incoming connections across them, instead of all
+    workers contending for accepts on one inherited socket.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((host, port))
+        sock.listen(backlog)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _exit_with_parent():
+    """Asks the kernel to SIGTERM this process when the supervisor dies (Linux only)."""
+    try:
+        ctypes.CDLL(None, use_errno=True).prctl(_PR_SET_PDEATHSIG, signal.SIGTERM)
+    except (OSError, AttributeError):
+        pass
+
+
+# --- Worker Supervisor ---
+
+class WorkerSupervisor:
+    """
+    Forks `workers` processes that each run `run_worker(index)` and keeps them running.
+
+    Whatever the caller loaded before `run()` (modules, model weights) is shared
+    copy-on-write by every worker; `gc.freeze()` moves those objects out of the
+    collector's reach first, so collections in the workers do not write to (and copy)
+    their pages. Each worker gets its own process group, so a terminal's Ctrl-C reaches
+    only the supervisor.
+
+    SIGTERM or SIGINT to the supervisor starts a coordinated shutdown: every worker gets
+    one SIGTERM (to drain requests and flush its buffers) and `shutdown_timeout_s` to
+    exit before it is killed. A worker that exits on its own is restarted, after
+    `restart_delay_s` doubling up to `max_restart_delay_s` while it keeps failing within
+    `min_uptime_s` of starting.
+    """
+    def __init__(
+        self,
+        run_worker: Callable[[int], Optional[int]],
+        workers: int,
+        shutdown_timeout_s: float = 30.0,
+        restart_delay_s: float = 1.0,
+        max_restart_delay_s: float = 30.0,
+        min_uptime_s: float = 60.0,
+        poll_interval_s: float = 0.2,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.run_worker = run_worker
+        self.workers = workers
+        self.shutdown_timeout = shutdown_timeout_s
+        self.restart_delay = restart_delay_s
+        self.max_restart_delay = max_restart_delay_s
+        self.min_uptime = min_uptime_s
+        self.poll_interval = poll_interval_s
+        self._pids: Dict[int, int] = {}  # pid -> worker index
+        self._started_at: Dict[int, float] = {}  # worker index -> monotonic start
+        self._delays: Dict[int, float] = {}  # worker index -> next restart delay
+        self._respawn_at: Dict[int, float] = {}  # worker index -> monotonic time
+        self._stopping = False
+        self.restarts = 0
+
+    def _request_stop(self, signum, frame):
+        if not self._stopping:
+            logger.info(f"Supervisor: received {signal.Signals(signum).name}, stopping {len(self._pids)} workers.")
+        self._stopping = True
+
+    def _spawn(self, index: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                os.setpgid(0, 0)
+                _exit_with_parent()
+                result = self.run_worker(index)
+                code = result if isinstance(result, int) else 0
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException:
+                logger.exception(f"Worker {index} crashed.")
+            finally:
+                logging.shutdown()
+                os._exit(code)
+        self._pids[pid] = index
+        self._started_at[index] = time.monotonic()
+        logger.info(f"Supervisor: started worker {index} (pid {pid}).")
+
+    def _reap(self):
+        """Collects exited workers and schedules restarts for them unless stopping."""
+        while self._pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._pids.clear()
+                return
+            if pid == 0:
+                return
+            index = self._pids.pop(pid, None)
+            if index is None:
+                continue
+            if self._stopping:
+                logger.info(f"Supervisor: worker {index} (pid {pid}) exited ({_describe(status)}).")
+                continue
+            uptime = time.monotonic() - self._started_at[index]
+            delay = self._delays.get(index, self.restart_delay) if uptime < self.min_uptime else self.restart_delay
+            self._delays[index] = min(delay * 2, self.max_restart_delay)
+            self._respawn_at[index] = time.monotonic() + delay
+            logger.error(f"Supervisor: worker {index} (pid {pid}) exited ({_describe(status)}) after {uptime:.1f}s; restarting in {delay:g}s.")
+
+    def run(self) -> int:
+        """Starts the workers and supervises them until SIGTERM/SIGINT, then shuts them down. Returns an exit code."""
+        previous = {sig: signal.signal(sig, self._request_stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+        gc.freeze()
+        try:
+            for index in range(self.workers):
+                self._spawn(index)
+            while not self._stopping:
+                time.sleep(self.poll_interval)
+                self._reap()
+                now = time.monotonic()
+                for index, at in list(self._respawn_at.items()):
+                    if at <= now and not self._stopping:
+                        del self._respawn_at[index]
+                        self.restarts += 1
+                        self._spawn(index)
+            return self._shutdown()
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def _shutdown(self) -> int:
+        for pid in self._pids:
+            _signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.shutdown_timeout
+        while self._pids and time.monotonic() < deadline:
+            time.sleep(min(self.poll_interval, 0.05))
+            self._reap()
+        if not self._pids:
+            logger.info("Supervisor: all workers stopped.")
+            return 0
+        for pid, index in list(self._pids.items()):
+            logger.error(f"Supervisor: worker {index} (pid {pid}) did not stop within {self.shutdown_timeout:g}s; killing it.")
+            _signal(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self._pids.clear()
+        return 1
+
+
+def _signal(pid: int, sig: int):
+    try:
+        os.kill(pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def _describe(status: int) -> str:
+    if os.WIFSIGNALED(status):
+        return f"signal {signal.Signals(os.WTERMSIG(status)).name}"
+    return f"code {os.waitstatus_to_exitcode(status)}"
@@ -0,0 +1,75 @@
+# intelligence-core/src/python/test_admission.py
+import numpy as np
+
+from admission import ADMITTED, DUPLICATE, SAMPLED, SHED, AdmissionController, DedupFilter, admitted, content_digest, content_digests
+
+
+def _rows(node, n, start=0):
+    return [node] * n, ["cpu_utilization"] * n, [float(start + i) for i in range(n)], [{"cpu_percent": 50}] * n
+
+
+def test_dedup_catches_resends_across_and_within_batches():
+    controller = AdmissionController(rate_per_s=0)
+    nodes, metrics, stamps, values = _rows("node-1", 3)
+    assert list(controller.admit(nodes, metrics, stamps, values, now=0.0)) == [ADMITTED] * 3
+    controller.record(content_digests(nodes, metrics, stamps, values), now=0.0)  # Their alerts were committed
+
+    # A reconnecting agent resends sample 2 twice, together with a new one.
+    decisions = controller.admit(["node-1"] * 3, metrics, [2.0, 2.0, 3.0], values, now=1.0)
+    assert list(decisions) == [DUPLICATE, DUPLICATE, ADMITTED]
+    assert controller.node_stats("node-1")["duplicate"] == 2
+
+
+def test_rows_are_only_remembered_once_recorded():
+    controller = AdmissionController(rate_per_s=0)
+    rows = _rows("node-1", 2)
+    digests = content_digests(*rows)
+    assert list(controller.admit(*rows, digests, now=0.0)) == [ADMITTED] * 2
+    # The write failed and the batch is redelivered: it is scored again, not dropped.
+    assert list(controller.admit(*rows, digests, now=1.0)) == [ADMITTED] * 2
+    controller.record(digests, now=1.0)
+    assert list(controller.admit(*rows, now=2.0)) == [DUPLICATE] * 2
+
+
+def test_dedup_filter_forgets_after_two_windows():
+    dedup = DedupFilter(window_s=10.0, capacity=1000, error_rate=0.01)
+    digests = np.array([content_digest("n", "m", 1.0, {"a": 1})], dtype=np.uint64)
+    dedup.add(digests, now=0.0)
+    assert dedup.contains(digests, now=15.0).all()  # Rotated once: still in the previous generation
+    assert not dedup.contains(digests, now=25.0).any()
+
+    rng = np.random.default_rng(0)
+    fresh = rng.integers(0, 2 ** 63, 5000, dtype=np.int64).astype(np.uint64)
+    dedup.add(fresh[:1000], now=25.0)
+    assert dedup.contains(fresh[1000:], now=25.0).mean() < 0.03
+
+
+def test_noisy_node_is_sampled_without_starving_others():
+    controller = AdmissionController(rate_per_s=10.0, burst=20.0, sample_rate=0.25)
+    noisy = controller.admit(*_rows("noisy", 1000), now=0.0)
+    quiet = controller.admit(*_rows("quiet", 5), now=0.0)
+
+    assert (noisy[:20] == ADMITTED).all() and not (noisy[20:] == ADMITTED).any()
+    assert 0.15 < (noisy[20:] == SAMPLED).mean() < 0.35
+    assert (quiet == ADMITTED).all()
+    assert admitted(noisy).sum() == 20 + (noisy == SAMPLED).sum()
+    assert controller.node_stats("noisy")["sampling"]
+
+    # A second later the bucket has refilled by `rate_per_s` tokens.
+    later = controller.admit(*_rows("noisy", 20, start=1000), now=1.0)
+    assert (later == ADMITTED).sum() == 10
+    stats = controller.stats(top=1)
+    assert stats["noisiest_nodes"][0]["source_node_id"] == "noisy"
+    assert stats["shed"] == (noisy == SHED).sum() + (later == SHED).sum()
+
+
+def test_shed_rows_are_not_remembered_and_node_state_is_bounded():
+    controller = AdmissionController(rate_per_s=1.0, burst=1.0, sample_rate=0.0, max_nodes=2)
+    first = controller.admit(*_rows("n1", 2), now=0.0)
+    assert list(first) == [ADMITTED, SHED]
+    retry = controller.admit(["n1"], ["cpu_utilization"], [1.0], [{"cpu_percent": 50}], now=5.0)
+    assert list(retry) == [ADMITTED]  # Judged afresh, not as a duplicate
+
+    controller.admit(*_rows("n2", 1), now=5.0)
+    controller.admit(*_rows("n3", 1), now=5.0)
+    assert controller.node_stats("n1") is None and controller.stats()["evictions"] == 1
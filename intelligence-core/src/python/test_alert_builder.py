@@ -0,0 +1,81 @@
+# intelligence-core/src/python/test_alert_builder.py
+import csv
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from alert_builder import ALERT_COLUMNS, AlertBuilder, copy_csv, new_ulids, utc_datetimes
+from serialization import TelemetryColumns
+
+CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def _decode(ulid):
+    value = 0
+    for digit in ulid:
+        value = value * 32 + CROCKFORD.index(digit)
+    return value
+
+
+def _columns(n):
+    return TelemetryColumns(
+        [f"node-{i % 3}" for i in range(n)], ["cpu"] * n, [{"usage": i / n} for i in range(n)],
+        [1700000000.25 + i * 0.001 for i in range(n)]
+    )
+
+
+@pytest.mark.parametrize("n", [5, 500])  # Scalar and vectorized paths
+def test_severities_match_the_threshold_rules(n):
+    builder = AlertBuilder()
+    scores = np.linspace(0, 100, n).astype(np.int64)
+    expected = ["CRITICAL" if s > 90 else "HIGH" if s > 70 else "MEDIUM" if s > 50 else "LOW" for s in scores.tolist()]
+    alerts = builder.build(_columns(n), scores)
+    assert alerts.severity == expected
+    assert [builder.severity(s) for s in scores.tolist()] == expected
+
+    custom = AlertBuilder(thresholds=(10, 20, 30)).build(_columns(4), [10, 11, 25, 31])
+    assert custom.severity == ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+    with pytest.raises(ValueError):
+        AlertBuilder(thresholds=(90, 70, 50))
+
+
+@pytest.mark.parametrize("n", [1, 7, 1000])
+def test_ulids_are_time_ordered_and_unique(n):
+    ids = new_ulids(n, now=1700000000.123, prefix="alert-")
+    assert all(i.startswith("alert-") and len(i) == len("alert-") + 26 for i in ids)
+    values = [_decode(i[len("alert-"):]) for i in ids]
+    assert all(v >> 80 == 1700000000123 for v in values)
+    assert len(set(ids)) == n
+    assert ids == sorted(ids)
+    assert new_ulids(1, now=1700000000.124)[0] > ids[-1][len("alert-"):]  # Later batches sort after
+
+
+def test_build_produces_copy_ready_tuples_and_records():
+    columns = _columns(40)
+    alerts = AlertBuilder().build(columns, np.full(40, 95))
+    tuples, records = alerts.tuples(), alerts.records()
+    assert len(alerts) == len(tuples) == len(records) == 40
+    assert tuples[3] == tuple(records[3][name] for name in ALERT_COLUMNS)
+    assert records[3]["timestamp"] == datetime.utcfromtimestamp(columns.timestamps[3])
+    assert records[3]["value"] is columns.values[3]
+    assert {r["status"] for r in records} == {"NEW"}
+    assert utc_datetimes(columns.timestamps) == [datetime.utcfromtimestamp(ts) for ts in columns.timestamps]
+
+
+@pytest.mark.parametrize("n", [5, 40])  # Scalar and vectorized paths
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), 1e20])
+def test_unstorable_timestamps_are_rejected_on_both_paths(n, bad):
+    columns = _columns(n)
+    columns.timestamps[3] = bad
+    with pytest.raises(ValueError, match="row 3"):
+        AlertBuilder().build(columns, np.full(n, 95))
+
+
+def test_copy_csv_round_trips():
+    rows = [("alert-1", datetime(2024, 1, 1, 12, 0, 0, 5), "node, \"7\"", "", {"usage": 0.5, "tags": ["a"]}, 91, "CRITICAL", "NEW")]
+    parsed = list(csv.reader(copy_csv(rows)))
+    assert parsed == [["alert-1", "2024-01-01 12:00:00.000005", "node, \"7\"", "", '{"usage":0.5,"tags":["a"]}', "91", "CRITICAL", "NEW"]]
+    assert json.loads(parsed[0][4]) == rows[0][4]
+    assert ',"",' in copy_csv(rows).getvalue()  # Quoted, so COPY reads '' rather than NULL
@@ -0,0 +1,58 @@
+# intelligence-core/src/python/test_alert_cache.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from alert_cache import LatestAlertsCache, decode_page_token, encode_page_token
+
+T0 = datetime(2024, 1, 1)
+
+
+def _row(i, seconds=None, severity="HIGH"):
+    return {
+        "id": f"alert-{i:03d}", "timestamp": T0 + timedelta(seconds=i if seconds is None else seconds),
+        "source_node_id": "node-1", "metric_name": "cpu", "value": {"raw": i},
+        "anomaly_score": 80, "severity": severity, "status": "NEW",
+    }
+
+
+def test_page_token_round_trip_and_validation():
+    row = _row(7)
+    assert decode_page_token(encode_page_token(row)) == (row["timestamp"], row["id"])
+    assert decode_page_token("") is None
+    with pytest.raises(ValueError):
+        decode_page_token("not-a-token")
+
+
+def test_latest_is_newest_first_and_keeps_only_capacity_rows():
+    cache = LatestAlertsCache(capacity=3)
+    cache.warm([_row(1), _row(2)])
+    assert cache.complete
+    cache.add_many([_row(5), _row(3, seconds=4), _row(4, seconds=4)])  # Out of order, equal timestamps
+
+    assert [r["id"] for r in cache.latest(3)] == ["alert-005", "alert-004", "alert-003"]
+    assert "value" not in cache.latest(1)[0]
+    assert len(cache) == 3 and not cache.complete
+    cache.add_many([_row(0)])  # Older than everything retained
+    assert [r["id"] for r in cache.latest(3)][-1] == "alert-003"
+
+
+def test_latest_defers_to_the_database_when_it_cannot_answer_exactly():
+    cache = LatestAlertsCache(capacity=3)
+    assert cache.latest(1) is None  # Not warmed yet
+
+    cache.warm([_row(1)])
+    assert [r["id"] for r in cache.latest(10)] == ["alert-001"]  # Everything there is
+
+    cache.add_many([_row(i) for i in range(2, 6)])
+    assert cache.latest(4) is None  # alert-001 and alert-002 were evicted
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_update_changes_cached_fields_only():
+    cache = LatestAlertsCache(capacity=2)
+    cache.warm([_row(1)])
+    assert cache.update("alert-001", status="TRIAGED", value={"ignored": True})
+    assert not cache.update("alert-404", status="TRIAGED")
+    assert cache.latest(1)[0]["status"] == "TRIAGED"
+    assert "value" not in cache.latest(1)[0]
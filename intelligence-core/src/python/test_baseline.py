@@ -0,0 +1,93 @@
+# intelligence-core/src/python/test_baseline.py
+import numpy as np
+import pytest
+
+from baseline import BASELINE_FEATURE_DIM, NodeBaselines, baseline_signal
+from features import FeatureSchemaRegistry
+
+
+def test_streaming_statistics_track_the_distribution():
+    rng = np.random.default_rng(0)
+    samples = rng.lognormal(0.0, 1.0, 20000)
+    baselines = NodeBaselines(max_keys=4, alpha=0.01)
+    for start in range(0, len(samples), 250):
+        baselines.observe([("node-1", "cpu_utilization")] * 250, samples[start:start + 250])
+
+    state = baselines.get(("node-1", "cpu_utilization"))
+    assert state["count"] == len(samples)
+    median, p99 = np.quantile(samples, [0.5, 0.99])
+    assert state["quantiles"]["0.5"] == pytest.approx(median, rel=0.05)
+    assert state["quantiles"]["0.99"] == pytest.approx(p99, rel=0.1)
+    assert state["ewma"] == pytest.approx(samples.mean(), rel=0.3)
+
+
+def test_batched_updates_match_one_at_a_time_and_report_the_prior_baseline():
+    rng = np.random.default_rng(1)
+    keys = [("a", "m"), ("b", "m"), ("a", "m")] * 20
+    signal = rng.normal(10.0, 2.0, len(keys))
+    batched, sequential = NodeBaselines(max_keys=4), NodeBaselines(max_keys=4)
+
+    features = batched.observe(keys, signal)
+    for key, value in zip(keys, signal):
+        sequential.observe([key], np.array([value]))
+    assert batched.get(("a", "m")) == sequential.get(("a", "m"))
+    assert list(features.count[:4]) == [0, 0, 1, 2]  # Each row sees the state before itself
+    assert features.feature_matrix().shape == (len(keys), BASELINE_FEATURE_DIM)
+
+
+def test_memory_is_bounded_by_lru_eviction_and_nan_signals_are_skipped():
+    baselines = NodeBaselines(max_keys=2)
+    baselines.observe([("n1", "m"), ("n2", "m")], np.array([1.0, 2.0]))
+    baselines.observe([("n1", "m")], np.array([1.0]))  # n2 is now least recently seen
+    baselines.observe([("n3", "m"), ("n4", "m")], np.array([3.0, np.nan]))
+    assert len(baselines) == 2 and baselines.stats()["evictions"] == 1
+    assert baselines.get(("n2", "m")) is None and baselines.get(("n4", "m")) is None
+    assert baselines.get(("n1", "m"))["count"] == 2
+
+
+def test_a_batch_with_more_keys_than_slots_never_shares_a_slot():
+    rng = np.random.default_rng(4)
+    keys = [("a", "m"), ("b", "m"), ("c", "m"), ("a", "m"), ("c", "m"), ("b", "m")] * 10
+    signal = rng.normal(10.0, 2.0, len(keys))
+    baselines = NodeBaselines(max_keys=2)
+    features = baselines.observe(keys, signal)
+
+    for name in "ab":  # The first two keys keep their own state
+        alone = NodeBaselines(max_keys=2)
+        alone.observe([k for k in keys if k[0] == name], signal[[k[0] == name for k in keys]])
+        assert baselines.get((name, "m")) == alone.get((name, "m"))
+    cold = [k[0] == "c" for k in keys]
+    assert baselines.get(("c", "m")) is None and not features.count[cold].any()
+    assert baselines.stats()["observations"] == len(keys) - sum(cold)
+
+
+def test_outliers_need_a_warm_baseline():
+    rng = np.random.default_rng(2)
+    history = rng.normal(50.0, 2.0, 200)
+    for warmup, expected in ((30, [False, True]), (1000, [False, False])):
+        baselines = NodeBaselines(max_keys=4, warmup=warmup)
+        baselines.observe([("n", "m")] * len(history), history)
+        features = baselines.observe([("n", "m")] * 2, np.array([51.0, 500.0]))
+        assert list(baselines.outliers(features, 6.0)) == expected
+        assert baselines.stats()["outliers_flagged"] == sum(expected)
+
+
+def test_snapshot_and_restore_round_trip(tmp_path):
+    rng = np.random.default_rng(3)
+    baselines = NodeBaselines(max_keys=8)
+    baselines.observe([("n1", "cpu"), ("n2", "cpu")] * 50, rng.normal(5.0, 1.0, 100))
+    path = str(tmp_path / "baselines.npz")
+    baselines.snapshot(path)
+
+    restored = NodeBaselines(max_keys=8)
+    assert restored.restore(path) == 2
+    assert restored.get(("n1", "cpu")) == baselines.get(("n1", "cpu"))
+    with pytest.raises(ValueError):
+        NodeBaselines(max_keys=8, quantiles=(0.9,)).restore(path)
+
+
+def test_signal_is_the_first_registered_field_present():
+    registry = FeatureSchemaRegistry({"cpu_utilization": ("cpu_percent", "load_1m")})
+    signal = baseline_signal(registry, ["cpu_utilization", "cpu_utilization", "unknown"],
+                             [{"load_1m": 2.5, "cpu_percent": 90}, {"load_1m": 1.5}, {"cpu_percent": 10}])
+    assert signal[0] == 90.0 and signal[1] == 1.5 and np.isnan(signal[2])
@@ -0,0 +1,69 @@
+# intelligence-core/src/python/test_batching.py
+import asyncio
+
+import pytest
+
+from batching import MicroBatcher, QueueFullError
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_are_coalesced():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=50)
+    await batcher.start()
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+    await batcher.stop()
+
+    assert results == [i * 2 for i in range(20)]
+    assert [len(c) for c in calls] == [8, 8, 4]
+    stats = batcher.stats()
+    assert stats["batch_size"]["count"] == 3
+    assert stats["queue_latency_ms"]["count"] == 20
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_dispatched_after_max_wait():
+    batcher = MicroBatcher(lambda items: list(items), max_batch_size=64, max_wait_ms=10)
+    await batcher.start()
+    result = await asyncio.wait_for(batcher.submit("x"), timeout=1.0)
+    await batcher.stop()
+    assert result == "x"
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_propagates_to_every_caller():
+    def batch_fn(items):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=20)
+    await batcher.start()
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+    await batcher.stop()
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_submit_requires_running_batcher():
+    batcher = MicroBatcher(lambda items: items)
+    with pytest.raises(RuntimeError):
+        await batcher.submit(1)
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_sheds_load():
+    batcher = MicroBatcher(lambda items: list(items), max_batch_size=1, max_wait_ms=0, max_queue_size=2)
+    await batcher.start()
+    # Fill the queue without yielding, so the dispatcher cannot drain it in between.
+    batcher._queue.put_nowait(("a", asyncio.get_running_loop().create_future(), 0.0))
+    batcher._queue.put_nowait(("b", asyncio.get_running_loop().create_future(), 0.0))
+    with pytest.raises(QueueFullError):
+        await batcher.submit("c")
+    with pytest.raises(QueueFullError):
+        await batcher.submit_many(["d"])
+    await batcher.stop()
+    assert batcher.stats()["shed"] == 2
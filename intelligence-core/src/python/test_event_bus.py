@@ -0,0 +1,89 @@
+# intelligence-core/src/python/test_event_bus.py
+import asyncio
+
+import pytest
+
+from event_bus import AlertEventBus, EventFilter, SubscriberOverrun, OVERRUN_DROP, OVERRUN_SKIP
+
+
+def _alert(i, severity="HIGH", node="node-1", metric="cpu_utilization"):
+    return {"id": f"alert-{i}", "severity": severity, "source_node_id": node, "metric_name": metric}
+
+
+async def _collect(subscription, n, timeout=1.0):
+    items = []
+
+    async def run():
+        async for item in subscription:
+            items.append(item)
+            if len(items) == n:
+                return
+    await asyncio.wait_for(run(), timeout)
+    return items
+
+
+@pytest.mark.asyncio
+async def test_every_subscriber_sees_new_events_with_its_own_cursor():
+    bus = AlertEventBus(capacity=16)
+    bus.publish(_alert(0))  # Before subscribing: not delivered without resume_after
+    first, second = bus.subscribe(), bus.subscribe()
+    consumers = [asyncio.create_task(_collect(s, 3)) for s in (first, second)]
+    await asyncio.sleep(0)
+    bus.publish_many([_alert(i) for i in range(1, 4)])
+    for items in await asyncio.gather(*consumers):
+        assert [seq for seq, _ in items] == [2, 3, 4]
+        assert [event["id"] for _, event in items] == ["alert-1", "alert-2", "alert-3"]
+    assert bus.stats()["published"] == 4
+
+
+@pytest.mark.asyncio
+async def test_filters_are_applied_server_side():
+    bus = AlertEventBus(capacity=64)
+    subscription = bus.subscribe(EventFilter(min_severity="HIGH", source_node_ids=["node-7"], metric_names=["auth_events"]))
+    bus.publish_many([
+        _alert(0, severity="CRITICAL", node="node-7", metric="auth_events"),
+        _alert(1, severity="LOW", node="node-7", metric="auth_events"),
+        _alert(2, severity="HIGH", node="node-1", metric="auth_events"),
+        _alert(3, severity="HIGH", node="node-7", metric="cpu_utilization"),
+        _alert(4, severity="HIGH", node="node-7", metric="auth_events"),
+    ])
+    items = await _collect(subscription, 2)
+    assert [event["id"] for _, event in items] == ["alert-0", "alert-4"]
+    assert EventFilter(severities=["LOW"]).matches(_alert(0, severity="LOW"))
+    assert not EventFilter(severities=["LOW"]).matches(_alert(0, severity="HIGH"))
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_skips_overwritten_events():
+    bus = AlertEventBus(capacity=4)
+    subscription = bus.subscribe(policy=OVERRUN_SKIP)
+    bus.publish_many([_alert(i) for i in range(10)])  # Sequences 1-10; only 7-10 retained
+    items = await _collect(subscription, 4)
+    assert [seq for seq, _ in items] == [7, 8, 9, 10]
+    assert subscription.skipped == 6 and bus.stats()["skipped_events"] == 6
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_dropped_and_can_resume():
+    bus = AlertEventBus(capacity=4)
+    subscription = bus.subscribe(policy=OVERRUN_DROP)
+    bus.publish_many([_alert(i) for i in range(3)])
+    assert [seq for seq, _ in await subscription.next_batch()] == [1, 2, 3]
+    bus.publish_many([_alert(i) for i in range(3, 10)])
+    with pytest.raises(SubscriberOverrun) as excinfo:
+        await subscription.next_batch()
+    assert excinfo.value.missed == 3 and excinfo.value.resume_after == 3
+    assert bus.stats()["subscribers"] == 0 and bus.stats()["dropped_subscribers"] == 1
+
+    resumed = bus.subscribe(resume_after=7)
+    assert [seq for seq, _ in await resumed.next_batch()] == [8, 9, 10]
+
+
+@pytest.mark.asyncio
+async def test_close_ends_waiting_subscribers():
+    bus = AlertEventBus(capacity=4)
+    subscription = bus.subscribe()
+    waiter = asyncio.create_task(_collect(subscription, 1))
+    await asyncio.sleep(0)
+    bus.close()
+    assert await waiter == []
@@ -0,0 +1,48 @@
+# intelligence-core/src/python/test_features.py
+import numpy as np
+import pytest
+
+from features import FeatureSchemaRegistry, TelemetryFeaturizer, FEATURE_DIM
+
+
+@pytest.fixture
+def featurizer():
+    registry = FeatureSchemaRegistry({"cpu_utilization": ("cpu_percent", "load_1m")}, schema_slots=8)
+    return TelemetryFeaturizer(registry, feature_dim=32)
+
+
+def test_schema_fields_land_in_registered_slots(featurizer):
+    out = featurizer.transform(["cpu_utilization"], [{"cpu_percent": 95.0, "load_1m": 0.0}])
+    assert out.dtype == np.float32 and out.shape == (1, 32)
+    assert out[0, 0] == pytest.approx(np.log1p(95.0))
+    assert np.count_nonzero(out) == 1
+
+
+def test_unknown_and_string_keys_are_hashed_deterministically(featurizer):
+    batch = [{"mystery": 3.0, "state": "RUNNING"}]
+    first = featurizer.transform(["cpu_utilization"], batch)
+    second = TelemetryFeaturizer(featurizer.registry, feature_dim=32).transform(["cpu_utilization"], batch)
+    np.testing.assert_array_equal(first, second)
+    assert not first[0, :8].any()
+    assert np.count_nonzero(first[0, 8:]) >= 1
+
+
+def test_fills_preallocated_output(featurizer):
+    out = np.full((2, 32), 7.0, dtype=np.float32)
+    result = featurizer.transform(["cpu_utilization", "unregistered"], [{"cpu_percent": 1.0}, {}], out=out)
+    assert result is out
+    assert not out[1].any()
+    with pytest.raises(ValueError):
+        featurizer.transform(["cpu_utilization"], [{}], out=np.zeros((1, 31), dtype=np.float32))
+
+
+def test_default_layout_matches_model_width():
+    out = TelemetryFeaturizer().transform(["network_bytes_in"], [{"bytes": 1000000, "flag": True, "nested": {"a": 1}}])
+    assert out.shape == (1, FEATURE_DIM)
+
+
+def test_reserved_slots_are_left_for_the_caller():
+    featurizer = TelemetryFeaturizer(reserved_slots=4)
+    out = featurizer.transform(["network_bytes_in"], [{f"k{i}": i + 1 for i in range(200)}])
+    assert featurizer.hashed_slots == FEATURE_DIM - 4 - featurizer.hashed_offset
+    assert not out[:, FEATURE_DIM - 4:].any()
@@ -0,0 +1,92 @@
+# intelligence-core/src/python/test_generation.py
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from generation import ContinuousBatchScheduler, GenerationMetrics, GenerationParams  # noqa: E402
+
+VOCAB = 97
+
+
+class CountingModel(torch.nn.Module):
+    """A recurrent toy: the next token depends on the last token and how many came before it."""
+    def init_state(self, batch_size):
+        return torch.zeros(batch_size, 1)
+
+    def forward(self, tokens, state, last_only=True):
+        state = state + tokens.shape[1]
+        following = (tokens[:, -1] * 7 + state[:, 0].long()) % VOCAB
+        return torch.nn.functional.one_hot(following, VOCAB).float(), state
+
+
+def _expected(prompt, max_tokens):
+    seen, token, out = len(prompt), prompt[-1], []
+    for _ in range(max_tokens):
+        token = (token * 7 + seen) % VOCAB
+        out.append(token)
+        seen += 1
+    return out
+
+
+def _run(scheduler, max_steps=1000):
+    outputs, finished, steps = {}, [], 0
+    while len(scheduler) and steps < max_steps:
+        for request_id, token, done in scheduler.step():
+            outputs.setdefault(request_id, []).append(token)
+            if done:
+                finished.append(request_id)
+        steps += 1
+    return outputs, finished
+
+
+def test_batched_generation_matches_each_sequence_alone():
+    scheduler = ContinuousBatchScheduler(CountingModel(), max_batch_size=3, prefill_chunk=4)
+    prompts = {f"r{i}": list(range(1 + i, 4 + 3 * i)) for i in range(5)}
+    for request_id, prompt in prompts.items():
+        scheduler.submit(request_id, prompt, GenerationParams(max_tokens=3 + int(request_id[1:])))
+    outputs, finished = _run(scheduler)
+    assert sorted(finished) == sorted(prompts)
+    for request_id, prompt in prompts.items():
+        assert outputs[request_id] == _expected(prompt, 3 + int(request_id[1:]))
+
+
+def test_new_requests_join_between_decode_steps():
+    scheduler = ContinuousBatchScheduler(CountingModel(), max_batch_size=4)
+    scheduler.submit("long", [5], GenerationParams(max_tokens=20))
+    first = [scheduler.step() for _ in range(3)]
+    scheduler.submit("late", [9, 9], GenerationParams(max_tokens=2))
+    events = scheduler.step()
+    assert {request_id for request_id, _, _ in events} == {"long", "late"}  # Admitted without waiting for "long"
+    outputs, _ = _run(scheduler)
+    long_tokens = [t for step in first for _, t, _ in step] + [t for r, t, _ in events if r == "long"] + outputs["long"]
+    assert long_tokens == _expected([5], 20)
+
+
+def test_eos_cancel_and_sampling():
+    scheduler = ContinuousBatchScheduler(CountingModel(), max_batch_size=2)
+    expected = _expected([3], 10)
+    scheduler.submit("eos", [3], GenerationParams(max_tokens=10, eos_token_id=expected[2]))
+    scheduler.submit("gone", [4], GenerationParams(max_tokens=10))
+    scheduler.step()
+    assert scheduler.cancel("gone") and not scheduler.cancel("unknown")
+    outputs, finished = _run(scheduler)
+    assert finished == ["eos"] and outputs["eos"] == [expected[2]]  # The first step emitted the first two
+
+    sampled = ContinuousBatchScheduler(CountingModel())
+    sampled.submit("s", [1], GenerationParams(max_tokens=5, temperature=0.5, top_k=1, seed=0))
+    assert _run(sampled)[0]["s"] == _expected([1], 5)  # top_k=1 is greedy
+
+
+def test_params_and_metrics():
+    params = GenerationParams.from_dict({"max_tokens": 7, "temperature": None, "unrelated": 1})
+    assert (params.max_tokens, params.temperature) == (7, 0.0)
+    with pytest.raises(ValueError):
+        GenerationParams(max_tokens=0)
+
+    metrics = GenerationMetrics()
+    metrics.submitted("a")
+    for i in range(4):
+        metrics.token("a", finished=i == 3)
+    stats = metrics.stats()
+    assert stats["tokens_generated"] == 4 and stats["requests_finished"] == 1 and stats["in_flight"] == 0
+    assert stats["time_to_first_token_ms"]["count"] == 1 and stats["inter_token_ms"]["count"] == 3
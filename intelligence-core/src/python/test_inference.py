@@ -0,0 +1,53 @@
+# intelligence-core/src/python/test_inference.py
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from inference import CPUExecutor, GenerationError  # noqa: E402
+from test_generation import CountingModel, _expected  # noqa: E402
+
+
+@pytest.fixture
+def executor(tmp_path):
+    path = str(tmp_path / "model.pt")
+    torch.save(CountingModel(), path)
+    executor = CPUExecutor(path, world_size=2, threads_per_worker=1, max_batch_size=4)
+    yield executor
+    executor.shutdown()
+
+
+def test_cpu_executor_streams_and_executes(executor):
+    streams = {f"r{i}": executor.stream(f"r{i}", [i + 1, i + 2], {"max_tokens": 6}) for i in range(3)}
+    for request_id, stream in streams.items():
+        i = int(request_id[1:])
+        assert list(stream) == _expected([i + 1, i + 2], 6)
+    stats = executor.metrics.stats()
+    assert stats["tokens_generated"] == 18 and stats["requests_finished"] == 3
+    assert stats["time_to_first_token_ms"]["count"] == 3
+
+    assert executor.execute("shards", [[1.0, 2.0], [3.0]]) == [[2.0, 4.0], [6.0]]
+
+
+def test_cpu_executor_reports_bad_requests(executor):
+    with pytest.raises(GenerationError):
+        list(executor.stream("empty", [], {"max_tokens": 2}))
+    stream = executor.stream("early", [1], {"max_tokens": 1000})
+    assert next(stream) == _expected([1], 1)[0]
+    stream.close()  # Cancels the rest in the worker
+    assert list(executor.stream("after", [2], {"max_tokens": 2})) == _expected([2], 2)
+
+
+def test_cpu_executor_returns_shard_errors(executor):
+    results = executor.execute("bad", [["not", "numbers"], ["not", "numbers"]])
+    assert all("error" in result for result in results)
+    assert executor.execute("good", [[1.0], [2.0]]) == [[2.0], [4.0]]
+
+
+def test_cpu_executor_fails_requests_when_a_worker_cannot_start(tmp_path):
+    executor = CPUExecutor(str(tmp_path / "missing.pt"), world_size=1, threads_per_worker=1)
+    try:
+        assert "error" in executor.execute("shards", [[1.0]])[0]
+        with pytest.raises(GenerationError):
+            list(executor.stream("r", [1], {"max_tokens": 2}))
+    finally:
+        executor.shutdown()
@@ -0,0 +1,315 @@
+# intelligence-core/src/python/test_ingest.py
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from confluent_kafka import KafkaError, KafkaException
+
+from ingest import TelemetryIngestPool
+
+
+# --- In-process stand-in for a Kafka broker and consumer group ---
+
+class FakeMessage:
+    def __init__(self, topic, partition, offset, value):
+        self._topic, self._partition, self._offset, self._value = topic, partition, offset, value
+
+    def error(self):
+        return None
+
+    def topic(self):
+        return self._topic
+
+    def partition(self):
+        return self._partition
+
+    def offset(self):
+        return self._offset
+
+    def value(self):
+        return self._value
+
+
+class FakeBroker:
+    def __init__(self, topic, partitions):
+        self.topic = topic
+        self.logs = {p: [] for p in range(partitions)}
+        self.committed = {}
+        self.members = []
+        self.lock = threading.Lock()
+
+    def produce(self, partition, payload: bytes):
+        with self.lock:
+            self.logs[partition].append(payload)
+
+    def join(self, consumer):
+        with self.lock:
+            self.members.append(consumer)
+            for idx, member in enumerate(self.members):  # Round-robin rebalance
+                member.assigned = [p for p in self.logs if p % len(self.members) == idx]
+
+
+class FakeConsumer:
+    def __init__(self, broker):
+        self.broker = broker
+        self.assigned = []
+        self.paused = set()
+        self.positions = {}
+        self.prefetched = []
+        self.closed = False
+
+    def list_topics(self, topic, timeout=None):
+        partitions = {p: None for p in self.broker.logs}
+        return SimpleNamespace(topics={topic: SimpleNamespace(partitions=partitions)})
+
+    def subscribe(self, topics):
+        self.broker.join(self)
+
+    def assignment(self):
+        return [SimpleNamespace(topic=self.broker.topic, partition=p) for p in self.assigned]
+
+    def pause(self, partitions):
+        self.paused.update(tp.partition for tp in partitions)
+
+    def resume(self, partitions):
+        self.paused.difference_update(tp.partition for tp in partitions)
+
+    def poll(self, timeout=None):
+        return self.prefetched.pop(0) if self.prefetched else None
+
+    def consume(self, num_messages=1, timeout=-1):
+        out = []
+        with self.broker.lock:
+            for p in self.assigned:
+                if p in self.paused:
+                    continue
+                pos = self.positions.get(p, self.broker.committed.get(p, 0))
+                log = self.broker.logs[p]
+                while pos < len(log) and len(out) < num_messages:
+                    out.append(FakeMessage(self.broker.topic, p, pos, log[pos]))
+                    pos += 1
+                self.positions[p] = pos
+        if not out:
+            time.sleep(min(timeout, 0.01))
+        return out
+
+    def seek(self, tp):
+        self.positions[tp.partition] = tp.offset
+
+    def commit(self, offsets=None, asynchronous=True):
+        with self.broker.lock:
+            for tp in offsets:
+                self.broker.committed[tp.partition] = tp.offset
+
+    def get_watermark_offsets(self, tp, timeout=None, cached=False):
+        return 0, len(self.broker.logs[tp.partition])
+
+    def close(self):
+        self.closed = True
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _record(i):
+    return json.dumps({"source_node_id": f"node-{i % 3}", "metric_name": "cpu_utilization", "value": {"cpu_percent": i}}).encode()
+
+
+@pytest.fixture
+def broker():
+    return FakeBroker("omega_telemetry", partitions=4)
+
+
+def test_pool_persists_batches_and_commits_offsets(broker):
+    persisted = []
+
+    def process_batch(records):
+        persisted.extend(records)
+        return len(records)
+
+    for i in range(100):
+        broker.produce(i % 4, _record(i))
+    broker.produce(0, b"{not json")
+
+    pool = TelemetryIngestPool(lambda: FakeConsumer(broker), broker.topic, process_batch, partitions_per_worker=2, batch_size=16, poll_timeout=0.01)
+    pool.start()
+    consumers = [worker.consumer for worker in pool.workers]
+    try:
+        assert len(consumers) == 2
+        assert _wait_for(lambda: broker.committed == {0: 26, 1: 25, 2: 25, 3: 25})
+    finally:
+        pool.stop()
+
+    assert len(persisted) == 100
+    stats = pool.stats.snapshot()
+    assert stats["messages"] == 101
+    assert stats["decode_errors"] == 1
+    assert stats["records_persisted"] == 100
+    assert stats["total_lag"] == 0
+    assert stats["commit_latency_ms"]["count"] == stats["batches"]
+    assert all(consumer.closed for consumer in consumers)
+
+
+def test_offsets_not_committed_when_processing_fails(broker):
+    attempts = []
+
+    def process_batch(records):
+        attempts.append(len(records))
+        if len(attempts) == 1:
+            raise RuntimeError("database unavailable")
+        return len(records)
+
+    for i in range(5):
+        broker.produce(0, _record(i))
+
+    pool = TelemetryIngestPool(lambda: FakeConsumer(broker), broker.topic, process_batch, partitions_per_worker=4, batch_size=10, poll_timeout=0.01)
+    pool.start()
+    try:
+        assert _wait_for(lambda: broker.committed.get(0) == 5)
+    finally:
+        pool.stop()
+
+    assert attempts[:2] == [5, 5]  # Failed batch was redelivered in full
+    assert pool.stats.snapshot()["processing_errors"] == 1
+
+
+def test_backpressure_pauses_partitions_when_in_flight_budget_exhausted(broker):
+    release = threading.Event()
+
+    def process_batch(records):
+        release.wait(timeout=5)
+        return len(records)
+
+    for i in range(40):
+        broker.produce(i % 4, _record(i))
+
+    pool = TelemetryIngestPool(lambda: FakeConsumer(broker), broker.topic, process_batch, partitions_per_worker=1, batch_size=5, poll_timeout=0.01, max_in_flight_batches=1)
+    pool.start()
+    try:
+        assert _wait_for(lambda: pool.stats.snapshot()["backpressure_pauses"] > 0)
+        release.set()
+        assert _wait_for(lambda: sum(broker.committed.values()) == 40)
+    finally:
+        release.set()
+        pool.stop()
+
+
+def test_message_polled_during_backpressure_is_processed(broker):
+    persisted = []
+    release = threading.Event()
+
+    def process_batch(records):
+        release.wait(timeout=5)
+        persisted.extend(records)
+        return len(records)
+
+    for i in range(6):
+        broker.produce(0, _record(i))
+
+    class PrefetchingConsumer(FakeConsumer):
+        def pause(self, partitions):
+            # librdkafka may already hold fetched messages when the partition is paused.
+            super().pause(partitions)
+            with self.broker.lock:
+                pos = self.positions.get(0, 0)
+                if pos < len(self.broker.logs[0]):
+                    self.prefetched.append(FakeMessage(self.broker.topic, 0, pos, self.broker.logs[0][pos]))
+                    self.positions[0] = pos + 1
+
+    pool = TelemetryIngestPool(lambda: PrefetchingConsumer(broker), broker.topic, process_batch, partitions_per_worker=4, batch_size=2, poll_timeout=0.01, max_in_flight_batches=0)
+    pool.start()
+    try:
+        consumer = pool.workers[0].consumer
+        assert _wait_for(lambda: pool.stats.snapshot()["backpressure_pauses"] > 0 and not consumer.prefetched)
+        pool._in_flight.release()
+        release.set()
+        assert _wait_for(lambda: broker.committed.get(0) == 6)
+    finally:
+        release.set()
+        pool.stop()
+
+    assert persisted == [json.loads(_record(i)) for i in range(6)]
+
+
+def test_worker_survives_a_commit_failed_by_a_rebalance(broker):
+    persisted = []
+
+    def process_batch(records):
+        persisted.extend(records)
+        return len(records)
+
+    class RebalancingConsumer(FakeConsumer):
+        failures = 1
+
+        def commit(self, offsets=None, asynchronous=True):
+            if self.failures:
+                self.failures -= 1
+                raise KafkaException(KafkaError(KafkaError.REBALANCE_IN_PROGRESS))
+            super().commit(offsets, asynchronous)
+
+    broker.produce(0, _record(0))
+    pool = TelemetryIngestPool(lambda: RebalancingConsumer(broker), broker.topic, process_batch, partitions_per_worker=4, poll_timeout=0.01)
+    pool.start()
+    try:
+        assert not _wait_for(lambda: 0 in broker.committed, timeout=0.2)
+        broker.produce(0, _record(1))  # The next commit covers both offsets
+        assert _wait_for(lambda: broker.committed.get(0) == 2)
+        assert pool.workers[0].is_alive()
+    finally:
+        pool.stop()
+
+    assert len(persisted) == 2
+    assert pool.stats.snapshot()["offset_errors"] == 1
+
+
+def test_failed_batches_are_retried_with_backoff(broker):
+    attempts = []
+
+    def process_batch(records):
+        attempts.append(time.monotonic())
+        raise RuntimeError("database unavailable")
+
+    broker.produce(0, _record(0))
+    pool = TelemetryIngestPool(
+        lambda: FakeConsumer(broker), broker.topic, process_batch, partitions_per_worker=4, poll_timeout=0.01,
+        retry_backoff=0.05, max_retry_backoff=0.2,
+    )
+    pool.start()
+    try:
+        assert _wait_for(lambda: len(attempts) >= 5)
+    finally:
+        stopping = time.monotonic()
+        pool.stop()
+    assert time.monotonic() - stopping < 1.0  # The backoff wait ends on stop
+
+    gaps = [b - a for a, b in zip(attempts, attempts[1:])]
+    assert gaps[0] >= 0.05 and gaps[2] >= 0.2 and max(gaps) < 0.5
+    assert 0 not in broker.committed
+
+
+def test_worker_keeps_running_after_an_unexpected_error(broker):
+    class FlakyConsumer(FakeConsumer):
+        failures = 1
+
+        def consume(self, num_messages=1, timeout=-1):
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("broker transport failure")
+            return super().consume(num_messages, timeout)
+
+    broker.produce(0, _record(0))
+    pool = TelemetryIngestPool(lambda: FlakyConsumer(broker), broker.topic, lambda records: len(records), partitions_per_worker=4, poll_timeout=0.01)
+    pool.start()
+    try:
+        assert _wait_for(lambda: broker.committed.get(0) == 1)
+    finally:
+        pool.stop()
@@ -0,0 +1,106 @@
+# intelligence-core/src/python/test_julia_client.py
+import asyncio
+import json
+import struct
+
+import pytest
+
+from julia_client import JuliaComputeClient
+
+
+# --- Python stand-in for the Julia TCP server (intelligence-core/src/julia/main.jl) ---
+
+class FakeJuliaServer:
+    """Speaks the length-prefixed JSON protocol; SLOW commands answer after faster ones."""
+    def __init__(self):
+        self.connections = 0
+        self.requests = []
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                (length,) = struct.unpack("!I", await reader.readexactly(4))
+                request = json.loads(await reader.readexactly(length))
+                self.requests.append(request)
+                task = asyncio.create_task(self._respond(request, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request, writer, lock):
+        command = request["command"]
+        if command == "SLOW":
+            await asyncio.sleep(0.05)
+        if command == "PING":
+            response = {"result": "PONG"}
+        elif command == "BIG":
+            response = {"result": "x" * request["size"]}
+        else:
+            response = {"result": {"echo": request.get("payload")}}
+        response["correlation_id"] = request["correlation_id"]
+        body = json.dumps(response).encode()
+        async with lock:
+            writer.write(struct.pack("!I", len(body)) + body)
+            await writer.drain()
+
+
+@pytest.mark.asyncio
+async def test_pipelined_requests_are_matched_by_correlation_id():
+    async with FakeJuliaServer() as server:
+        client = JuliaComputeClient("127.0.0.1", server.port, pool_size=1, health_check_interval=0)
+        await client.start()
+        slow = asyncio.create_task(client.send_command({"command": "SLOW", "payload": "slow"}))
+        fast = await asyncio.gather(*(client.send_command({"command": "ECHO", "payload": i}) for i in range(20)))
+        assert [r["result"]["echo"] for r in fast] == list(range(20))
+        assert (await slow)["result"]["echo"] == "slow"
+        assert server.connections == 1  # Everything was pipelined on one socket
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_large_frames_span_multiple_reads():
+    async with FakeJuliaServer() as server:
+        client = JuliaComputeClient("127.0.0.1", server.port, pool_size=2, health_check_interval=0)
+        await client.start()
+        responses = await asyncio.gather(*(client.send_command({"command": "BIG", "size": 300_000 + i}) for i in range(4)))
+        assert [len(r["result"]) for r in responses] == [300_000 + i for i in range(4)]
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_server_drops_connection_and_health_check_pings():
+    async with FakeJuliaServer() as server:
+        client = JuliaComputeClient("127.0.0.1", server.port, pool_size=1, health_check_interval=0)
+        await client.start()
+        client._connections[0].close()
+        await asyncio.sleep(0)
+        response = await client.send_command({"command": "ECHO", "payload": "again"})
+        assert response["result"]["echo"] == "again"
+        await client.check_health()
+        assert server.requests[-1]["command"] == "PING"
+        assert client.connected == 1
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_server_returns_none():
+    client = JuliaComputeClient("127.0.0.1", 1, pool_size=1, connect_timeout=0.5, health_check_interval=0)
+    await client.start()
+    assert await client.send_command({"command": "ECHO"}) is None
+    await client.close()
@@ -3,22 +3,35 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from unittest.mock import MagicMock, patch
+from sqlalchemy.pool import StaticPool
+from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
 import json
 import time
 import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import main
 
 # Import the main application and its components
 from main import app, get_db, Base, AnomalyAlertDB, TelemetryData, AnomalyAlertResponse
-from main import anomaly_detector, llm_analyzer, julia_client, telemetry_consumer # Global instances for patching
 from main import IntelligenceCoreServicer # gRPC servicer
+from main import AnomalyDetectionService # Imported before the fixtures patch it
+from baseline import NodeBaselines
+from metrics import Histogram
+from event_bus import AlertEventBus
+from alert_cache import LatestAlertsCache
+import proto.alert_pb2 as alert_pb2
 
 # --- Mocks for external dependencies ---
 
 # 1. Database (in-memory SQLite for testing)
 @pytest.fixture(scope="module")
 def test_db_engine():
-    return create_engine("sqlite:///:memory:")
+    # One shared connection: each new connection to :memory: would open an empty database.
+    return create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
 
 @pytest.fixture(scope="module")
 def test_db_tables(test_db_engine):
@@ -32,7 +45,12 @@ def db_session(test_db_engine, test_db_tables):
     transaction = connection.begin()
     SessionTesting = sessionmaker(autocommit=False, autoflush=False, bind=connection)
     session = SessionTesting()
+    # Requests made while the test runs use the same session, so they see its uncommitted rows.
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = lambda: session
     yield session
+    if previous is not None:
+        app.dependency_overrides[get_db] = previous
     session.close()
     transaction.rollback()
     connection.close()
@@ -52,6 +70,8 @@ def client(test_db_engine, test_db_tables):
     
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as c:
+        # Startup returns once the scoring path is ready; wait for the background components too.
+        c.portal.call(main.startup.wait_all)
         yield c
     app.dependency_overrides = {}
 
@@ -61,16 +81,29 @@ def mock_anomaly_detector():
     with patch('main.AnomalyDetectionService', autospec=True) as MockDetector:
         instance = MockDetector.return_value
         instance.predict_anomaly_score.return_value = 85 # Simulate high anomaly
-        with patch('main.anomaly_detector', new=instance):
+        instance.predict_anomaly_scores.side_effect = lambda batch: np.full(len(batch), 85) # Batched scorer path
+        with patch('main.anomaly_detector', new=instance, create=True): # Assigned at startup
             yield instance
 
+# 3b. Alert write-behind buffer (captures rows instead of writing to Postgres)
+@pytest.fixture(autouse=True)
+def mock_alert_writer():
+    def commit(rows, durable=None, on_committed=None):
+        if on_committed is not None:
+            on_committed()
+    with patch('main.alert_writer', create=True) as writer:
+        writer.submit = AsyncMock(side_effect=commit)
+        writer.submit_many = AsyncMock(side_effect=commit)
+        yield writer
+
 # 4. LLM Service
 @pytest.fixture(autouse=True)
 def mock_llm_analyzer():
     with patch('main.LLMService', autospec=True) as MockLLM:
         instance = MockLLM.return_value
         instance.get_sentiment.return_value = "NEGATIVE"
-        with patch('main.llm_analyzer', new=instance):
+        instance.get_sentiments.side_effect = lambda texts: ["NEGATIVE"] * len(texts)
+        with patch('main.llm_analyzer', new=instance, create=True): # Assigned at startup
             yield instance
 
 # 5. Julia Compute Client
@@ -78,31 +111,22 @@ def mock_llm_analyzer():
 def mock_julia_client():
     with patch('main.JuliaComputeClient', autospec=True) as MockJuliaClient:
         instance = MockJuliaClient.return_value
-        instance.send_command.side_effect = [
-            {"result": {"status": "OPTIMAL", "allocated_resources": {"res1": 1}, "total_cost": 100.0}}, # For optimize_defense_resources
-            {"result": {"total_impact_score": 0.8, "time_to_compromise_seconds": 60.0}} # For analyze_attack_path_impact
-        ]
-        with patch('main.julia_client', new=instance):
+        responses = {
+            "OPTIMIZE_RESOURCES": {"result": {"status": "OPTIMAL", "allocated_resources": {"res1": 1}, "total_cost": 100.0}},
+            "ANALYZE_ATTACK_PATH": {"result": {"total_impact_score": 0.8, "time_to_compromise_seconds": 60.0}},
+        }
+        instance.send_command.side_effect = lambda command: responses[command["command"]]
+        with patch('main.julia_client', new=instance, create=True): # Assigned at startup
             yield instance
 
-# 6. Kafka Consumer
+# 6. Kafka Ingest Pool (no broker in unit tests; see test_ingest.py for the worker loop)
 @pytest.fixture(autouse=True)
-def mock_kafka_consumer():
-    with patch('main.TelemetryConsumer', autospec=True) as MockKafkaConsumer:
-        instance = MockKafkaConsumer.return_value
-        # Simulate a single message, then None
-        mock_msg_value = {
-            "source_node_id": "kafka-node-1",
-            "metric_name": "cpu_utilization",
-            "value": {"cpu_percent": 95.0},
-            "timestamp": time.time()
-        }
-        mock_msg = MagicMock()
-        mock_msg.error.return_value = None
-        mock_msg.value.return_value = json.dumps(mock_msg_value).encode('utf-8')
-        
-        instance.poll_messages.side_effect = [mock_msg, None] # First call returns msg, subsequent return None
-        with patch('main.telemetry_consumer', new=instance):
+def mock_telemetry_ingest():
+    with patch('main.TelemetryIngestPool', autospec=True) as MockIngestPool:
+        instance = MockIngestPool.return_value
+        instance.stats = MagicMock() # Set in __init__, so autospec does not see it
+        instance.stats.snapshot.return_value = {"messages": 0, "total_lag": 0}
+        with patch('main.telemetry_ingest', new=instance, create=True):
             yield instance
 
 # 7. gRPC Server (patch the servicer directly for unit tests)
@@ -115,9 +139,19 @@ def grpc_test_servicer():
 def test_health_check(client):
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.text == "Intelligence Core is healthy."
+    data = response.json()
+    assert data["status"] == "ok"
+    assert set(data["components"]) == {"partitions", "alert_writer", "anomaly_scorer", "sentiment_scorer", "julia", "telemetry_ingest", "grpc_server"}
+    assert all(c["state"] == "ready" for c in data["components"].values())
+    assert data["components"]["anomaly_scorer"]["critical"] is True
 
-def test_analyze_telemetry_data(client, db_session, mock_anomaly_detector, mock_llm_analyzer):
+def test_requests_for_components_still_loading_get_503(client):
+    with patch.object(main.startup, 'is_ready', side_effect=lambda name: name != "sentiment_scorer"):
+        response = client.post("/analyze/sentiment", json={"text": "anything"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+
+def test_analyze_telemetry_data(client, mock_anomaly_detector, mock_llm_analyzer, mock_alert_writer):
     telemetry_payload = {
         "source_node_id": "test-node-01",
         "metric_name": "network_bytes_in",
@@ -128,13 +162,123 @@ def test_analyze_telemetry_data(client, db_session, mock_anomaly_detector, mock_
     assert response.status_code == 201
     data = response.json()
 
-    mock_anomaly_detector.predict_anomaly_score.assert_called_once()
+    mock_anomaly_detector.predict_anomaly_scores.assert_called_once()
     # mock_llm_analyzer.get_sentiment.assert_called_once() # LLM is not called in this endpoint in current main.py
     
     assert data["source_node_id"] == "test-node-01"
     assert data["anomaly_score"] == 85
     assert data["severity"] == "HIGH"
-    assert db_session.query(AnomalyAlertDB).count() == 1
+    mock_alert_writer.submit.assert_awaited_once()
+    row = mock_alert_writer.submit.await_args.args[0]
+    assert row["id"] == data["alert_id"]
+    assert row["value"] == {"bytes": 1000000}
+
+def test_analyze_telemetry_batch_ndjson(client, mock_anomaly_detector, mock_alert_writer):
+    mock_anomaly_detector.score_columns.side_effect = lambda metric_names, values, source_node_ids=None: np.array([95, 40, 60])[:len(values)]
+    body = "\n".join(json.dumps({
+        "source_node_id": f"batch-node-{i}",
+        "metric_name": "cpu_utilization",
+        "value": {"cpu_percent": 10.0 * i}
+    }) for i in range(3))
+    response = client.post("/telemetry/analyze/batch", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 201
+    data = response.json()
+
+    mock_anomaly_detector.score_columns.assert_called_once()
+    assert data["count"] == 3
+    assert data["anomaly_scores"] == [95, 40, 60]
+    assert data["severities"] == ["CRITICAL", "LOW", "MEDIUM"]
+    assert len(set(data["alert_ids"])) == 3
+    mock_alert_writer.submit_many.assert_awaited_once()
+    assert [row["id"] for row in mock_alert_writer.submit_many.await_args.args[0]] == data["alert_ids"]
+
+def test_resent_telemetry_is_deduplicated(client, mock_anomaly_detector, mock_alert_writer):
+    mock_anomaly_detector.score_columns.side_effect = lambda metric_names, values, source_node_ids=None: np.full(len(values), 50)
+    now = time.time()
+    rows = [{"source_node_id": "resend-node", "metric_name": "cpu_utilization", "value": {"cpu_percent": 20.0}, "timestamp": now - 10 + i}
+            for i in range(3)]
+    headers = {"Content-Type": "application/x-ndjson"}
+    first = client.post("/telemetry/analyze/batch", content="\n".join(json.dumps(r) for r in rows[:2]), headers=headers).json()
+    assert first["duplicates"] == 0 and None not in first["alert_ids"]
+
+    # The agent reconnects and resends everything it had buffered.
+    second = client.post("/telemetry/analyze/batch", content="\n".join(json.dumps(r) for r in rows), headers=headers).json()
+    assert second["count"] == 3 and second["duplicates"] == 2
+    assert second["alert_ids"][:2] == [None, None] and second["anomaly_scores"][2] == 50
+    assert mock_anomaly_detector.score_columns.call_args.args[0] == ["cpu_utilization"] # Only the new row was scored
+
+    assert client.post("/telemetry/analyze", json=rows[0]).status_code == 409
+    node = client.get("/telemetry/admission/nodes/resend-node").json()
+    assert node["admitted"] == 3 and node["duplicate"] == 3
+
+def test_implausible_agent_timestamps_are_rejected(client, mock_alert_writer):
+    row = {"source_node_id": "skewed-node", "metric_name": "cpu_utilization", "value": {"cpu_percent": 10.0}}
+    assert client.post("/telemetry/analyze", json={**row, "timestamp": 1e20}).status_code == 422
+    body = "\n".join(json.dumps({**row, "timestamp": ts}) for ts in (time.time(), float("nan")))
+    response = client.post("/telemetry/analyze/batch", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 422 and "line 1" in response.json()["detail"]
+    mock_alert_writer.submit.assert_not_awaited()
+    mock_alert_writer.submit_many.assert_not_awaited()
+
+    with patch('main.anomaly_scorer') as scorer:
+        scorer.submit_blocking.side_effect = lambda batch: np.full(len(batch), 50)
+        stale = {**row, "timestamp": time.time() - 2 * main.settings.TELEMETRY_MAX_AGE_S}
+        assert main._ingest_telemetry_batch([stale, {**row, "timestamp": time.time()}]) == 1 # The stale record is dropped
+
+def test_kafka_batch_redelivered_after_a_failed_flush_is_scored_again(client, mock_alert_writer):
+    records = [{"source_node_id": "redelivered-node", "metric_name": "cpu_utilization", "value": {"cpu_percent": 30.0}, "timestamp": time.time()}]
+    with patch('main.anomaly_scorer') as scorer:
+        scorer.submit_blocking.side_effect = lambda batch: np.full(len(batch), 50)
+        mock_alert_writer.submit_blocking.side_effect = RuntimeError("database unavailable")
+        with pytest.raises(RuntimeError):
+            main._ingest_telemetry_batch(records) # The worker rewinds instead of committing offsets
+
+        mock_alert_writer.submit_blocking.side_effect = None
+        assert main._ingest_telemetry_batch(records) == 1 # Redelivered: scored and written, not a duplicate
+        assert main._ingest_telemetry_batch(records) == 0 # Committed, so a later resend is one
+    assert mock_alert_writer.submit_blocking.call_count == 2
+
+def test_metrics_endpoint_exposes_hot_path_histograms(client, mock_julia_client):
+    mock_julia_client.rtt_hist = Histogram("julia_rtt_ms", (1, 10)) # Owned by the real client
+    # The registry lives as long as the module-scoped app, so earlier tests' observations are counted too.
+    predicts = main.anomaly_predict_hist.snapshot()["count"]
+    batches = main.anomaly_scorer.batch_size_hist.snapshot()["count"]
+    admitted = main.admission.totals()["admitted"]
+    payload = {"source_node_id": "metrics-node", "metric_name": "cpu_utilization", "value": {"cpu_percent": 50.0}}
+    assert client.post("/telemetry/analyze", json=payload).status_code == 201
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert "# TYPE intelligence_core_anomaly_model_predict_ms histogram" in text
+    assert f"intelligence_core_anomaly_model_predict_ms_count {predicts + 1}" in text
+    assert f"intelligence_core_anomaly_scorer_batch_size_count {batches + 1}" in text
+    assert f'intelligence_core_telemetry_admission_total{{decision="admitted"}} {admitted + 1}' in text
+    assert 'intelligence_core_julia_rtt_ms_bucket{le="+Inf"} 0' in text
+
+def test_analyze_telemetry_batch_rejects_unknown_content_type(client):
+    response = client.post("/telemetry/analyze/batch", content=b"{}", headers={"Content-Type": "text/plain"})
+    assert response.status_code == 415
+
+def test_scorer_stats(client):
+    response = client.get("/telemetry/scorer/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert "batch_size" in data and "queue_latency_ms" in data
+
+def test_analyze_sentiment_is_batched(client, mock_llm_analyzer):
+    response = client.post("/analyze/sentiment", json={"text": "Credential stuffing detected on the VPN gateway."})
+    assert response.status_code == 200
+    assert response.json() == {"label": "NEGATIVE"}
+    mock_llm_analyzer.get_sentiments.assert_called_once_with(["Credential stuffing detected on the VPN gateway."])
+
+def test_analyze_sentiment_sheds_load_when_queue_is_full(client):
+    from batching import QueueFullError
+    with patch('main.sentiment_scorer.submit', new=AsyncMock(side_effect=QueueFullError("full"))):
+        response = client.post("/analyze/sentiment", json={"text": "anything"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
 
 def test_optimize_defense_resources(client, mock_julia_client):
     request_payload = {
@@ -151,6 +295,21 @@ def test_optimize_defense_resources(client, mock_julia_client):
     assert data["status"] == "OPTIMAL"
     assert data["allocated_resources"]["res1"] == 1
 
+def test_julia_results_are_cached_until_invalidated(client, mock_julia_client):
+    client.delete("/cache/julia")
+    mock_julia_client.send_command.side_effect = None
+    mock_julia_client.send_command.return_value = {"result": {"status": "OPTIMAL"}}
+    request_payload = {"threat_state": {"id": "T_Cache"}, "available_resources": [], "budget": 1.0, "objectives": {}}
+
+    assert client.post("/optimize/defense-resources", json=request_payload).json() == {"status": "OPTIMAL"}
+    assert client.post("/optimize/defense-resources", json=request_payload).json() == {"status": "OPTIMAL"}
+    assert mock_julia_client.send_command.call_count == 1
+
+    assert client.delete("/cache/julia", params={"command": "OPTIMIZE_RESOURCES"}).json() == {"invalidated": 1}
+    client.post("/optimize/defense-resources", json=request_payload)
+    assert mock_julia_client.send_command.call_count == 2
+    assert client.get("/cache/julia/stats").json()["hits"] >= 1
+
 def test_analyze_attack_path_impact(client, mock_julia_client):
     request_payload = {
         "attack_path": ["nodeA", "nodeB"],
@@ -185,27 +344,139 @@ def test_get_alert_details(client, db_session):
     assert data["alert_id"] == alert_id
     assert data["source_node_id"] == "test-node-get"
 
+def test_list_alerts_keyset_pagination_and_filters(client, db_session):
+    main.bulk_insert_alerts(db_session, [
+        _alert_row("list-a", 1), _alert_row("list-b", 2, severity="LOW"), _alert_row("list-c", 3), _alert_row("list-d", 4, node="node-2")
+    ])
+
+    first = client.get("/alerts", params={"limit": 2, "since": "2024-01-01T00:00:00"}).json()
+    assert [a["alert_id"] for a in first["alerts"]] == ["list-d", "list-c"]
+    second = client.get("/alerts", params={"limit": 2, "since": "2024-01-01T00:00:00", "page_token": first["next_page_token"]}).json()
+    assert [a["alert_id"] for a in second["alerts"]] == ["list-b", "list-a"]
+
+    filtered = client.get("/alerts", params=[("severity", "HIGH"), ("source_node_id", "node-1"), ("until", "2024-01-01T00:00:03")]).json()
+    assert [a["alert_id"] for a in filtered["alerts"]] == ["list-a"]
+    assert filtered["next_page_token"] is None
+    assert client.get("/alerts", params={"page_token": "garbage"}).status_code == 400
+
+def test_alert_lookup_is_cached_until_the_status_changes(client, db_session):
+    main.bulk_insert_alerts(db_session, [_alert_row("cached-alert", 1)])
+    with patch('main.fetch_alert', wraps=main.fetch_alert) as fetch:
+        assert client.get("/alerts/cached-alert").json()["status"] == "NEW"
+        assert client.get("/alerts/cached-alert").json()["status"] == "NEW"
+        assert fetch.call_count == 1
+
+        response = client.patch("/alerts/cached-alert", json={"status": "TRIAGED"})
+        assert response.status_code == 200 and response.json()["status"] == "TRIAGED"
+        assert client.get("/alerts/cached-alert").json()["status"] == "TRIAGED"
+        assert fetch.call_count == 2  # Re-read once by the PATCH, then served from the cache
+    assert client.patch("/alerts/nonexistent-alert", json={"status": "TRIAGED"}).status_code == 404
+    assert client.patch("/alerts/cached-alert", json={"status": "BOGUS"}).status_code == 422
+
+def test_dashboards_read_additive_rollups(client, db_session):
+    rollup = {"bucket": datetime(2024, 1, 1, 0, 1), "source_node_id": "node-1", "metric_name": "cpu", "severity": "HIGH"}
+    main.upsert_rollups(db_session, [{**rollup, "alert_count": 2, "max_score": 80}])
+    main.upsert_rollups(db_session, [  # Deltas from a later flush add up
+        {**rollup, "alert_count": 3, "max_score": 95},
+        {**rollup, "bucket": datetime(2024, 1, 1, 0, 7), "source_node_id": "node-2", "alert_count": 1, "max_score": 60},
+    ])
+    window = {"since": "2024-01-01T00:00:00", "until": "2024-01-01T01:00:00"}
+
+    series = client.get("/dashboard/alerts/timeseries", params={**window, "bucket_minutes": 5}).json()
+    assert [(p["bucket"], p["alert_count"], p["max_score"]) for p in series["points"]] == [
+        ("2024-01-01T00:00:00", 5, 95), ("2024-01-01T00:05:00", 1, 60)
+    ]
+    top = client.get("/dashboard/alerts/top-nodes", params={**window, "limit": 1}).json()
+    assert top == [{"source_node_id": "node-1", "alert_count": 5, "max_score": 95}]
+    assert client.get("/dashboard/alerts/top-nodes", params={"since": "2024-01-02T00:00:00", "until": "2024-01-01T00:00:00"}).status_code == 400
+
 def test_get_alert_details_404(client):
     response = client.get("/alerts/nonexistent-alert")
     assert response.status_code == 404
 
-def test_grpc_get_threat_intelligence(grpc_test_servicer):
-    request = alert_pb2.GetThreatIntelRequest(query="latest")
-    context_mock = MagicMock()
-    response = grpc_test_servicer.GetThreatIntelligence(request, context_mock)
-    
-    assert len(response.alerts) == 2
-    assert response.alerts[0].id == "mock-alert-1"
-    assert response.alerts[1].summary == "Suspicious activity observed."
+def _alert_row(alert_id, seconds, severity="HIGH", node="node-1"):
+    return {"id": alert_id, "timestamp": datetime(2024, 1, 1) + timedelta(seconds=seconds), "source_node_id": node,
+            "metric_name": "cpu", "value": {}, "anomaly_score": 80, "severity": severity, "status": "NEW"}
 
-def test_grpc_stream_threat_events(grpc_test_servicer):
-    request = alert_pb2.StreamThreatEventsRequest()
-    context_mock = MagicMock()
-    
-    events = []
-    for event in grpc_test_servicer.StreamThreatEvents(request, context_mock):
-        events.append(event)
-    
-    assert len(events) == 10
-    assert events[0].id == "stream-alert-0"
-    assert "Anomalous behavior" in events[5].summary
\ No newline at end of file
+@pytest.mark.asyncio
+async def test_grpc_get_threat_intelligence_serves_latest_from_cache(grpc_test_servicer):
+    cache = LatestAlertsCache(capacity=10)
+    cache.warm([_alert_row(f"alert-{i}", i) for i in range(3)])
+    with patch('main.latest_alerts', new=cache, create=True), \
+         patch.object(IntelligenceCoreServicer, '_query_page', return_value=[_alert_row("alert-0", 0)]) as query_page:
+        request = alert_pb2.GetThreatIntelRequest(query="latest", page_size=2)
+        response = await grpc_test_servicer.GetThreatIntelligence(request, MagicMock())
+        assert [a.id for a in response.alerts] == ["alert-2", "alert-1"]
+        assert response.alerts[0].severity == alert_pb2.AlertSeverity.HIGH
+        query_page.assert_not_called()
+
+        # Deeper pages use the keyset query, starting after the last row of the previous page
+        request = alert_pb2.GetThreatIntelRequest(query="latest", page_size=2, page_token=response.next_page_token)
+        response = await grpc_test_servicer.GetThreatIntelligence(request, MagicMock())
+        assert [a.id for a in response.alerts] == ["alert-0"]
+        assert response.next_page_token == ""
+        limit, before, severities, node = query_page.call_args.args
+        assert (limit, before, severities, node) == (3, (datetime(2024, 1, 1, 0, 0, 1), "alert-1"), None, "")
+
+def test_query_alerts_page_uses_keyset_order_and_filters(db_session):
+    rows = [_alert_row("a", 1), _alert_row("b", 2, severity="LOW"), _alert_row("c", 2), _alert_row("d", 3, node="node-2")]
+    main.bulk_insert_alerts(db_session, rows)
+
+    first = main.query_alerts_page(db_session, 2)
+    assert [r["id"] for r in first] == ["d", "c"]
+    second = main.query_alerts_page(db_session, 2, before=(first[-1]["timestamp"], first[-1]["id"]))
+    assert [r["id"] for r in second] == ["b", "a"]
+    assert [r["id"] for r in main.query_alerts_page(db_session, 10, severities=["HIGH", "CRITICAL"], source_node_id="node-1")] == ["c", "a"]
+
+def test_baseline_outliers_skip_the_model():
+    detector = AnomalyDetectionService("/nonexistent/model", backend="onnx", baselines=NodeBaselines(max_keys=8, warmup=30), outlier_score=99)
+    detector.model = MagicMock()
+    detector.model.predict_on_batch.side_effect = lambda features: np.full((len(features), 1), 0.1)
+    rng = np.random.default_rng(0)
+    history = [{"cpu_percent": float(v)} for v in rng.normal(40.0, 2.0, 100)]
+    detector.score_columns(["cpu_utilization"] * 100, history, ["node-1"] * 100)
+    detector.model.predict_on_batch.reset_mock()
+
+    scores = detector.score_columns(["cpu_utilization"] * 2, [{"cpu_percent": 41.0}, {"cpu_percent": 400.0}], ["node-1"] * 2)
+    assert list(scores) == [10, 99]
+    assert detector.baselines.stats()["outliers_flagged"] == 1
+    features = detector.model.predict_on_batch.call_args[0][0]
+    assert features.shape[0] == 1 and features[0, -4:].any() # Only the normal row, with its baseline columns
+
+
+@pytest.mark.asyncio
+async def test_grpc_stream_threat_events(grpc_test_servicer):
+    def row(alert_id, severity):
+        return {"id": alert_id, "timestamp": datetime(2024, 1, 1), "source_node_id": "node-1", "metric_name": "cpu",
+                "anomaly_score": 97, "severity": severity, "status": "NEW"}
+
+    with patch('main.alert_bus', new=AlertEventBus(capacity=16), create=True) as bus:
+        request = alert_pb2.StreamThreatEventsRequest(min_severity=alert_pb2.AlertSeverity.HIGH)
+        stream = grpc_test_servicer.StreamThreatEvents(request, MagicMock())
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)  # Let the servicer subscribe before anything is published
+        bus.publish_many([row("alert-low", "LOW"), row("alert-high", "HIGH")])
+
+        event = await asyncio.wait_for(first, timeout=1)
+        assert event.id == "alert-high"
+        assert event.severity == alert_pb2.AlertSeverity.HIGH
+        assert event.sequence == 2
+        assert "cpu on node-1" in event.summary
+        await stream.aclose()
+        assert bus.stats()["subscribers"] == 0
+
+def test_failed_critical_start_stops_the_started_components():
+    async def hang():
+        await asyncio.sleep(3600)
+
+    stopped = []
+    # Every start is replaced, so the module client's components and globals stay untouched.
+    with patch('main._start_partitions', AsyncMock()), patch('main._stop_partitions', lambda: stopped.append("partitions")), \
+            patch('main._start_alert_writer', AsyncMock()), patch('main._stop_alert_writer', lambda: stopped.append("alert_writer")), \
+            patch('main._start_anomaly_scorer', AsyncMock(side_effect=RuntimeError("model missing"))), \
+            patch('main._start_sentiment_scorer', hang), patch('main._start_julia', hang), patch('main._start_grpc_server', hang), \
+            patch('main.startup', main.startup): # Restores the module client's orchestrator
+        with pytest.raises(RuntimeError, match="anomaly_scorer"):
+            with TestClient(app):
+                pass
+    assert stopped == ["alert_writer", "partitions"]
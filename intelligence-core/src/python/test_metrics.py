@@ -0,0 +1,39 @@
+# intelligence-core/src/python/test_metrics.py
+from metrics import CallbackMetric, Histogram, MetricsRegistry
+
+
+def test_histograms_render_in_prometheus_text_format():
+    registry = MetricsRegistry(namespace="ic")
+    latency = registry.histogram("predict_ms", (1, 10), "Predict time")
+    for value in (0.5, 4, 4, 50):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP ic_predict_ms Predict time", "# TYPE ic_predict_ms histogram"]
+    assert lines[2:] == [
+        'ic_predict_ms_bucket{le="1"} 1',
+        'ic_predict_ms_bucket{le="10"} 3',
+        'ic_predict_ms_bucket{le="+Inf"} 4',
+        "ic_predict_ms_sum 58.5",
+        "ic_predict_ms_count 4",
+    ]
+
+
+def test_collectors_are_read_on_every_scrape():
+    registry = MetricsRegistry()
+    totals = {"admitted": 3, "shed": 1}
+    components = []
+    registry.add_collector(lambda: components)
+
+    assert registry.render() == "\n"
+    components.extend([
+        CallbackMetric("admission_total", lambda: totals, "counter", label="decision"),
+        CallbackMetric("consumer-lag", lambda: float("inf")),
+        Histogram("flush_size", (1,)),
+        None,  # A component that is switched off
+    ])
+    text = registry.render()
+    assert 'admission_total{decision="shed"} 1' in text
+    assert "# TYPE admission_total counter" in text
+    assert "consumer_lag +Inf" in text
+    assert 'flush_size_bucket{le="+Inf"} 0' in text
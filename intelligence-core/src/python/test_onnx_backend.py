@@ -0,0 +1,127 @@
+# intelligence-core/src/python/test_onnx_backend.py
+import json
+import os
+
+import numpy as np
+import pytest
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+from onnx import TensorProto, helper, numpy_helper  # noqa: E402
+
+from onnx_backend import (  # noqa: E402
+    ANOMALY_INPUT, OnnxAnomalyModel, OnnxSentimentClassifier, anomaly_onnx_path, quantize_int8, sentiment_onnx_path,
+    share_weights, _shared_weights,
+)
+
+FEATURE_DIM = 100
+
+
+def _save(graph, path):
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, path)
+
+
+@pytest.fixture
+def anomaly_model(tmp_path):
+    """A logistic-regression stand-in for the Keras anomaly model: sigmoid(x @ W)."""
+    weights = np.random.default_rng(0).normal(scale=0.1, size=(FEATURE_DIM, 1)).astype(np.float32)
+    graph = helper.make_graph(
+        [helper.make_node("MatMul", [ANOMALY_INPUT, "W"], ["z"]), helper.make_node("Sigmoid", ["z"], ["score"])],
+        "anomaly",
+        [helper.make_tensor_value_info(ANOMALY_INPUT, TensorProto.FLOAT, [None, FEATURE_DIM])],
+        [helper.make_tensor_value_info("score", TensorProto.FLOAT, [None, 1])],
+        initializer=[numpy_helper.from_array(weights, "W")],
+    )
+    path = anomaly_onnx_path(str(tmp_path))
+    _save(graph, path)
+    return path, weights
+
+
+@pytest.fixture
+def sentiment_model(tmp_path):
+    """Bag-of-words classifier: masked sum of per-token (negative, positive) logits."""
+    from tokenizers import Tokenizer, models, pre_tokenizers
+
+    vocab = {"[PAD]": 0, "[UNK]": 1, "breach": 2, "malware": 3, "resolved": 4, "healthy": 5}
+    embedding = np.zeros((len(vocab), 2), dtype=np.float32)
+    embedding[[2, 3], 0] = 1.0
+    embedding[[4, 5], 1] = 1.0
+    embedding[0] = [5.0, 0.0]  # Padding would flip every short text to NEGATIVE if it leaked through
+
+    graph = helper.make_graph(
+        [
+            helper.make_node("Gather", ["E", "input_ids"], ["tok"]),
+            helper.make_node("Cast", ["attention_mask"], ["mask_f"], to=TensorProto.FLOAT),
+            helper.make_node("Unsqueeze", ["mask_f", "last"], ["mask3"]),
+            helper.make_node("Mul", ["tok", "mask3"], ["masked"]),
+            helper.make_node("ReduceSum", ["masked", "seq"], ["logits"], keepdims=0),
+        ],
+        "sentiment",
+        [
+            helper.make_tensor_value_info("input_ids", TensorProto.INT64, [None, None]),
+            helper.make_tensor_value_info("attention_mask", TensorProto.INT64, [None, None]),
+        ],
+        [helper.make_tensor_value_info("logits", TensorProto.FLOAT, [None, 2])],
+        initializer=[
+            numpy_helper.from_array(embedding, "E"),
+            numpy_helper.from_array(np.array([2], dtype=np.int64), "last"),
+            numpy_helper.from_array(np.array([1], dtype=np.int64), "seq"),
+        ],
+    )
+    path = sentiment_onnx_path(str(tmp_path))
+    os.makedirs(os.path.dirname(path))
+    _save(graph, path)
+
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.save(os.path.join(os.path.dirname(path), "tokenizer.json"))
+    with open(os.path.join(os.path.dirname(path), "config.json"), "w") as f:
+        json.dump({"id2label": {"0": "NEGATIVE", "1": "POSITIVE"}}, f)
+    return path
+
+
+def test_anomaly_model_matches_reference(anomaly_model):
+    path, weights = anomaly_model
+    features = np.random.default_rng(1).normal(size=(32, FEATURE_DIM)).astype(np.float32)
+    model = OnnxAnomalyModel(path, intra_op_threads=1)
+    expected = 1.0 / (1.0 + np.exp(-(features @ weights)))
+    np.testing.assert_allclose(model.predict_on_batch(features), expected, rtol=1e-5)
+
+
+def test_int8_quantized_anomaly_model_stays_close(anomaly_model):
+    path, _ = anomaly_model
+    int8_path = anomaly_onnx_path(os.path.dirname(path), quantized=True)
+    quantize_int8(path, int8_path)
+    features = np.random.default_rng(2).normal(size=(64, FEATURE_DIM)).astype(np.float32)
+    fp32 = OnnxAnomalyModel(path).predict_on_batch(features)
+    int8 = OnnxAnomalyModel(int8_path).predict_on_batch(features)
+    assert np.abs(fp32 - int8).max() < 0.05
+
+
+def test_sentiment_classifier_pads_batches_dynamically(sentiment_model):
+    classifier = OnnxSentimentClassifier(sentiment_model, max_length=16, intra_op_threads=1)
+    texts = ["healthy", "malware breach on node-7 detected and not resolved", "resolved resolved breach"]
+    assert classifier.classify(texts) == ["POSITIVE", "NEGATIVE", "POSITIVE"]
+    assert classifier.classify([]) == []
+
+
+def test_shared_weights_are_fed_instead_of_copied_into_the_session(anomaly_model, sentiment_model):
+    path, weights = anomaly_model
+    features = np.random.default_rng(3).normal(size=(16, FEATURE_DIM)).astype(np.float32)
+    expected = OnnxAnomalyModel(path).predict_on_batch(features)
+    try:
+        shared = share_weights(path, min_bytes=0)
+        assert not onnx.load_from_string(shared.graph).graph.initializer
+        np.testing.assert_array_equal(shared.weights["W"], weights)
+        model = OnnxAnomalyModel(path, intra_op_threads=1)
+        assert model._weights["W"] is shared.weights["W"]
+        np.testing.assert_allclose(model.predict_on_batch(features), expected, rtol=1e-6)
+
+        share_weights(sentiment_model, min_bytes=16) # Only the embedding is shared
+        classifier = OnnxSentimentClassifier(sentiment_model, max_length=16, intra_op_threads=1)
+        assert list(classifier._weights) == ["E"]
+        assert classifier.classify(["healthy", "malware breach"]) == ["POSITIVE", "NEGATIVE"]
+    finally:
+        _shared_weights.clear()
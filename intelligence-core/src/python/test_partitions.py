@@ -0,0 +1,83 @@
+# intelligence-core/src/python/test_partitions.py
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, DateTime, MetaData, Table, create_engine, insert, text
+
+from partitions import PartitionManager, parse_partition_name, partition_name, planned_partitions
+
+
+def test_planned_partitions_and_names():
+    now = datetime(2024, 3, 31, 22, 15)
+    days = planned_partitions(now, "day", ahead=2)
+    assert days[0] == (datetime(2024, 3, 31), datetime(2024, 4, 1))
+    assert days[-1] == (datetime(2024, 4, 2), datetime(2024, 4, 3))
+    hours = planned_partitions(now, "hour", ahead=3)
+    assert [start.hour for start, _ in hours] == [22, 23, 0, 1]
+
+    name = partition_name("anomaly_alerts", hours[1][0], "hour")
+    assert name == "anomaly_alerts_p2024033123"
+    assert parse_partition_name("anomaly_alerts", name, "hour") == datetime(2024, 3, 31, 23)
+    assert parse_partition_name("anomaly_alerts", "anomaly_alerts_default", "hour") is None
+    assert parse_partition_name("anomaly_alerts", "other_table_p2024033123", "hour") is None
+
+
+def test_unpartitioned_tables_get_retention_by_delete():
+    engine = create_engine("sqlite://")
+    now = datetime(2024, 6, 1, 12)
+    table = Table("rollups", MetaData(), Column("bucket", DateTime))
+    table.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(table), [{"bucket": now - timedelta(days=d)} for d in (0, 6, 7, 8, 30)])
+
+    manager = PartitionManager(engine, "rollups", "bucket", retention=timedelta(days=7))
+    assert not manager.partitioned
+    manager.run_once(now)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM rollups")).scalar() == 3
+    assert manager.stats()["rows_deleted"] == 2
+
+
+class _RecordingEngine:
+    """Stands in for a PostgreSQL engine: records each transaction's statements and fails those naming `fail_on`."""
+    class dialect:
+        name = "postgresql"
+
+    def __init__(self, existing=(), fail_on=None):
+        self.existing = list(existing)
+        self.fail_on = fail_on
+        self.transactions = []
+
+    @contextmanager
+    def begin(self):
+        statements = []
+        self.transactions.append(statements)
+        yield self
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.transactions[-1].append(sql)
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError(f"{self.fail_on} failed")
+        if "pg_inherits" in sql:
+            return [(name,) for name in self.existing]
+        return SimpleNamespace(rowcount=0)
+
+
+def test_each_partition_is_created_in_its_own_transaction():
+    now = datetime(2024, 6, 1, 12)
+    engine = _RecordingEngine(existing=["alerts_default", "alerts_p20240601"], fail_on="alerts_p20240602")
+    manager = PartitionManager(engine, "alerts", ahead=2, retention=timedelta(days=7))
+    manager._partitioned = True
+    with pytest.raises(RuntimeError, match="alerts_p20240602"):
+        manager.run_once(now)
+
+    creates = [t for t in engine.transactions if any("LIKE alerts" in sql for sql in t)]
+    assert len(creates) == 2  # The failed day did not stop the next one
+    moved, attached = creates[1][1], creates[1][2]
+    assert "DELETE FROM alerts_default" in moved and "INSERT INTO alerts_p20240603" in moved
+    assert attached.startswith("ALTER TABLE alerts ATTACH PARTITION alerts_p20240603")
+    assert manager.partitions_created == 1
+    assert any(t == ["DELETE FROM alerts_default WHERE timestamp < :cutoff"] for t in engine.transactions)  # Retention reaches DEFAULT
@@ -0,0 +1,134 @@
+# intelligence-core/src/python/test_result_cache.py
+import asyncio
+import time
+
+import pytest
+
+from result_cache import ResultCache, canonical_key
+
+
+def test_canonical_key_ignores_key_order():
+    assert canonical_key({"a": 1, "b": [1, 2]}) == canonical_key({"b": [1, 2], "a": 1})
+    assert canonical_key({"a": 1}) != canonical_key({"a": 2})
+
+
+def test_lru_eviction_by_entry_count_and_bytes():
+    cache = ResultCache(max_entries=2, max_bytes=10_000)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" becomes least recently used
+    cache.put("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+
+    small = ResultCache(max_entries=100, max_bytes=20)
+    small.put("x", "y" * 10)
+    small.put("z", "y" * 10)
+    assert len(small) == 1 and small.stats()["evictions"] == 1
+
+    disabled = ResultCache(max_entries=0)
+    disabled.put("a", 1)
+    assert len(disabled) == 0 and disabled.stats()["evictions"] == 0
+
+
+def test_ttl_expiry(monkeypatch):
+    cache = ResultCache(ttl_seconds=10)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.put("k", "v")
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get("k") == (False, None)
+    assert cache.stats()["expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_misses():
+    cache = ResultCache()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"result": 42}
+
+    results = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(10)))
+    assert calls == 1
+    assert all(r == {"result": 42} for r in results)
+    assert await cache.get_or_compute("k", compute) == {"result": 42}
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 9, 1)
+
+
+@pytest.mark.asyncio
+async def test_failures_and_uncacheable_results_are_not_stored():
+    cache = ResultCache()
+
+    async def fail():
+        raise RuntimeError("backend down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute("k", fail)
+
+    async def none():
+        return None
+
+    assert await cache.get_or_compute("k", none) is None
+    assert len(cache) == 0
+
+
+def test_invalidate_by_key_tag_and_all():
+    cache = ResultCache()
+    cache.put("a", 1, tag="OPTIMIZE_RESOURCES")
+    cache.put("b", 2, tag="ANALYZE_ATTACK_PATH")
+    cache.put("c", 3, tag="ANALYZE_ATTACK_PATH")
+    assert cache.invalidate(key="a") == 1
+    assert cache.invalidate(tag="ANALYZE_ATTACK_PATH") == 2
+    cache.put("d", 4)
+    assert cache.invalidate() == 1
+    assert cache.stats()["invalidations"] == 4
+
+
+@pytest.mark.asyncio
+async def test_writes_during_a_compute_are_not_overwritten():
+    cache = ResultCache()
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def compute():
+        started.set()
+        await release.wait()
+        return "stale"
+
+    for write in (lambda: cache.invalidate("k"), lambda: cache.put("k", "fresh"), lambda: cache.invalidate(tag="T"), cache.invalidate):
+        cache.invalidate()
+        started.clear()
+        release.clear()
+        task = asyncio.create_task(cache.get_or_compute("k", compute, tag="T"))
+        await started.wait()
+        write()
+        release.set()
+        assert await task == "stale"  # Its callers still get the computed value
+        assert cache.get("k")[1] != "stale"
+    assert cache.get("k") == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_first_caller_does_not_fail_the_others():
+    cache = ResultCache()
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def compute():
+        started.set()
+        await release.wait()
+        return {"result": 42}
+
+    leader = asyncio.create_task(cache.get_or_compute("k", compute))
+    await started.wait()
+    follower = asyncio.create_task(cache.get_or_compute("k", compute))
+    await asyncio.sleep(0)
+    leader.cancel()  # e.g. its HTTP client disconnected
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    release.set()
+    assert await follower == {"result": 42}
+    assert cache.get("k") == (True, {"result": 42})
@@ -0,0 +1,50 @@
+# intelligence-core/src/python/test_rollups.py
+from datetime import datetime
+
+import pytest
+
+from rollups import AlertRollupWriter, RollupAccumulator, rebucket
+
+
+def _alert(second, score, node="node-1", severity="HIGH", minute=0):
+    return {"timestamp": datetime(2024, 1, 1, 0, minute, second), "source_node_id": node, "metric_name": "cpu",
+            "anomaly_score": score, "severity": severity}
+
+
+def test_accumulator_groups_alerts_per_minute_and_key():
+    accumulator = RollupAccumulator()
+    accumulator.add_alerts([_alert(1, 80), _alert(59, 95), _alert(5, 60, minute=1), _alert(7, 99, node="node-2")])
+    rows = {(r["bucket"].minute, r["source_node_id"]): (r["alert_count"], r["max_score"]) for r in accumulator.drain()}
+    assert rows == {(0, "node-1"): (2, 95), (1, "node-1"): (1, 60), (0, "node-2"): (1, 99)}
+    assert len(accumulator) == 0
+
+
+def test_rebucket_merges_minutes():
+    points = [{"bucket": datetime(2024, 1, 1, 0, m), "alert_count": 1, "max_score": m} for m in (0, 4, 5, 14)]
+    assert rebucket(points, 5) == [
+        {"bucket": datetime(2024, 1, 1, 0, 0), "alert_count": 2, "max_score": 4},
+        {"bucket": datetime(2024, 1, 1, 0, 5), "alert_count": 1, "max_score": 5},
+        {"bucket": datetime(2024, 1, 1, 0, 10), "alert_count": 1, "max_score": 14},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_writer_keeps_deltas_after_a_failed_write_and_flushes_on_stop():
+    written, fail = [], [True]
+
+    def flush(rows):
+        if fail[0]:
+            raise RuntimeError("database unavailable")
+        written.extend(rows)
+
+    writer = AlertRollupWriter(flush, flush_interval_s=3600)
+    await writer.start()
+    writer.add_alerts([_alert(1, 80)])
+    await writer.flush()
+    assert written == [] and writer.stats()["flush_errors"] == 1
+
+    writer.add_alerts([_alert(2, 90)])
+    fail[0] = False
+    await writer.stop()
+    assert [(r["alert_count"], r["max_score"]) for r in written] == [(2, 90)]
+    assert writer.stats()["pending_rollup_rows"] == 0
@@ -0,0 +1,54 @@
+# intelligence-core/src/python/test_serialization.py
+import json
+
+import pytest
+
+from serialization import check_timestamp, parse_ndjson, parse_arrow_stream
+
+
+def test_parse_ndjson_columns():
+    body = b"\n".join(
+        json.dumps({"source_node_id": f"n{i}", "metric_name": "cpu_utilization", "value": {"cpu_percent": i}, "timestamp": 100.0 + i}).encode()
+        for i in range(3)
+    ) + b"\n\n"
+    columns = parse_ndjson(body)
+    assert len(columns) == 3
+    assert columns.source_node_ids == ["n0", "n1", "n2"]
+    assert columns.values[2] == {"cpu_percent": 2}
+    assert columns.timestamps == [100.0, 101.0, 102.0]
+
+
+@pytest.mark.parametrize("line", [b"{broken", b"[1, 2]", b'{"source_node_id": "n", "metric_name": "m", "value": 3}'])
+def test_parse_ndjson_rejects_bad_rows(line):
+    with pytest.raises(ValueError):
+        parse_ndjson(line)
+
+
+def test_parse_ndjson_rejects_implausible_timestamps():
+    def body(timestamp):
+        return json.dumps({"source_node_id": "n", "metric_name": "m", "value": {}, "timestamp": timestamp}).encode()
+
+    assert parse_ndjson(body(100.0)).timestamps == [100.0]  # No window by default
+    for timestamp in (float("nan"), float("inf"), "soon", [1]):
+        with pytest.raises(ValueError, match="line 0"):
+            parse_ndjson(body(timestamp))
+    with pytest.raises(ValueError, match="in the past"):
+        parse_ndjson(body(100.0), max_age_s=86400.0)
+    with pytest.raises(ValueError, match="in the future"):
+        check_timestamp(1e20, now=0.0, max_skew_s=60.0)
+
+
+def test_parse_arrow_stream_with_struct_values():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({
+        "source_node_id": ["a", "b"],
+        "metric_name": ["cpu_utilization", "memory_usage"],
+        "value": [{"cpu_percent": 1.5, "used_bytes": None}, {"cpu_percent": None, "used_bytes": 10.0}],
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    columns = parse_arrow_stream(sink.getvalue().to_pybytes())
+    assert columns.source_node_ids == ["a", "b"]
+    assert columns.values == [{"cpu_percent": 1.5}, {"used_bytes": 10.0}]
+    assert len(columns.timestamps) == 2
@@ -0,0 +1,81 @@
+# intelligence-core/src/python/test_startup.py
+import asyncio
+import time
+
+import pytest
+
+from startup import StartupOrchestrator, FAILED, LOADING, READY, process_started_at
+
+
+def _component(events, name, delay=0.0, fail=False):
+    async def start():
+        events.append(f"start:{name}")
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{name} exploded")
+
+    def stop():
+        events.append(f"stop:{name}")
+
+    return start, stop
+
+
+@pytest.mark.asyncio
+async def test_independent_components_load_concurrently_and_dependents_wait():
+    events = []
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("model", *_component(events, "model", 0.05))
+    orchestrator.add("julia", *_component(events, "julia", 0.05))
+    orchestrator.add("ingest", *_component(events, "ingest"), depends_on=("model",))
+
+    started = time.perf_counter()
+    await orchestrator.start()
+    await orchestrator.wait_all()
+    assert time.perf_counter() - started < 0.09  # Not 0.05 + 0.05
+    assert events.index("start:ingest") > events.index("start:model")
+    assert all(c["state"] == READY for c in orchestrator.status().values())
+
+    await orchestrator.shutdown()
+    assert events.index("stop:ingest") < events.index("stop:model")  # Dependents stop first
+
+
+@pytest.mark.asyncio
+async def test_start_returns_once_critical_components_are_ready():
+    events = []
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("scorer", *_component(events, "scorer", 0.01), critical=True)
+    orchestrator.add("sentiment", *_component(events, "sentiment", 5.0))
+
+    await orchestrator.start()
+    assert orchestrator.is_ready("scorer") and orchestrator.critical_ready
+    assert orchestrator.status()["sentiment"]["state"] == LOADING
+
+    await orchestrator.shutdown()  # Cancels the component that is still loading
+    assert orchestrator.status()["sentiment"]["state"] == FAILED
+    assert "stop:sentiment" not in events and "stop:scorer" in events
+
+
+@pytest.mark.asyncio
+async def test_failures_propagate_to_dependents_and_critical_failures_raise():
+    events = []
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("writer", *_component(events, "writer", fail=True))
+    orchestrator.add("scorer", *_component(events, "scorer"), depends_on=("writer",), critical=True)
+
+    with pytest.raises(RuntimeError, match="scorer"):
+        await orchestrator.start()
+    status = orchestrator.status()
+    assert status["writer"] == {"state": FAILED, "critical": False, "load_ms": status["writer"]["load_ms"], "error": "writer exploded"}
+    assert status["scorer"]["error"] == "dependency 'writer' is failed"
+    assert "start:scorer" not in events
+    await orchestrator.shutdown()
+
+
+def test_rejects_unknown_dependencies():
+    orchestrator = StartupOrchestrator()
+    with pytest.raises(ValueError):
+        orchestrator.add("ingest", lambda: asyncio.sleep(0), depends_on=("model",))
+
+
+def test_process_started_at_precedes_now():
+    assert 0.0 <= time.perf_counter() - process_started_at() < 3600.0
@@ -0,0 +1,100 @@
+# intelligence-core/src/python/test_supervisor.py
+import os
+import signal
+import socket
+import time
+
+import pytest
+
+from supervisor import WorkerSupervisor, reuseport_socket
+
+
+def _events(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return f.read().split()
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _run_supervisor(supervisor):
+    """Runs the supervisor in a forked process, as `python main.py` would, and returns its pid."""
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            code = supervisor.run()
+        finally:
+            os._exit(code)
+    return pid
+
+
+def _worker(log_path, crash_first_run=False):
+    def run(index):
+        def stop(signum, frame):
+            _append(log_path, f"flushed:{index}")
+            os._exit(0)
+
+        signal.signal(signal.SIGTERM, stop)
+        crashed_marker = f"{log_path}.crashed{index}"
+        _append(log_path, f"started:{index}")
+        if crash_first_run and index == 0 and not os.path.exists(crashed_marker):
+            open(crashed_marker, "w").close()
+            return 3
+        while True:
+            time.sleep(1)
+    return run
+
+
+def _append(path, event):
+    with open(path, "a") as f:
+        f.write(event + "\n")
+
+
+def test_reuseport_sockets_share_a_port():
+    first = reuseport_socket("127.0.0.1", 0)
+    port = first.getsockname()[1]
+    second = reuseport_socket("127.0.0.1", port)
+    try:
+        assert second.getsockname()[1] == port
+        with socket.create_connection(("127.0.0.1", port), timeout=1):
+            pass
+    finally:
+        first.close()
+        second.close()
+
+
+def test_sigterm_stops_every_worker_gracefully(tmp_path):
+    log_path = str(tmp_path / "events")
+    pid = _run_supervisor(WorkerSupervisor(_worker(log_path), workers=3, shutdown_timeout_s=5, poll_interval_s=0.02))
+    assert _wait_for(lambda: len(_events(log_path)) == 3)
+
+    os.kill(pid, signal.SIGTERM)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert sorted(e for e in _events(log_path) if e.startswith("flushed")) == ["flushed:0", "flushed:1", "flushed:2"]
+
+
+def test_exited_worker_is_restarted(tmp_path):
+    log_path = str(tmp_path / "events")
+    supervisor = WorkerSupervisor(_worker(log_path, crash_first_run=True), workers=2, restart_delay_s=0.05, poll_interval_s=0.02)
+    pid = _run_supervisor(supervisor)
+    try:
+        assert _wait_for(lambda: _events(log_path).count("started:0") == 2)
+        assert _events(log_path).count("started:1") == 1
+    finally:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+
+
+def test_rejects_zero_workers():
+    with pytest.raises(ValueError):
+        WorkerSupervisor(lambda index: None, workers=0)
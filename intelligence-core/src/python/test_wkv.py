@@ -0,0 +1,51 @@
+# intelligence-core/src/python/test_wkv.py
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from wkv import load_extension, wkv, wkv_reference, wkv_scan  # noqa: E402
+
+
+def _inputs(B=2, T=9, C=5, dtype=torch.float32, seed=0):
+    generator = torch.Generator().manual_seed(seed)
+    w, u, k, v = (torch.randn((B, T, C), generator=generator).to(dtype) for _ in range(4))
+    s = torch.randn((B, C), generator=generator)
+    return w, u, k, v, s
+
+
+@pytest.mark.parametrize("shape", [(1, 1, 1), (2, 9, 5), (3, 17, 70)])
+def test_scan_matches_reference(shape):
+    w, u, k, v, s = _inputs(*shape)
+    y_ref, s_ref = wkv_reference(w, u, k, v, s.clone())
+    y, s_out = wkv_scan(w, u, k, v, s)
+    torch.testing.assert_close(y, y_ref)
+    torch.testing.assert_close(s_out, s_ref)
+
+
+def test_wkv_updates_the_state_in_place():
+    w, u, k, v, s = _inputs()
+    y_ref, s_ref = wkv_reference(w, u, k, v, s.clone())
+    y, s_out = wkv(w, u, k, v, s)
+    assert s_out is s
+    torch.testing.assert_close(y, y_ref)
+    torch.testing.assert_close(s, s_ref)
+
+
+def test_compiles_without_graph_breaks():
+    w, u, k, v, s = _inputs()
+    y_ref, s_ref = wkv_reference(w, u, k, v, s.clone())
+    compiled = torch.compile(wkv, fullgraph=True, backend="eager")  # fullgraph raises on any graph break
+    y, _ = compiled(w, u, k, v, s)
+    torch.testing.assert_close(y, y_ref)
+    torch.testing.assert_close(s, s_ref)
+
+
+def test_cpp_extension_matches_reference(monkeypatch):
+    if load_extension() is None:
+        pytest.skip("wkv_cpu extension cannot be built here")
+    monkeypatch.setenv("WKV_KERNEL", "cpp")
+    w, u, k, v, s = _inputs(B=2, T=13, C=150)  # More than two 64-channel blocks
+    y_ref, s_ref = wkv_reference(w, u, k, v, s.clone())
+    y, _ = wkv(w, u, k, v, s)
+    torch.testing.assert_close(y, y_ref)
+    torch.testing.assert_close(s, s_ref)
@@ -0,0 +1,94 @@
+# intelligence-core/src/python/test_write_buffer.py
+import asyncio
+
+import pytest
+
+from write_buffer import AlertWriteBuffer
+
+
+class RecordingSink:
+    def __init__(self, fail=False):
+        self.flushes = []
+        self.fail = fail
+
+    def __call__(self, rows):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.flushes.append([row["id"] for row in rows])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_share_one_commit():
+    sink = RecordingSink()
+    buffer = AlertWriteBuffer(sink, max_rows=1000, flush_interval_ms=20)
+    await buffer.start()
+    await asyncio.gather(*(buffer.submit({"id": f"a{i}"}) for i in range(10)))
+    await buffer.stop()
+    assert sink.flushes == [[f"a{i}" for i in range(10)]]
+    assert buffer.stats()["flush_size"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_max_rows_triggers_flush_before_interval():
+    sink = RecordingSink()
+    buffer = AlertWriteBuffer(sink, max_rows=5, flush_interval_ms=10_000)
+    await buffer.start()
+    await asyncio.wait_for(buffer.submit_many([{"id": str(i)} for i in range(5)]), timeout=1.0)
+    await buffer.stop()
+    assert len(sink.flushes) == 1
+
+
+@pytest.mark.asyncio
+async def test_enqueue_mode_acks_before_commit_and_stop_flushes():
+    sink = RecordingSink()
+    buffer = AlertWriteBuffer(sink, flush_interval_ms=10_000, durability="enqueue")
+    await buffer.start()
+    await asyncio.wait_for(buffer.submit({"id": "x"}), timeout=0.5)
+    assert sink.flushes == []
+    await buffer.stop()
+    assert sink.flushes == [["x"]]
+
+
+@pytest.mark.asyncio
+async def test_commit_mode_surfaces_flush_errors():
+    buffer = AlertWriteBuffer(RecordingSink(fail=True), flush_interval_ms=5)
+    await buffer.start()
+    with pytest.raises(RuntimeError):
+        await buffer.submit({"id": "x"})
+    await buffer.stop()
+    stats = buffer.stats()
+    assert stats["flush_errors"] == 1 and stats["rows_dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_on_flushed_sees_only_committed_rows():
+    published = []
+    sink = RecordingSink(fail=True)
+    buffer = AlertWriteBuffer(sink, flush_interval_ms=5, on_flushed=lambda rows: published.append([r["id"] for r in rows]))
+    await buffer.start()
+    with pytest.raises(RuntimeError):
+        await buffer.submit({"id": "lost"})
+    sink.fail = False
+    await buffer.submit_many([{"id": "a"}, {"id": "b"}])
+    await buffer.stop()
+    assert published == [["a", "b"]]
+
+
+@pytest.mark.asyncio
+async def test_on_committed_runs_only_for_committed_submits():
+    committed = []
+    sink = RecordingSink(fail=True)
+    buffer = AlertWriteBuffer(sink, flush_interval_ms=5, durability="enqueue")
+    await buffer.start()
+    await buffer.submit({"id": "lost"}, on_committed=lambda: committed.append("lost"))
+    await asyncio.sleep(0.05)
+    sink.fail = False
+    await buffer.submit_many([{"id": "a"}], on_committed=lambda: committed.append("a"))
+    assert committed == []  # Enqueue mode acks before the commit
+    await buffer.stop()
+    assert committed == ["a"]
+
+
+def test_rejects_unknown_durability_mode():
+    with pytest.raises(ValueError):
+        AlertWriteBuffer(RecordingSink(), durability="fsync")
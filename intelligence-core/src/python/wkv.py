@@ -0,0 +1,123 @@
+# intelligence-core/src/python/wkv.py
+"""
+WKV (RWKV time-mixing) forward kernels.
+
+For every batch row b and channel c the WKV state is a first-order linear recurrence
+over time:
+
+    y[b, t, c] = u*k*v + s[b, c]
+    s[b, c]    = exp(-exp(w)) * s[b, c] + u*k        (w, u, k, v taken at [b, t, c])
+
+Channels and batch rows are independent, so only the time axis is sequential.
+
+- `wkv_reference`: the element-by-element loop, kept as the ground truth for tests.
+- `wkv_scan`: loops over T only, with each step one fused op over all (B, C) states.
+- The `wkv_cpu` C++ extension (csrc/wkv_cpu.cpp): same recurrence, with OpenMP over
+  channel blocks. It is built on first use with `torch.utils.cpp_extension`, which needs
+  a C++ compiler, and is only used when WKV_KERNEL=cpp.
+
+`wkv` dispatches through the `intel_core::wkv` operator. `torch.compile` treats the
+operator as one opaque node (its shapes come from a meta kernel), so a compiled caller
+never traces the Python time loop and never breaks its graph.
+"""
+import logging
+import os
+from typing import Optional, Tuple
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+WKV_KERNELS = ("torch", "cpp")
+_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "csrc", "wkv_cpu.cpp")
+
+_extension = None
+_extension_failed = False
+
+
+def wkv_reference(w: torch.Tensor, u: torch.Tensor, k: torch.Tensor, v: torch.Tensor, s: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    """The per-element loop over (B, T, C). Updates `s` in place. Far too slow to serve; use `wkv`."""
+    B, T, C = k.shape
+    eew = torch.exp(-torch.exp(w.float()))
+    y = torch.empty((B, T, C), device=k.device, dtype=torch.float32)
+    for b in range(B):
+        for t in range(T):
+            for c in range(C):
+                y[b, t, c] = u[b, t, c] * k[b, t, c] * v[b, t, c] + s[b, c]
+                s[b, c] = eew[b, t, c] * s[b, c] + u[b, t, c] * k[b, t, c]
+    return y, s
+
+
+def wkv_scan(w: torch.Tensor, u: torch.Tensor, k: torch.Tensor, v: torch.Tensor, s: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    The recurrence with a Python loop over T only. Inputs are laid out time-major, so
+    each step is one `addcmul` over contiguous (B, C) rows. It writes the state after
+    step t into row t + 1 of `states`, so nothing is allocated inside the loop.
+    `y` then takes one vectorized add over the states entering each step. Returns
+    `(y, s_out)` and leaves `s` untouched.
+    """
+    B, T, C = k.shape
+    decay = torch.exp(-torch.exp(w.float())).expand(B, T, C).transpose(0, 1).contiguous()
+    uk = (u.float() * k.float()).transpose(0, 1).contiguous()
+    states = torch.empty((T + 1, B, C), device=k.device, dtype=torch.float32)
+    states[0] = s.reshape(B, C)
+    for t in range(T):
+        torch.addcmul(uk[t], decay[t], states[t], out=states[t + 1])
+    y = torch.addcmul(states[:T], uk, v.float().transpose(0, 1))
+    return y.transpose(0, 1).contiguous(), states[T].reshape(s.shape).to(s.dtype)
+
+
+# --- C++ Extension ---
+
+def load_extension() -> Optional[object]:
+    """Builds (or loads the cached build of) the OpenMP extension. Returns None if it cannot be built."""
+    global _extension, _extension_failed
+    if _extension is None and not _extension_failed:
+        try:
+            from torch.utils.cpp_extension import load
+
+            _extension = load(
+                name="wkv_cpu", sources=[_SOURCE], extra_cflags=["-O3", "-fopenmp"], extra_ldflags=["-fopenmp"], verbose=False
+            )
+            logger.info("Loaded the wkv_cpu C++ extension.")
+        except Exception as e:
+            _extension_failed = True
+            logger.warning(f"Could not build the wkv_cpu C++ extension, using the torch kernel: {e}")
+    return _extension
+
+
+def _kernel() -> str:
+    kernel = os.environ.get("WKV_KERNEL", "torch")
+    if kernel not in WKV_KERNELS:
+        raise ValueError(f"WKV_KERNEL must be one of {WKV_KERNELS}, got '{kernel}'")
+    return kernel
+
+
+# --- Operator ---
+
+_library = torch.library.Library("intel_core", "DEF")
+_library.define("wkv(Tensor w, Tensor u, Tensor k, Tensor v, Tensor s) -> (Tensor, Tensor)")
+
+
+def _wkv_impl(w, u, k, v, s):
+    if k.device.type == "cpu" and _kernel() == "cpp":
+        extension = load_extension()
+        if extension is not None:
+            y, s_out = extension.forward(w, u, k, v, s)
+            return y, s_out
+    return wkv_scan(w, u, k, v, s)
+
+
+def _wkv_meta(w, u, k, v, s):
+    return k.new_empty(k.shape, dtype=torch.float32), s.new_empty(s.shape)
+
+
+_library.impl("wkv", _wkv_impl, "CompositeExplicitAutograd")
+_library.impl("wkv", _wkv_meta, "Meta")
+
+
+def wkv(w: torch.Tensor, u: torch.Tensor, k: torch.Tensor, v: torch.Tensor, s: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    """The WKV forward pass over (B, T, C) inputs and (B, C) state. Like the reference, it updates `s` in place and returns `(y, s)`."""
+    y, s_out = torch.ops.intel_core.wkv(w, u, k, v, s)
+    s.copy_(s_out)
+    return y, s
@@ -0,0 +1,193 @@
+# intelligence-core/src/python/write_buffer.py
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from metrics import Histogram, LATENCY_BUCKETS_MS, SIZE_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+# Durability modes
+ACK_AFTER_COMMIT = "commit"    # submit() returns once the rows are committed
+ACK_AFTER_ENQUEUE = "enqueue"  # submit() returns once the rows are buffered
+DURABILITY_MODES = (ACK_AFTER_COMMIT, ACK_AFTER_ENQUEUE)
+
+
+# --- Write-Behind Buffer ---
+
+class AlertWriteBuffer:
+    """
+    Group-commits alert rows on a background task.
+
+    Rows accumulate in memory and are written by `flush_fn` (one executemany INSERT and
+    one commit) every `flush_interval_ms`, or as soon as `max_rows` are pending. The
+    flush runs in `executor`, so the event loop never waits on the database. Rows from a
+    single `submit_many` call always land in the same transaction.
+
+    A failed flush is not retried: durable callers receive the exception and the rows
+    are counted in `rows_dropped`. With `durability="enqueue"`, callers that still need
+    the commit guarantee for a particular call can pass `durable=True`.
+
+    `on_flushed(rows)`, if given, runs on the event loop after every successful commit,
+    e.g. to publish the newly persisted alerts to subscribers. A submit's own
+    `on_committed()` runs there too, once its rows are committed, in either durability
+    mode; it never runs for rows that are dropped.
+    """
+    def __init__(
+        self,
+        flush_fn: Callable[[List[Row]], None],
+        max_rows: int = 500,
+        flush_interval_ms: float = 50.0,
+        durability: str = ACK_AFTER_COMMIT,
+        max_pending_rows: int = 100_000,
+        executor: Optional[Executor] = None,
+        on_flushed: Optional[Callable[[List[Row]], None]] = None,
+    ):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}, got '{durability}'")
+        self.flush_fn = flush_fn
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.durability = durability
+        self.max_pending_rows = max_pending_rows
+        self.on_flushed = on_flushed
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert-writer")
+
+        self._pending: List[Row] = []
+        self._waiters: List[asyncio.Future] = []
+        self._callbacks: List[Callable[[], None]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+
+        self.flush_size_hist = Histogram("alert_flush_size", SIZE_BUCKETS, "Rows per group commit")
+        self.flush_latency_hist = Histogram("alert_flush_latency_ms", LATENCY_BUCKETS_MS, "INSERT + COMMIT time per flush")
+        self.rows_flushed = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.rows_dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._stopping = False
+        self._task = asyncio.create_task(self._flush_loop(), name="alert-write-buffer")
+        logger.info(f"Alert write buffer started (max_rows={self.max_rows}, flush_interval_ms={self.flush_interval * 1000:g}, durability={self.durability})")
+
+    async def stop(self):
+        """Flushes every pending row, then stops the background task."""
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+        logger.info("Alert write buffer stopped.")
+
+    async def submit(self, row: Row, durable: Optional[bool] = None, on_committed: Optional[Callable[[], None]] = None):
+        await self.submit_many([row], durable=durable, on_committed=on_committed)
+
+    async def submit_many(self, rows: Sequence[Row], durable: Optional[bool] = None, on_committed: Optional[Callable[[], None]] = None):
+        if not self.running or self._stopping:
+            raise RuntimeError("Alert write buffer is not running.")
+        if not rows:
+            return
+        while len(self._pending) >= self.max_pending_rows:
+            self._space.clear()
+            self._wakeup.set()
+            await self._space.wait()
+
+        self._pending.extend(rows)
+        if on_committed is not None:
+            self._callbacks.append(on_committed)
+        if len(self._pending) >= self.max_rows:
+            self._wakeup.set()
+
+        if durable if durable is not None else self.durability == ACK_AFTER_COMMIT:
+            waiter = self._loop.create_future()
+            self._waiters.append(waiter)
+            await waiter
+
+    def submit_blocking(self, rows: Sequence[Row], timeout: Optional[float] = None):
+        """Thread-safe durable submit for callers outside the event loop (e.g. Kafka workers)."""
+        asyncio.run_coroutine_threadsafe(self.submit_many(rows, durable=True), self._loop).result(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "durability": self.durability,
+            "pending_rows": len(self._pending),
+            "rows_flushed": self.rows_flushed,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "rows_dropped": self.rows_dropped,
+            "flush_size": self.flush_size_hist.snapshot(),
+            "flush_latency_ms": self.flush_latency_hist.snapshot(),
+        }
+
+    def _take_pending(self) -> Tuple[List[Row], List[asyncio.Future], List[Callable[[], None]]]:
+        rows, waiters, callbacks = self._pending, self._waiters, self._callbacks
+        self._pending, self._waiters, self._callbacks = [], [], []
+        self._space.set()
+        return rows, waiters, callbacks
+
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._stopping:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+
+            rows, waiters, callbacks = self._take_pending()
+            if rows:
+                started = time.perf_counter()
+                try:
+                    await loop.run_in_executor(self._executor, self.flush_fn, rows)
+                except Exception as e:
+                    # Durable callers see the exception; enqueue-mode rows are lost.
+                    self.flush_errors += 1
+                    self.rows_dropped += len(rows)
+                    logger.error(f"Alert write buffer: flush of {len(rows)} rows failed: {e}")
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                else:
+                    self.flush_latency_hist.observe((time.perf_counter() - started) * 1000.0)
+                    self.flush_size_hist.observe(len(rows))
+                    self.rows_flushed += len(rows)
+                    self.flushes += 1
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_result(None)
+                    for callback in callbacks:
+                        try:
+                            callback()
+                        except Exception as e:
+                            logger.error(f"Alert write buffer: on_committed callback failed: {e}")
+                    if self.on_flushed is not None:
+                        try:
+                            self.on_flushed(rows)
+                        except Exception as e:
+                            logger.error(f"Alert write buffer: on_flushed hook failed: {e}")
+
+            if self._stopping and not self._pending:
+                return